@@ -0,0 +1,18 @@
+"""
+Benchmarks of the performance critical parts of guikit.
+
+Each benchmark is run at several scales, e.g. number of threads, rows or steps, and the
+time per run is reported. Results can be saved as JSON, to be used as a baseline for
+later runs, which then fail if any benchmark is slower than the baseline by more than a
+tolerance. As with the tests, a display is needed, so on headless Linux machines they
+must be run under Xvfb:
+
+```bash
+xvfb-run -a python -m benchmarks --save-baseline baseline.json
+# change things...
+xvfb-run -a python -m benchmarks --compare baseline.json --tolerance 0.25
+```
+
+Run `python -m benchmarks --help` for all the options. Timings are only comparable if
+taken in the same machine, so baselines are not stored in the repository.
+"""
@@ -0,0 +1,73 @@
+"""
+Benchmarks of the table feeding the data grid, as used when redrawing it.
+"""
+import numpy as np
+import pandas as pd
+
+from guikit.extensions.load_data.view import DataTable
+
+from .runner import benchmark
+
+CELLS = 2000
+"""Number of cells read per run, roughly those visible in a maximised grid."""
+
+
+def make_table(nrows: int) -> DataTable:
+    """Creates a table with numeric and text columns.
+
+    Args:
+        nrows: Number of rows.
+
+    Returns:
+        The table.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            "integer": rng.integers(0, 1000, nrows),
+            "float": rng.random(nrows),
+            "text": pd.Series(rng.integers(0, 100, nrows)).astype(str),
+        }
+    )
+    return DataTable(data)
+
+
+def visible_cells(table: DataTable):
+    """Chooses the cells displayed in a screen, at a random position of the table.
+
+    Args:
+        table: The table.
+
+    Returns:
+        The row and column of each cell.
+    """
+    ncols = table.GetNumberCols()
+    nrows = CELLS // ncols
+    first = np.random.default_rng(0).integers(0, table.GetNumberRows() - nrows)
+    return [(row, col) for row in range(first, first + nrows) for col in range(ncols)]
+
+
+@benchmark(1_000, 100_000, 1_000_000)
+def data_table_get_value(scale: int):
+    """Reads the values of the cells of a screen."""
+    table = make_table(scale)
+    cells = visible_cells(table)
+
+    def target():
+        for row, col in cells:
+            table.GetValue(row, col)
+
+    yield target
+
+
+@benchmark(1_000, 100_000, 1_000_000)
+def data_table_get_attr(scale: int):
+    """Gets the attributes of the cells of a screen."""
+    table = make_table(scale)
+    cells = visible_cells(table)
+
+    def target():
+        for row, col in cells:
+            table.GetAttr(row, col, None)
+
+    yield target
@@ -0,0 +1,42 @@
+"""
+Benchmarks of the overhead of updating a progress dialog in a loop.
+"""
+from typing import Optional
+
+from guikit.progress import Dialog
+
+from .runner import benchmark
+
+
+def update_dialog(
+    maximum: int, steps: Optional[int] = None, interval: Optional[float] = None
+) -> None:
+    """Updates a new progress dialog at every step until finished.
+
+    Args:
+        maximum: Number of steps.
+        steps: Number of times the dialog is actually redrawn.
+        interval: Minimum time, in milliseconds, between redraws.
+    """
+    dlg = Dialog(maximum=maximum, steps=steps, interval=interval)
+    for i in range(maximum + 1):
+        dlg.Update(i)
+    dlg.Destroy()
+
+
+@benchmark(100, 1_000)
+def dialog_update_every_step(scale: int):
+    """Redraws the dialog at every step."""
+    yield lambda: update_dialog(scale)
+
+
+@benchmark(1_000, 100_000)
+def dialog_update_steps(scale: int):
+    """Redraws the dialog a fixed number of times."""
+    yield lambda: update_dialog(scale, steps=100)
+
+
+@benchmark(1_000, 100_000)
+def dialog_update_interval(scale: int):
+    """Redraws the dialog at most every 100 ms."""
+    yield lambda: update_dialog(scale, interval=100)
@@ -0,0 +1,66 @@
+"""
+Benchmarks of starting the application: loading the plugins and building the window.
+"""
+import subprocess
+import sys
+
+import wx
+
+from guikit.core import MainWindow
+from guikit.plugins import KNOWN_PLUGINS, MenuTool, PluginBase, Tab
+
+from .runner import benchmark
+
+LOAD_PLUGINS = (
+    "from guikit.config import AUTO_PLUGINS; "
+    "from guikit.plugins import load_plugins; "
+    "load_plugins(AUTO_PLUGINS)"
+)
+"""Code loading the built-in extensions of guikit."""
+
+
+@benchmark(1)
+def load_builtin_plugins(scale: int):
+    """Loads the built-in extensions in a new interpreter, so imports are not cached."""
+    yield lambda: subprocess.run([sys.executable, "-c", LOAD_PLUGINS], check=True)
+
+
+def make_plugin(index: int) -> type:
+    """Creates a plugin with a menu entry, a toolbar item and a tab.
+
+    Args:
+        index: Number of the plugin, to name its elements.
+
+    Returns:
+        The plugin class, already registered.
+    """
+
+    class Plugin(PluginBase):
+        def menu_entries(self):
+            return [MenuTool(menu="Plugins", text=f"Entry {index}")]
+
+        def toolbar_items(self):
+            bitmap = wx.ArtProvider.GetBitmap(wx.ART_NEW, wx.ART_TOOLBAR)
+            return [MenuTool(text=f"Tool {index}", bitmap=bitmap)]
+
+        def tabs(self, parent=None):
+            return [Tab(page=wx.Panel(parent), text=f"Tab {index}", order=index)]
+
+    return Plugin
+
+
+@benchmark(1, 10, 50)
+def populate_window(scale: int):
+    """Creates the main window with the elements of many plugins, then destroys it."""
+    known_plugins = KNOWN_PLUGINS[:]
+    KNOWN_PLUGINS.clear()
+    for i in range(scale):
+        make_plugin(i)
+
+    def target():
+        window = MainWindow(None, title="Benchmark", size=(800, 600))
+        window.populate_window()
+        window.Destroy()
+
+    yield target
+    KNOWN_PLUGINS[:] = known_plugins
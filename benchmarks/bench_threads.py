@@ -0,0 +1,35 @@
+"""
+Benchmarks of running tasks in worker threads and getting their results back.
+"""
+from typing import List
+
+from guikit.threads import run_thread
+
+from .runner import benchmark, wait_until
+
+
+@benchmark(10, 100, 500)
+def run_thread_throughput(scale: int):
+    """Runs many threads at once and waits for all of their results."""
+    done: List[None] = []
+
+    def target():
+        done.clear()
+        for _ in range(scale):
+            run_thread(lambda: None, on_complete=done.append)
+        wait_until(lambda: len(done) == scale)
+
+    yield target
+
+
+@benchmark(1, 10, 100)
+def worker_result_latency(scale: int):
+    """Runs threads one after the other, waiting for the result of each one."""
+
+    def target():
+        for _ in range(scale):
+            done: List[None] = []
+            run_thread(lambda: None, on_complete=done.append)
+            wait_until(lambda: done)
+
+    yield target
@@ -0,0 +1,262 @@
+"""
+Contains the machinery to register, run and compare the benchmarks.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import pkgutil
+import platform
+import re
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence
+
+import wx
+
+from guikit.core import MainApp
+
+BENCHMARKS: List[Benchmark] = []
+"""Benchmarks registered with the `benchmark` decorator."""
+
+
+@dataclass
+class Benchmark:
+    """A benchmark to run at several scales.
+
+    The function is called with the scale and must be a generator yielding the callable
+    to time. Any setup is done before yielding, and any clean up after it, so neither is
+    timed.
+    """
+
+    name: str
+    function: Callable[[int], Generator[Callable[[], Any], None, None]]
+    scales: Sequence[int]
+
+
+@dataclass
+class Result:
+    """Timing of a benchmark at a given scale, in seconds per run."""
+
+    name: str
+    scale: int
+    repeat: int
+    best: float
+    median: float
+
+    @property
+    def key(self) -> str:
+        """Identifier of the benchmark and scale, used to compare results."""
+        return f"{self.name}[{self.scale}]"
+
+
+def benchmark(*scales: int) -> Callable:
+    """Registers a benchmark to be run at the given scales.
+
+    ```python
+    @benchmark(10, 100)
+    def some_benchmark(scale: int):
+        data = setup(scale)
+        yield lambda: process(data)
+        teardown(data)
+    ```
+
+    Args:
+        scales: Scales the benchmark will be run at.
+
+    Returns:
+        The decorator, which returns the function unchanged.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        BENCHMARKS.append(Benchmark(function.__name__, function, scales))
+        return function
+
+    return decorator
+
+
+def wait_until(condition: Callable[[], Any], timeout: float = 60) -> None:
+    """Processes the pending events of the application until a condition is met.
+
+    Args:
+        condition: Function returning True when done.
+        timeout: Maximum time to wait, in seconds.
+
+    Raises:
+        TimeoutError: If the condition is not met in time.
+    """
+    end = time.perf_counter() + timeout
+    app = wx.GetApp()
+    while not condition():
+        if time.perf_counter() > end:
+            raise TimeoutError("Condition not met in time.")
+        app.ProcessPendingEvents()
+        time.sleep(0)
+
+
+def collect_benchmarks() -> List[Benchmark]:
+    """Imports all the 'bench_*' modules of this package, registering their benchmarks.
+
+    Returns:
+        The benchmarks registered.
+    """
+    package = Path(__file__).parent
+    for module in pkgutil.iter_modules([str(package)]):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"{__package__}.{module.name}")
+    return BENCHMARKS
+
+
+def run_benchmark(bench: Benchmark, scale: int, repeat: int = 5) -> Result:
+    """Runs a benchmark at a given scale several times.
+
+    Args:
+        bench: The benchmark to run.
+        scale: The scale to run it at.
+        repeat: Number of times to run it.
+
+    Returns:
+        The best and median time of the runs.
+    """
+    steps = bench.function(scale)
+    target = next(steps)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        target()
+        times.append(time.perf_counter() - start)
+    next(steps, None)
+
+    return Result(bench.name, scale, repeat, min(times), statistics.median(times))
+
+
+def compare(
+    results: List[Result], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Compares the results with a baseline, using the best time of each.
+
+    Args:
+        results: The results of the current run.
+        baseline: Results of a previous run, as saved by `main`.
+        tolerance: Fraction the time can increase over the baseline without being
+            considered a regression.
+
+    Returns:
+        The description of the regressions found, if any.
+    """
+    previous = {
+        f"{r['name']}[{r['scale']}]": r["best"] for r in baseline.get("results", [])
+    }
+    regressions = []
+    for result in results:
+        if result.key not in previous:
+            continue
+
+        ratio = result.best / previous[result.key]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{result.key}: {result.best * 1000:.3f} ms is {ratio:.2f} times the "
+                f"baseline, {previous[result.key] * 1000:.3f} ms"
+            )
+    return regressions
+
+
+def environment() -> Dict[str, str]:
+    """Describes the environment the benchmarks are run in.
+
+    Returns:
+        The versions of Python and wxPython and the platform.
+    """
+    return {
+        "python": platform.python_version(),
+        "wx": wx.version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Args:
+        args: The arguments. If None, they are taken from the command line.
+
+    Returns:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="benchmarks", description="Runs the benchmarks of guikit."
+    )
+    parser.add_argument(
+        "-k", "--filter", default="", help="Only run benchmarks matching this regex."
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Times each benchmark is run."
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Save the results as JSON.")
+    parser.add_argument(
+        "--save-baseline", type=Path, help="Save the results as the baseline."
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Fail if slower than this baseline."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Fraction of slowdown over the baseline that is tolerated.",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Runs the benchmarks, prints and saves the results and compares them.
+
+    Args:
+        args: The command line arguments. If None, they are taken from the command line.
+
+    Returns:
+        The exit code: 1 if there are regressions, 0 otherwise.
+    """
+    options = parse_args(args)
+    pattern = re.compile(options.filter)
+
+    app = MainApp(title="Benchmarks", headless=True)
+
+    results = []
+    for bench in collect_benchmarks():
+        if not pattern.search(bench.name):
+            continue
+        for scale in bench.scales:
+            result = run_benchmark(bench, scale, options.repeat)
+            results.append(result)
+            print(
+                f"{result.key:<45} best {result.best * 1000:10.3f} ms   "
+                f"median {result.median * 1000:10.3f} ms"
+            )
+
+    del app
+
+    output = {
+        "environment": environment(),
+        "results": [asdict(r) for r in results],
+    }
+    for path in (options.output, options.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(output, indent=2))
+
+    if options.compare is None:
+        return 0
+
+    baseline = json.loads(options.compare.read_text())
+    if baseline.get("environment") != output["environment"]:
+        print("Warning: the baseline was taken in a different environment.")
+
+    regressions = compare(results, baseline, options.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
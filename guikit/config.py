@@ -2,7 +2,7 @@
 Settings for configuring the application general behavior, plugging collection and other
 aspects of the tool.
 """
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from .plugins import collect_builtin_extensions
 
@@ -23,3 +23,15 @@ TAB_STYLE: str = "top"
 
 SIZE_MAINWINDOW: Tuple[int, int] = (800, 600)
 """Input for main window size."""
+
+PROFILE_MESSAGES: Optional[float] = None
+"""Time budget, in ms, of pubsub listeners. If set, messages are profiled."""
+
+SINGLE_INSTANCE: bool = False
+"""If launching the app again should forward the arguments to the running instance."""
+
+SAVE_SESSION: bool = False
+"""If the window layout and the state of the plugins should be restored on launch."""
+
+LOG_VIEWER: bool = False
+"""If a tab should display, live, the records logged by the application."""
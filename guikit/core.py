@@ -9,15 +9,22 @@ instance can be access directly from the class anywhere else where you import th
 """
 from __future__ import annotations
 
-import itertools
 import sys
-from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
 
 import wx
+from pubsub import pub
 
+from .instance import InstanceServer, absolute_args
 from .logging import logger
-from .plugins import KNOWN_PLUGINS, MenuTool, load_plugins
-from .threads import ThreadPool
+from .messaging import publish
+from .plugins import KNOWN_PLUGINS, MenuTool, PluginBase, load_plugins
+from .progress import Aggregator
+from .scheduler import Scheduler
+from .session import load_session, plugin_key, save_session, session_path
+from .threads import ThreadPool, run_thread
 
 
 class StatusBar(wx.StatusBar):
@@ -36,7 +43,9 @@ class StatusBar(wx.StatusBar):
     'wx.StatusBar' for more information about the options available.
 
     Use `status_bar.progress_bar.SomeMethod` to manage the progress bar properties.
-    See 'wx.Gauge' for more information about the options available.
+    See 'wx.Gauge' for more information about the options available. The progress bar
+    is driven by the `guikit.progress.Aggregator`, so rather than setting its value
+    directly, consider tracking your process as a job with `guikit.progress.add_job`.
     """
 
     def __init__(self, *args, progress_bar_width: int = 150, **kwargs):
@@ -67,8 +76,34 @@ class StatusBar(wx.StatusBar):
 status_bar: Optional[StatusBar] = None
 """Main status bar of the program"""
 
+main_window: Optional[MainWindow] = None
+"""Main window of the program"""
+
 
 class MainWindow(wx.Frame):
+    """The main window, populated with the menus, tools and widgets of the plugins.
+
+    If a session file is given, the session is saved to it when the window closes and
+    restored when it is populated. The geometry of the window and the tab selected are
+    restored straight away, but the state of each plugin only when one of its tabs is
+    first selected, so the window is shown before any slow work starts. See
+    `guikit.session`.
+
+    Menu entries and toolbar items can be added, removed, enabled and disabled at any
+    time, e.g. by plugins loaded later with `add_plugins`, without rebuilding the menu
+    bar and the toolbar. Several updates can be grouped with `batch_update` so they are
+    drawn at once. The main window is available as `guikit.core.main_window`.
+
+    Args:
+        parent: The parent window, if any.
+        title: Title of the window.
+        size: Initial size of the window.
+        notebook_layout: If the plugins tabs should be used, rather than a central
+            widget.
+        tab_style: Location of the tabs, as a wx.Notebook style.
+        session_file: File to save the session to. If None, it is not saved.
+    """
+
     def __init__(
         self,
         parent,
@@ -76,15 +111,27 @@ class MainWindow(wx.Frame):
         size: Tuple[int, int],
         notebook_layout: bool = True,
         tab_style: int = wx.NB_TOP,
+        session_file: Optional[Path] = None,
     ):
         super(MainWindow, self).__init__(parent, title=title)
         self.size = size
         self.notebook_layout = notebook_layout
         self.tab_style = tab_style
-
-        global status_bar
+        self.session_file = session_file
+        self._plugins: Dict[Type[PluginBase], PluginBase] = {}
+        self._page_plugins: Dict[int, PluginBase] = {}
+        self._pending_states: Dict[PluginBase, Dict[str, Any]] = {}
+        self._session_states: Dict[str, Dict[str, Any]] = {}
+        self._menu_entries: Dict[int, List[Tuple[str, wx.MenuItem, Any]]] = {}
+        self._toolbar_items: Dict[int, List[Any]] = {}
+        self._batch_depth = 0
+        self._toolbar_changed = False
+
+        global main_window, status_bar
+        main_window = self
         status_bar = StatusBar(self)
         self.SetStatusBar(status_bar)
+        Aggregator(status_bar.progress_bar)
 
     def populate_window(self):
         """Adds menu items, tools and other widgets in plugins to the main window."""
@@ -95,6 +142,127 @@ class MainWindow(wx.Frame):
         self._make_toolbar()
         self._make_menubar()
         self.SetInitialSize(wx.Size(self.size))
+        if self.session_file is not None:
+            self._restore_session(self.session_file)
+
+    def plugins(self) -> List[PluginBase]:
+        """Instances of the plugins loaded, each created only once.
+
+        Returns:
+            The instances, in the order the plugins were loaded.
+        """
+        for view in KNOWN_PLUGINS:
+            if view not in self._plugins:
+                self._plugins[view] = view()
+        return list(self._plugins.values())
+
+    def save_session(self) -> None:
+        """Saves the geometry of the window, tab selected and state of the plugins.
+
+        Plugins whose state was never restored, as none of their tabs was selected, keep
+        the state of the previous session.
+        """
+        if self.session_file is None:
+            return
+
+        states = {}
+        for plugin in self.plugins():
+            if plugin in self._pending_states:
+                state = self._pending_states[plugin]
+            else:
+                try:
+                    state = plugin.save_state()
+                except Exception as err:
+                    logger.warning(
+                        f"The state of '{plugin_key(type(plugin))}' could not be "
+                        f"saved: {err}"
+                    )
+                    continue
+            if state:
+                states[plugin_key(type(plugin))] = state
+
+        session: Dict[str, Any] = {
+            "window": {
+                "size": list(self.GetSize()),
+                "position": list(self.GetPosition()),
+                "maximized": self.IsMaximized(),
+            },
+            "plugins": states,
+        }
+        if self.notebook_layout and self.notebook.PageCount > 0:
+            session["selection"] = self.notebook.GetSelection()
+
+        save_session(self.session_file, session)
+
+    def _restore_session(self, session_file: Path) -> None:
+        """Restores the session saved, leaving the state of the plugins for later.
+
+        Args:
+            session_file: The file the session was saved to.
+        """
+        session = load_session(session_file)
+        geometry = session.get("window", {})
+        if "size" in geometry:
+            self.SetSize(wx.Size(*geometry["size"]))
+        if "position" in geometry:
+            position = wx.Point(*geometry["position"])
+            # The display the window was on might not be connected anymore
+            if wx.Display.GetFromPoint(position) != wx.NOT_FOUND:
+                self.SetPosition(position)
+        if geometry.get("maximized", False):
+            self.Maximize()
+
+        states = self._session_states = session.get("plugins", {})
+        for plugin in self.plugins():
+            if plugin_key(type(plugin)) in states:
+                self._pending_states[plugin] = states[plugin_key(type(plugin))]
+
+        selection = 0
+        if self.notebook_layout and self.notebook.PageCount > 0:
+            selection = session.get("selection", 0)
+            if not 0 <= selection < self.notebook.PageCount:
+                selection = 0
+            # Unlike SetSelection, it does not send events
+            self.notebook.ChangeSelection(selection)
+
+        wx.CallAfter(self._restore_page, selection)
+        with_tabs = set(self._page_plugins.values())
+        for plugin in list(self._pending_states):
+            if plugin not in with_tabs:
+                wx.CallAfter(self._restore_plugin, plugin)
+
+    def _on_page_changed(self, event: wx.BookCtrlEvent) -> None:
+        """Restores the state of the plugin of a tab, if selected for the first time."""
+        self._restore_page(event.GetSelection())
+        event.Skip()
+
+    def _restore_page(self, index: int) -> None:
+        """Restores the state of the plugin providing a tab, if still pending.
+
+        Args:
+            index: Position of the tab in the notebook.
+        """
+        plugin = self._page_plugins.get(index)
+        if plugin is not None:
+            self._restore_plugin(plugin)
+
+    def _restore_plugin(self, plugin: PluginBase) -> None:
+        """Restores the state of a plugin, if still pending.
+
+        Args:
+            plugin: The plugin.
+        """
+        state = self._pending_states.pop(plugin, None)
+        if state is None:
+            return
+
+        try:
+            plugin.restore_state(state)
+        except Exception as err:
+            logger.warning(
+                f"The state of '{plugin_key(type(plugin))}' could not be restored: "
+                f"{err}"
+            )
 
     def on_quit(self, evt):
         """Event to close the main window from the menu."""
@@ -112,56 +280,278 @@ class MainWindow(wx.Frame):
             ),
         ]
 
-    def _make_menubar(self) -> None:
-        """Create the menu bar from the entries provided by the widgets."""
-        # Collecting the menu entries
-        entries_ = [view().menu_entries() for view in KNOWN_PLUGINS]
-        if sys.platform != "darwin":
-            entries_ = [
-                self.populate_built_in_menu(),
-            ] + entries_
+    @contextmanager
+    def batch_update(self) -> Iterator[None]:
+        """Groups several updates of the window so they are drawn at once.
+
+        The window is frozen until the outermost batch finishes, and the toolbar is then
+        laid out only once, if it changed. Batches can be nested.
+
+        ```python
+        with main_window.batch_update():
+            main_window.remove_menu_entries(old_ids)
+            main_window.add_toolbar_items(new_tools)
+        ```
+        """
+        if self._batch_depth == 0:
+            self.Freeze()
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._realize_toolbar()
+                self.Thaw()
+
+    def add_plugins(self, plugin_list: List[str]) -> None:
+        """Loads plugins after the window has been populated.
 
-        entries = itertools.chain.from_iterable(entries_)
+        Their menu entries, toolbar items and tabs are added to those already in the
+        window. The tabs are added after the existing ones, following their order. Their
+        state in the session restored, if any, is restored as for the other plugins.
 
-        # Creating the menus
-        menus = dict()
+        Args:
+            plugin_list: A list of plugins to be loaded.
+
+        Raises:
+            ValueError: If the window has a central widget and any of the new plugins
+                provides another one. The new plugins are then discarded.
+        """
+        loaded = set(self._plugins)
+        load_plugins(plugin_list)
+        new = [view for view in self.plugins() if type(view) not in loaded]
+        if not self.notebook_layout:
+            self._check_no_central_widget(new)
+
+        for view in new:
+            state = self._session_states.get(plugin_key(type(view)))
+            if state is not None:
+                self._pending_states[view] = state
+
+        with_tabs: Set[PluginBase] = set()
+        with self.batch_update():
+            self.add_menu_entries([e for view in new for e in view.menu_entries()])
+            self.add_toolbar_items([t for view in new for t in view.toolbar_items()])
+            if self.notebook_layout:
+                tabs = [(tab, view) for view in new for tab in view.tabs(self.notebook)]
+                for tab, view in sorted(tabs, key=lambda x: x[0].order):
+                    self._page_plugins[self.notebook.PageCount] = view
+                    self.notebook.AddPage(tab.page, tab.text, tab.select, tab.imageId)
+                    with_tabs.add(view)
+                # The tab selected might be new
+                wx.CallAfter(self._restore_page, self.notebook.GetSelection())
+
+        for view in new:
+            if view in self._pending_states and view not in with_tabs:
+                wx.CallAfter(self._restore_plugin, view)
+
+    def _check_no_central_widget(self, plugins: List[PluginBase]) -> None:
+        """Checks that none of the plugins provides a central widget.
+
+        Args:
+            plugins: The plugins to check.
+
+        Raises:
+            ValueError: If any plugin provides a central widget. The plugins are then
+                discarded, and the widgets destroyed.
+        """
+        widgets = [w for w in (view.central(self) for view in plugins) if w is not None]
+        if len(widgets) == 0:
+            return
+
+        for widget in widgets:
+            widget.Destroy()
+        for view in plugins:
+            del self._plugins[type(view)]
+            KNOWN_PLUGINS.remove(type(view))
+        raise ValueError(
+            f"Exactly 1 central widget needs to be provided. {len(widgets)} more given."
+        )
+
+    def add_menu_entries(self, entries: List[MenuTool]) -> List[int]:
+        """Adds entries to the menus, creating the menus that do not exist yet.
+
+        Args:
+            entries: The entries to add.
+
+        Returns:
+            The identifier of each entry, to update or remove them later.
+        """
+        menu_bar = self.GetMenuBar()
+        if menu_bar is None:
+            menu_bar = wx.MenuBar()
+            self.SetMenuBar(menu_bar)
+
+        ids = []
         for entry in entries:
-            if entry.menu not in menus:
-                menus[entry.menu] = wx.Menu()
+            position = menu_bar.FindMenu(entry.menu)
+            if position == wx.NOT_FOUND:
+                menu = wx.Menu()
+                menu_bar.Append(menu, entry.menu)
+            else:
+                menu = menu_bar.GetMenu(position)
+
+            item = menu.Append(entry.id, entry.text, entry.description, entry.kind)
+            if entry.callback is not None:
+                self.Bind(wx.EVT_MENU, entry.callback, item)
 
-            menu_entry = menus[entry.menu].Append(
-                entry.id, entry.text, entry.description, entry.kind
+            self._menu_entries.setdefault(item.GetId(), []).append(
+                (entry.menu, item, entry.callback)
             )
+            ids.append(item.GetId())
 
-            if entry.callback is not None:
-                self.Bind(wx.EVT_MENU, entry.callback, menu_entry)
+        return ids
 
-        # Creating the menubar.
-        menu_bar = wx.MenuBar()
-        for name, item in menus.items():
-            menu_bar.Append(item, name)
+    def remove_menu_entries(self, ids: List[int]) -> None:
+        """Removes entries from the menus, and the menus left empty.
 
-        # Adding the MenuBar to the Frame content.
-        self.SetMenuBar(menu_bar)
+        Args:
+            ids: Identifiers of the entries to remove, as returned by
+                `add_menu_entries`. All the entries with each identifier are removed.
 
-    def _make_toolbar(self):
-        """Create the tool bar from the entries provided by the widgets."""
-        # Collect tools
-        tools = itertools.chain.from_iterable(
-            [view().toolbar_items() for view in KNOWN_PLUGINS]
-        )
+        Raises:
+            KeyError: If any of the identifiers does not belong to an entry.
+        """
+        self._check_ids(ids, self._menu_entries)
+        menu_bar = self.GetMenuBar()
+        for ident in ids:
+            for name, item, callback in self._menu_entries.pop(ident):
+                if callback is not None:
+                    self.Unbind(wx.EVT_MENU, id=ident, handler=callback)
+
+                position = menu_bar.FindMenu(name)
+                menu = menu_bar.GetMenu(position)
+                menu.Delete(item)
+                if menu.GetMenuItemCount() == 0:
+                    menu_bar.Remove(position).Destroy()
+
+    def enable_menu_entries(self, ids: List[int], enable: bool = True) -> None:
+        """Enables or disables entries of the menus.
 
-        # Including the tools
-        toolbar = self.CreateToolBar()
+        Args:
+            ids: Identifiers of the entries, as returned by `add_menu_entries`.
+            enable: If the entries should be enabled, rather than disabled.
+
+        Raises:
+            KeyError: If any of the identifiers does not belong to an entry.
+        """
+        self._check_ids(ids, self._menu_entries)
+        menu_bar = self.GetMenuBar()
+        for ident in ids:
+            menu_bar.Enable(ident, enable)
+
+    def add_toolbar_items(self, tools: List[MenuTool]) -> List[int]:
+        """Adds items to the toolbar, creating it if it does not exist yet.
+
+        Args:
+            tools: The items to add.
+
+        Returns:
+            The identifier of each item, to update or remove them later.
+        """
+        toolbar = self.GetToolBar()
+        if toolbar is None:
+            toolbar = self.CreateToolBar()
+
+        ids = []
         for tool in tools:
             item = toolbar.AddTool(
                 tool.id, tool.text, tool.bitmap, tool.short_help, tool.kind
             )
-
             if tool.callback is not None:
                 self.Bind(wx.EVT_MENU, tool.callback, item)
 
-        toolbar.Realize()
+            self._toolbar_items.setdefault(item.GetId(), []).append(tool.callback)
+            ids.append(item.GetId())
+
+        self._toolbar_updated()
+        return ids
+
+    def remove_toolbar_items(self, ids: List[int]) -> None:
+        """Removes items from the toolbar.
+
+        Args:
+            ids: Identifiers of the items to remove, as returned by
+                `add_toolbar_items`. All the items with each identifier are removed.
+
+        Raises:
+            KeyError: If any of the identifiers does not belong to an item.
+        """
+        self._check_ids(ids, self._toolbar_items)
+        toolbar = self.GetToolBar()
+        for ident in ids:
+            for callback in self._toolbar_items.pop(ident):
+                if callback is not None:
+                    self.Unbind(wx.EVT_MENU, id=ident, handler=callback)
+                toolbar.DeleteTool(ident)
+
+        self._toolbar_updated()
+
+    def enable_toolbar_items(self, ids: List[int], enable: bool = True) -> None:
+        """Enables or disables items of the toolbar.
+
+        Args:
+            ids: Identifiers of the items, as returned by `add_toolbar_items`.
+            enable: If the items should be enabled, rather than disabled.
+
+        Raises:
+            KeyError: If any of the identifiers does not belong to an item.
+        """
+        self._check_ids(ids, self._toolbar_items)
+        toolbar = self.GetToolBar()
+        for ident in ids:
+            toolbar.EnableTool(ident, enable)
+
+    @staticmethod
+    def _check_ids(ids: List[int], known: Dict[int, Any]) -> None:
+        """Checks that all the identifiers are known, before updating anything.
+
+        Args:
+            ids: The identifiers.
+            known: The entries or items, indexed by identifier.
+
+        Raises:
+            KeyError: If any of the identifiers is not known.
+        """
+        missing = [ident for ident in ids if ident not in known]
+        if missing:
+            raise KeyError(f"Unknown identifiers {missing}.")
+
+    def _toolbar_updated(self) -> None:
+        """Lays out the toolbar after a change, unless updating in a batch."""
+        self._toolbar_changed = True
+        if self._batch_depth == 0:
+            self._realize_toolbar()
+
+    def _realize_toolbar(self) -> None:
+        """Lays out the toolbar, if it changed."""
+        toolbar = self.GetToolBar()
+        if self._toolbar_changed and toolbar is not None:
+            toolbar.Realize()
+        self._toolbar_changed = False
+
+    def _make_menubar(self) -> None:
+        """Create the menu bar from the entries provided by the widgets."""
+        # Collecting the menu entries
+        entries = [entry for view in self.plugins() for entry in view.menu_entries()]
+        if sys.platform != "darwin":
+            entries = self.populate_built_in_menu() + entries
+
+        # Creating the menubar and the menus
+        self._menu_entries = {}
+        self.SetMenuBar(wx.MenuBar())
+        self.add_menu_entries(entries)
+
+    def _make_toolbar(self):
+        """Create the tool bar from the entries provided by the widgets."""
+        # Collect tools
+        tools = [tool for view in self.plugins() for tool in view.toolbar_items()]
+
+        # Including the tools
+        self._toolbar_items = {}
+        self.CreateToolBar()
+        self.add_toolbar_items(tools)
 
     def _make_notebook(self, tab_style: int = wx.NB_TOP) -> None:
         """Create the central widget of the window as a notebook.
@@ -175,14 +565,17 @@ class MainWindow(wx.Frame):
                 wx.NB_FIXEDWIDTH, wx.NB_MULTILINE and wx.NB_NOPAGETHEME.
         """
         self.notebook = wx.Notebook(self, style=tab_style)
+        self.notebook.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self._on_page_changed)
 
-        # Collect tabs
-        tabs = itertools.chain.from_iterable(
-            [view().tabs(self.notebook) for view in KNOWN_PLUGINS]
-        )
+        # Collect tabs, remembering the plugin providing each of them
+        tabs = [
+            (tab, view) for view in self.plugins() for tab in view.tabs(self.notebook)
+        ]
 
         # Add tabs to notebook
-        for tab in sorted(tabs, key=lambda x: x.order):
+        self._page_plugins = {}
+        for tab, view in sorted(tabs, key=lambda x: x[0].order):
+            self._page_plugins[self.notebook.PageCount] = view
             self.notebook.AddPage(tab.page, tab.text, tab.select, tab.imageId)
 
         if self.notebook.PageCount > 0:
@@ -198,7 +591,7 @@ class MainWindow(wx.Frame):
             ValueError: If the number of central widgets found is not 1.
         """
         widget = [
-            v for v in [view().central(self) for view in KNOWN_PLUGINS] if v is not None
+            v for v in [view.central(self) for view in self.plugins()] if v is not None
         ]
 
         if len(widget) != 1:
@@ -216,6 +609,39 @@ _tab_location: Dict[str, int] = {
 
 
 class MainApp(wx.App):
+    """The application, loading the plugins and creating the main window.
+
+    In headless mode, the plugins are loaded and the event loop runs, so worker threads,
+    their callbacks and messages sent with `guikit.messaging` are processed as usual,
+    but no window is created. The events of the worker threads are processed by a plain
+    event handler instead of the main window, and the threads are stopped when the event
+    loop exits. This is useful to run plugin pipelines as batch jobs or benchmarks - see
+    `run_headless`. Note that wxPython still needs a display to start on Linux, which
+    can be a virtual one, e.g. running the program with 'xvfb-run'.
+
+    In single instance mode, the app listens for later launches, which forward their
+    arguments to it instead of starting - see `guikit.instance`. The arguments are
+    published in 'app.open', as are those the app is launched with, and the main window
+    is brought to the front.
+
+    If a session name is given, the session is saved on exit and restored on launch -
+    see `MainWindow`.
+
+    Args:
+        title: Name of the application and title of the main window.
+        size_mainwindow: Initial size of the main window.
+        plugins_list: Plugins to load.
+        notebook_layout: If the plugins tabs should be used, rather than a central
+            widget.
+        tab_style: Location of the tabs: 'top', 'bottom', 'left' or 'right'.
+        headless: If no window should be created.
+        instance_name: Name identifying the app in single instance mode. If None, every
+            launch runs its own instance.
+        open_args: Arguments the app is launched with to open, e.g. files.
+        session_name: Name identifying the app when saving its session. If None, the
+            session is not saved.
+    """
+
     def __init__(
         self,
         *args,
@@ -224,9 +650,19 @@ class MainApp(wx.App):
         plugins_list: Optional[List[str]] = None,
         notebook_layout: bool = True,
         tab_style: str = "top",
+        headless: bool = False,
+        instance_name: Optional[str] = None,
+        open_args: Optional[List[str]] = None,
+        session_name: Optional[str] = None,
         **kwargs,
     ):
         self.title = title
+        self.headless = headless
+        self.handler: Optional[wx.EvtHandler] = None
+        self.instance_name = instance_name
+        self.instance_server: Optional[InstanceServer] = None
+        self.open_args = open_args if open_args is not None else []
+        self.session_name = session_name
         self.size_mainwindow = size_mainwindow
         self.plugins_list = plugins_list if plugins_list is not None else []
         self.notebook_layout = notebook_layout
@@ -243,8 +679,22 @@ class MainApp(wx.App):
 
     def OnInit(self) -> bool:
         self.SetAppName(self.title)
+        Scheduler().start()
+        self._init_instance()
+        if self.headless:
+            self.handler = wx.EvtHandler()
+            ThreadPool(self.handler)
+            load_plugins(self.plugins_list)
+            self._open_args()
+            return True
+
         window = MainWindow(
-            None, self.title, self.size_mainwindow, self.notebook_layout, self.tab_style
+            None,
+            self.title,
+            self.size_mainwindow,
+            self.notebook_layout,
+            self.tab_style,
+            session_path(self.session_name) if self.session_name is not None else None,
         )
         self.SetTopWindow(window)
         ThreadPool(window)
@@ -253,14 +703,109 @@ class MainApp(wx.App):
         load_plugins(self.plugins_list)
         window.populate_window()
         window.Show(True)
+        self._open_args()
 
         return True
 
+    def OnExit(self) -> int:
+        Scheduler().stop()
+        if self.instance_server is not None:
+            self.instance_server.stop()
+        if self.headless:
+            ThreadPool().stop_threads()
+        return super(MainApp, self).OnExit()
+
+    def _init_instance(self) -> None:
+        """Listens for other launches, if single instance.
+
+        It is done before creating the window, so no launch in the meantime starts
+        another instance. The arguments they forward are published in the GUI thread,
+        so they are only processed once the window and the plugins are ready.
+        """
+        if self.instance_name is None:
+            return
+
+        server = InstanceServer(
+            self.instance_name, lambda args: publish("app.open", args=args)
+        )
+        if server.start():
+            self.instance_server = server
+
+    def _open_args(self) -> None:
+        """Opens the arguments of the launch, once the plugins are ready."""
+        pub.subscribe(self.on_open, "app.open")
+        if self.open_args:
+            publish("app.open", args=absolute_args(self.open_args))
+
+    def on_open(self, args: List[str]) -> None:
+        """Brings the main window to the front when asked to open something.
+
+        Args:
+            args: The arguments to open.
+        """
+        window = self.GetTopWindow()
+        if window is None:
+            return
+
+        window.Iconize(False)
+        window.Raise()
+
+
+def run_headless(
+    target: Callable, plugins_list: Optional[List[str]] = None, title: str = ""
+) -> Any:
+    """Runs a task in a worker thread of a headless application until it finishes.
+
+    The event loop runs while the task does, so the callbacks of any other worker thread
+    it starts and the messages it publishes are processed.
+
+    Args:
+        target: The function to run.
+        plugins_list: Plugins to load before running the task.
+        title: Name of the application.
+
+    Raises:
+        RuntimeError: If the task raises an exception.
+
+    Returns:
+        The value returned by the task, also if it is aborted.
+    """
+    app = MainApp(title=title, plugins_list=plugins_list, headless=True)
+    outcome: Dict[str, Any] = {}
+
+    def finish(result: Any) -> None:
+        outcome["result"] = result
+        app.ExitMainLoop()
+
+    def task() -> Any:
+        # Errors are kept here rather than left to the worker thread, so the loop
+        # always exits and the original exception is not lost
+        try:
+            return target()
+        except Exception as err:
+            outcome["error"] = err
+
+    run_thread(
+        task,
+        on_abort=finish,
+        on_complete=finish,
+    )
+    app.MainLoop()
+
+    if "error" in outcome:
+        err = outcome["error"]
+        raise RuntimeError(f"The task failed: {err!r}") from err
+    return outcome.get("result")
+
 
 def stop_threads_and_close_window(event: wx.CloseEvent):
-    """Stop all running threads and close main window."""
+    """Save the session, stop all running threads and close main window."""
+    window = event.GetEventObject()
+    if isinstance(window, MainWindow):
+        window.save_session()
+
     ThreadPool().stop_threads()
 
     # Close main window. Note that we do this last as worker threads may
     # be accessing the window object up until they finish.
-    event.GetEventObject().Destroy()
+    window.Destroy()
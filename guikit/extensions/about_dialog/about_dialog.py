@@ -1,16 +1,18 @@
-from pathlib import Path
 from typing import List
 
 import wx
 import wx.adv
 
 from guikit.plugins import MenuTool, PluginBase
+from guikit.resources import icon, preload, text
 
 from ... import VERSION
 
 
 class AboutDialogPlugin(PluginBase):
     def menu_entries(self) -> List[MenuTool]:
+        # Decoding the logo takes a while, so it is done before the dialog is opened
+        preload(icon, __package__, "logo.png")
         return [
             MenuTool(
                 menu="About",
@@ -22,23 +24,15 @@ class AboutDialogPlugin(PluginBase):
         ]
 
     def OnAboutBox(self, e):
-        with (Path(__file__).parent / "description").open("r") as f:
-            description = f.read()
-
-        with (Path(__file__).parent / "license").open("r") as f:
-            licence = f.read()
-
         info = wx.adv.AboutDialogInfo()
 
-        info.SetIcon(
-            wx.Icon(str(Path(__file__).parent / "logo.png"), wx.BITMAP_TYPE_PNG)
-        )
+        info.SetIcon(icon(__package__, "logo.png"))
         info.SetName("PyGUItemp")
         info.SetVersion(VERSION)
-        info.SetDescription(description)
+        info.SetDescription(text(__package__, "description"))
         info.SetCopyright("(C) Imperial College London")
         info.SetWebSite("https://imperialcollegelondon.github.io/python-gui-template/")
-        info.SetLicence(licence)
+        info.SetLicence(text(__package__, "license"))
         info.AddDeveloper("Diego Alonso Álvarez")
         info.AddDocWriter("Diego Alonso Álvarez")
 
@@ -1,6 +1,7 @@
 import wx
 
 from guikit.plugins import MenuTool, PluginBase
+from guikit.resources import art
 
 
 class ToolbarPlugin(PluginBase):
@@ -10,9 +11,7 @@ class ToolbarPlugin(PluginBase):
             text="Save data",
             description="Save selected data into disk",
             short_help="Save selected data into disk",
-            bitmap=wx.ArtProvider.GetBitmap(
-                wx.ART_FILE_SAVE, wx.ART_TOOLBAR, wx.Size(50, 50)
-            ),
+            bitmap=art(wx.ART_FILE_SAVE, wx.ART_TOOLBAR, (50, 50)),
             callback=save_data,
         )
         load = MenuTool(
@@ -20,9 +19,7 @@ class ToolbarPlugin(PluginBase):
             text="Load data",
             description="Load new data from disk",
             short_help="Load new data from disk",
-            bitmap=wx.ArtProvider.GetBitmap(
-                wx.ART_FILE_OPEN, wx.ART_TOOLBAR, wx.Size(50, 50)
-            ),
+            bitmap=art(wx.ART_FILE_OPEN, wx.ART_TOOLBAR, (50, 50)),
             callback=load_data,
         )
         return [save, load]
@@ -6,5 +6,33 @@ Channels:
         - filename (str): Path of tha data loaded or an error message.
         - data (Optional[pd.DataFrame]): Data as a pandas dataframe or None if there is
             o data.
+    data.memory: Triggered after 'data.load' when the data has been loaded optimising
+        its memory usage.
+        - before (int): Memory, in bytes, the data would have used with default types.
+        - after (int): Memory, in bytes, the data actually uses.
+    data.browse: Triggered when a file is opened to be browsed without loading it in
+        memory.
+        - filename (str): Path of the file.
+        - index (CsvIndex): The index used to read the rows of the file.
+    data.browse_progress: Triggered, in the GUI thread, as the file being browsed is
+        indexed. If the GUI falls behind, only the latest progress is delivered.
+        - index (CsvIndex): The index of the file.
+        - nrows (int): Number of rows that can be read so far.
+    data.append: Triggered when new rows are added to the data already loaded.
+        - data (pd.DataFrame): Rows to append. Must have the same columns as the data
+            already loaded.
+    data.update: Triggered when some values of the data already loaded change.
+        - data (pd.DataFrame): New values, aligned with the loaded data by index and
+            column labels. Missing (NaN) values are ignored.
+    data.change: Triggered after 'data.append' and 'data.update', once the data
+        loaded has changed.
+        - filename (str): Path of the data loaded.
+        - data (pd.DataFrame): All the data, with the rows appended or values updated.
+        - revision (int): Number of times the data has changed since it was loaded.
+    data.statistics: Triggered, in the GUI thread, each time the statistics of a column
+        of the loaded data are available.
+        - key (Hashable): Key identifying the dataset the statistics belong to.
+        - index (int): Position of the column.
+        - statistics (Dict[str, Any]): Value of each of the statistics of the column.
 """
 from .presenter import DataLoaderTab  # noqa
@@ -1,22 +1,554 @@
+from __future__ import annotations
+
+import csv
+import io
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
 import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_numeric_dtype,
+    is_object_dtype,
+    is_string_dtype,
+    union_categoricals,
+)
 from pubsub import pub
 
+from guikit.settings import get_setting, set_setting
+
+SETTINGS = "load_data"
+"""Section of the user settings of this plugin."""
+
+RECENT_FILES = 10
+"""Number of files loaded or browsed that are remembered."""
+
+CHUNK_SIZE = 100_000
+"""Number of rows read at a time when loading data in memory optimising mode."""
+
+CATEGORY_MAX_RATIO = 0.5
+"""Maximum ratio of distinct values to rows for a text column to become categorical."""
+
+PAGE_SIZE = 1000
+"""Number of rows per page when browsing files out of core."""
+
+PAGE_CACHE_SIZE = 16
+"""Number of pages kept in memory when browsing files out of core."""
+
+STATISTICS = ("dtype", "count", "nulls", "distinct", "min", "max", "mean")
+"""Statistics calculated for each column of the data."""
+
+STATISTICS_CACHE_SIZE = 8
+"""Number of datasets for which the statistics are remembered."""
 
-def load_data(filename: str) -> None:
+_statistics: OrderedDict = OrderedDict()
+"""Cache of statistics, indexed by dataset key and then by column position."""
+
+_statistics_lock = threading.Lock()
+"""Guards the cache of statistics, used from worker threads."""
+
+
+def load_data(filename: str, optimise_memory: bool = False) -> None:
     """Loads data from disk.
 
     Args:
         filename: Name of the file to load. Must contain data in CSV format.
+        optimise_memory: If the data should be stored using the most compact types
+            possible. See `read_csv_compact`.
     """
     try:
-        data = pd.read_csv(filename)
+        data, memory = read_data(filename, optimise_memory)
     except Exception as err:
-        data = None
-        filename = f"No data could be loaded. {err.args}"
+        publish_data(f"No data could be loaded. {err.args}")
+        return
+
+    publish_data(filename, data, memory)
+
+
+def read_data(
+    filename: str, optimise_memory: bool = False
+) -> Tuple[pd.DataFrame, Optional[Tuple[int, int]]]:
+    """Reads data from disk, without publishing it.
+
+    It does not send any message, so it can be called from a worker thread.
+
+    Args:
+        filename: Name of the file to read. Must contain data in CSV format.
+        optimise_memory: If the data should be stored using the most compact types
+            possible. See `read_csv_compact`.
+
+    Returns:
+        The data and, if optimising memory, the memory it would have used with default
+        types and the memory it actually uses, in bytes.
+    """
+    if optimise_memory:
+        data, before, after = read_csv_compact(filename)
+        return data, (before, after)
+    return pd.read_csv(filename), None
+
+
+def publish_data(
+    filename: str,
+    data: Optional[pd.DataFrame] = None,
+    memory: Optional[Tuple[int, int]] = None,
+) -> None:
+    """Broadcasts data loaded, or the reason why it could not be loaded.
 
+    Args:
+        filename: Name of the file loaded or an error message.
+        data: The data, or None if there is no data.
+        memory: Memory the data would have used with default types and the memory it
+            actually uses, in bytes, if optimised.
+    """
     pub.sendMessage("data.load", filename=filename, data=data)
+    if data is not None and memory is not None:
+        pub.sendMessage("data.memory", before=memory[0], after=memory[1])
 
 
 def delete_data() -> None:
     """Deletes data from memory."""
     pub.sendMessage("data.load", filename="No data loaded", data=None)
+
+
+def browse_data(filename: str) -> Optional[CsvIndex]:
+    """Opens a CSV file to be browsed without loading it in memory.
+
+    The file still needs to be indexed, see `CsvIndex.build`.
+
+    Args:
+        filename: Name of the file to browse. Must contain data in CSV format.
+
+    Returns:
+        The index of the file, or None if it could not be opened.
+    """
+    try:
+        index = CsvIndex(filename)
+    except Exception as err:
+        pub.sendMessage(
+            "data.load", filename=f"No data could be loaded. {err.args}", data=None
+        )
+        return None
+
+    pub.sendMessage("data.browse", filename=filename, index=index)
+    return index
+
+
+def append_data(data: pd.DataFrame) -> None:
+    """Appends new rows to the data already loaded.
+
+    Args:
+        data: The rows to append, with the same columns as the loaded data.
+    """
+    pub.sendMessage("data.append", data=data)
+
+
+def update_data(data: pd.DataFrame) -> None:
+    """Changes in place some of the values of the data already loaded.
+
+    Args:
+        data: The new values, aligned with the loaded data by index and column labels.
+    """
+    pub.sendMessage("data.update", data=data)
+
+
+def recent_files() -> List[str]:
+    """Files loaded or browsed recently, most recent first.
+
+    Returns:
+        The absolute paths of the files.
+    """
+    return get_setting(SETTINGS, "recent_files", [])
+
+
+def add_recent_file(filename: str) -> None:
+    """Remembers a file loaded or browsed, forgetting the oldest if too many.
+
+    Args:
+        filename: Name of the file.
+    """
+    path = str(Path(filename).resolve())
+    files = [path] + [f for f in recent_files() if f != path]
+    set_setting(SETTINGS, "recent_files", files[:RECENT_FILES])
+
+
+def dataset_key(
+    filename: str, data: Optional[pd.DataFrame] = None, revision: int = 0
+) -> Hashable:
+    """Key identifying a dataset, so results derived from it can be cached.
+
+    The key changes if the file is modified, so stale results are not reused. It also
+    changes with the types of the columns, so the same file loaded with and without
+    optimising memory are different datasets, and with the revision of the data, as
+    appending rows or updating values in memory leaves the file untouched.
+
+    Args:
+        filename: Name of the file the data was loaded from.
+        data: The data loaded, if any.
+        revision: Number of times the data has changed since it was loaded.
+
+    Returns:
+        A hashable key made of the resolved path, size and modification time of the
+        file, or just the filename if it cannot be accessed, the column types and the
+        revision.
+    """
+    dtypes = tuple(str(dtype) for dtype in data.dtypes) if data is not None else ()
+    path = Path(filename)
+    try:
+        stat = path.stat()
+    except OSError:
+        return (filename, dtypes, revision)
+    return (str(path.resolve()), stat.st_size, stat.st_mtime_ns, dtypes, revision)
+
+
+def column_statistics(column: pd.Series) -> Dict[str, Any]:
+    """Calculates the summary statistics of a column.
+
+    Minimum and maximum are only calculated for numeric and datetime columns, and the
+    mean only for numeric ones.
+
+    Args:
+        column: The column to summarise.
+
+    Returns:
+        A dictionary with the value of the statistics listed in STATISTICS.
+    """
+    nulls = int(column.isna().sum())
+    statistics: Dict[str, Any] = {
+        "dtype": str(column.dtype),
+        "count": len(column) - nulls,
+        "nulls": nulls,
+        "distinct": int(column.nunique()),
+        "min": None,
+        "max": None,
+        "mean": None,
+    }
+
+    numeric = is_numeric_dtype(column) and not is_bool_dtype(column)
+    if numeric or is_datetime64_any_dtype(column):
+        statistics.update(min=column.min(), max=column.max())
+        if numeric:
+            statistics["mean"] = column.mean()
+
+    return statistics
+
+
+def compute_statistics(
+    key: Hashable,
+    data: pd.DataFrame,
+    publish: Callable[[int, Dict[str, Any]], None],
+    should_abort: Callable[[], bool],
+) -> bool:
+    """Calculates the statistics of all columns of the data, one column at a time.
+
+    Results are cached under the given key, so only the columns not calculated before
+    for this dataset are actually processed. This is meant to be run in a worker
+    thread.
+
+    Args:
+        key: Key identifying the dataset. See `dataset_key`.
+        data: The data to summarise.
+        publish: Called with the column position and its statistics as soon as they
+            are available.
+        should_abort: Called before processing each column. If it returns True, the
+            calculation stops.
+
+    Returns:
+        True if the statistics of all columns were calculated, False if aborted.
+    """
+    with _statistics_lock:
+        cached = _statistics.setdefault(key, {})
+        _statistics.move_to_end(key)
+        while len(_statistics) > STATISTICS_CACHE_SIZE:
+            _statistics.popitem(last=False)
+
+    for i in range(data.shape[1]):
+        if should_abort():
+            return False
+
+        with _statistics_lock:
+            statistics = cached.get(i)
+        if statistics is None:
+            statistics = column_statistics(data.iloc[:, i])
+            with _statistics_lock:
+                cached[i] = statistics
+        publish(i, statistics)
+
+    return True
+
+
+def forget_statistics(key: Hashable) -> None:
+    """Discards the statistics cached for a dataset, e.g. because it has changed.
+
+    Args:
+        key: Key identifying the dataset. See `dataset_key`.
+    """
+    with _statistics_lock:
+        _statistics.pop(key, None)
+
+
+def memory_usage(data: pd.DataFrame) -> int:
+    """Memory used by the data, including the index and the contents of objects.
+
+    Args:
+        data: The data to measure.
+
+    Returns:
+        The memory used in bytes.
+    """
+    return int(data.memory_usage(deep=True).sum())
+
+
+def optimise_dtypes(data: pd.DataFrame, downcast_floats: bool = False) -> pd.DataFrame:
+    """Converts the columns of the data to the most compact types possible.
+
+    - Integers are downcast to the smallest (unsigned, if possible) integer type.
+    - Floats are downcast to float32, if requested, at the cost of some precision.
+    - Text columns with few distinct values are converted to categoricals.
+
+    Args:
+        data: The data to optimise. It is modified in place.
+        downcast_floats: If floats should be downcast to float32.
+
+    Returns:
+        The same data, for convenience.
+    """
+    for name in data.columns:
+        column = data[name]
+        if is_bool_dtype(column) or isinstance(column.dtype, pd.CategoricalDtype):
+            continue
+        elif is_integer_dtype(column):
+            unsigned = len(column) > 0 and column.min() >= 0
+            data[name] = pd.to_numeric(
+                column, downcast="unsigned" if unsigned else "integer"
+            )
+        elif is_float_dtype(column):
+            if downcast_floats:
+                data[name] = pd.to_numeric(column, downcast="float")
+        elif is_object_dtype(column) or is_string_dtype(column):
+            if column.nunique() <= CATEGORY_MAX_RATIO * len(column):
+                data[name] = column.astype("category")
+
+    return data
+
+
+def read_csv_compact(
+    filename: str, chunksize: int = CHUNK_SIZE, downcast_floats: bool = False
+) -> Tuple[pd.DataFrame, int, int]:
+    """Reads a CSV file storing the data with the most compact types possible.
+
+    The file is read in chunks and each chunk is optimised before reading the next one,
+    so the data never needs to be held in memory with the default, bulkier types.
+
+    Args:
+        filename: Name of the file to load. Must contain data in CSV format.
+        chunksize: Number of rows read at a time.
+        downcast_floats: If floats should be downcast to float32. See
+            `optimise_dtypes`.
+
+    Returns:
+        A tuple with the data, the memory it would have used with the default types and
+        the memory it actually uses, in bytes.
+    """
+    chunks: List[pd.DataFrame] = []
+    before = 0
+    for chunk in pd.read_csv(filename, chunksize=chunksize):
+        before += memory_usage(chunk)
+        chunks.append(optimise_dtypes(chunk, downcast_floats))
+
+    if len(chunks) == 0:
+        data = pd.read_csv(filename)
+        return data, memory_usage(data), memory_usage(data)
+
+    data = optimise_dtypes(pd.concat(_align_categories(chunks)), downcast_floats)
+    return data, before, memory_usage(data)
+
+
+def _align_categories(chunks: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """Makes categorical columns share the same categories across all chunks.
+
+    Otherwise concatenating the chunks would turn those columns back into objects.
+    Columns that are categorical in some chunks but not in others are turned into
+    objects, to be reconsidered once concatenated.
+
+    Args:
+        chunks: The chunks of data to align. They are modified in place.
+
+    Returns:
+        The same chunks, for convenience.
+    """
+    for name in chunks[0].columns:
+        categorical = [isinstance(c[name].dtype, pd.CategoricalDtype) for c in chunks]
+        if all(categorical):
+            categories = union_categoricals([c[name] for c in chunks]).categories
+            for chunk in chunks:
+                chunk[name] = chunk[name].cat.set_categories(categories)
+        elif any(categorical):
+            for chunk in chunks:
+                chunk[name] = chunk[name].astype(object)
+
+    return chunks
+
+
+class CsvIndex:
+    """Sparse index of the rows of a CSV file, to read them without loading the file.
+
+    Only the byte offset of the first row of each page of rows is stored, so memory
+    usage is small and independent of the length of the rows. Reading a row means
+    reading its whole page from disk, but the most recently used pages are cached.
+
+    Fields with quoted line breaks are supported, but the file must have a header and
+    use double quotes to quote fields. Blank lines are skipped, like `pandas.read_csv`
+    does.
+
+    Args:
+        filename: Name of the CSV file.
+        page_size: Number of rows per page.
+        cache_size: Number of pages kept in memory.
+        encoding: Encoding of the file.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        page_size: int = PAGE_SIZE,
+        cache_size: int = PAGE_CACHE_SIZE,
+        encoding: str = "utf-8",
+    ):
+        self.filename = filename
+        self.page_size = page_size
+        self.encoding = encoding
+        self.cache_size = cache_size
+        self.nrows = 0
+        self.complete = False
+        self._offsets = array("q")
+        self._pages: OrderedDict = OrderedDict()
+
+        with open(filename, "rb") as f:
+            header = f.readline()
+            while header and _is_blank(header):
+                header = f.readline()
+            while header.count(b'"') % 2 == 1:
+                line = f.readline()
+                if not line:
+                    break
+                header += line
+            self._start = f.tell()
+        self.columns: List[str] = next(
+            csv.reader(io.StringIO(header.decode(encoding), newline="")), []
+        )
+
+    def build(
+        self,
+        should_abort: Callable[[], bool],
+        publish: Callable[[int], None],
+        every: int = 100,
+    ) -> bool:
+        """Streams through the file finding where each page of rows starts.
+
+        Rows become readable as soon as their page has been indexed. This is meant to be
+        run in a worker thread.
+
+        Args:
+            should_abort: Called regularly. If it returns True, the indexing stops.
+            publish: Called regularly with the number of rows indexed so far.
+            every: Number of pages indexed between calls to should_abort and publish.
+
+        Returns:
+            True if the whole file was indexed, False if aborted.
+        """
+        nrows = 0
+        pos = self._start
+        quoted = False
+        with open(self.filename, "rb") as f:
+            f.seek(pos)
+            for line in f:
+                if not quoted and _is_blank(line):
+                    pos += len(line)
+                    continue
+
+                if not quoted and nrows % self.page_size == 0:
+                    self._offsets.append(pos)
+                    if len(self._offsets) % every == 0:
+                        self.nrows = nrows
+                        publish(nrows)
+                        if should_abort():
+                            return False
+
+                pos += len(line)
+                quoted ^= line.count(b'"') % 2 == 1
+                if not quoted:
+                    nrows += 1
+
+        self.nrows = nrows
+        self.complete = True
+        publish(nrows)
+        return True
+
+    def get_value(self, row: int, col: int) -> str:
+        """Gets the value of a field of the file.
+
+        Args:
+            row: Row of the field, not counting the header.
+            col: Column of the field.
+
+        Returns:
+            The value of the field, as text, or an empty string if that row has not been
+            indexed yet or does not have that many fields.
+        """
+        if row >= self.nrows:
+            return ""
+
+        page, offset = divmod(row, self.page_size)
+        if self.complete or (page + 1) * self.page_size <= self.nrows:
+            rows = self._cached_page(page)
+        else:
+            # The page might still be growing, so it cannot be cached yet
+            rows = self._read_page(page)
+
+        fields = rows[offset] if offset < len(rows) else []
+        return fields[col] if col < len(fields) else ""
+
+    def _read_page(self, page: int) -> List[List[str]]:
+        """Reads and parses the rows of a page.
+
+        Args:
+            page: The page to read.
+
+        Returns:
+            The list of rows in the page, each a list of fields.
+        """
+        with open(self.filename, "rb") as f:
+            f.seek(self._offsets[page])
+            text = io.TextIOWrapper(f, encoding=self.encoding, newline="")
+            rows = (fields for fields in csv.reader(text) if fields)
+            return list(islice(rows, self.page_size))
+
+    def _cached_page(self, page: int) -> List[List[str]]:
+        """Reads and parses the rows of a page, keeping the latest pages in memory.
+
+        Args:
+            page: The page to read.
+
+        Returns:
+            The list of rows in the page, each a list of fields.
+        """
+        if page in self._pages:
+            self._pages.move_to_end(page)
+            return self._pages[page]
+
+        rows = self._pages[page] = self._read_page(page)
+        while len(self._pages) > self.cache_size:
+            self._pages.popitem(last=False)
+        return rows
+
+
+def _is_blank(line: bytes) -> bool:
+    """Checks if a line of a file is empty, other than the line break."""
+    return not line.strip(b"\r\n")
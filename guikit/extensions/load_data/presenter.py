@@ -1,20 +1,88 @@
-from typing import List
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional
 
+import pandas as pd
+from pubsub import pub
+
+from guikit.logging import logger
+from guikit.messaging import publish as publish_
 from guikit.plugins import PluginBase, Tab
+from guikit.threads import abort_thread, run_thread, should_abort
 
+from .model import add_recent_file
+from .model import browse_data as browse_data_
+from .model import compute_statistics, dataset_key
 from .model import delete_data as delete_data_
+from .model import forget_statistics
 from .model import load_data as load_data_
-from .view import DataLoaderTab, FileDialogCustom
+from .model import publish_data as publish_data_
+from .model import read_data as read_data_
+from .view import DataLoaderTab, FileDialogCustom, StatisticsTab
+
+_statistics_thread: Optional[int] = None
+"""Identifier of the thread calculating the statistics of the data, if any."""
+
+_statistics_key: Optional[Hashable] = None
+"""Key of the dataset loaded, whose statistics are cached, if any."""
+
+_indexing_thread: Optional[int] = None
+"""Identifier of the thread indexing the file being browsed, if any."""
 
 
 class DataPlugin(PluginBase):
+    def __init__(self):
+        self.data_loader_tab: Optional[DataLoaderTab] = None
+
     def tabs(self, parent=None) -> List[Tab]:
-        data_loader_tab = DataLoaderTab(parent, load_data, delete_data)
-        return [Tab(page=data_loader_tab, text="Data", order=0)]
+        data_loader_tab = DataLoaderTab(parent, load_data, delete_data, browse_data)
+        self.data_loader_tab = data_loader_tab
+        statistics_tab = StatisticsTab(parent)
+        pub.subscribe(calculate_statistics, "data.load")
+        pub.subscribe(invalidate_statistics, "data.change")
+        pub.subscribe(stop_browsing, "data.load")
+        pub.subscribe(remember_file, "data.load")
+        pub.subscribe(open_files, "app.open")
+        return [
+            Tab(page=data_loader_tab, text="Data", order=0),
+            Tab(page=statistics_tab, text="Statistics", order=1),
+        ]
+
+    def save_state(self) -> Dict[str, Any]:
+        tab = self.data_loader_tab
+        if tab is None:
+            return {}
+
+        return {
+            "filename": tab.filename,
+            "browsing": tab.csv_table is not None,
+            "optimise_memory": tab.optimise_chk.GetValue(),
+            "scroll": list(tab.grid.GetViewStart()),
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        tab = self.data_loader_tab
+        if tab is None:
+            return
+
+        optimise_memory = state.get("optimise_memory", False)
+        tab.optimise_chk.SetValue(optimise_memory)
+        filename = state.get("filename")
+        if filename is None or not Path(filename).is_file():
+            return
+
+        if state.get("browsing", False):
+            browse_file(filename)
+        else:
+            scroll = state.get("scroll", (0, 0))
+            reload_data(filename, optimise_memory, lambda: tab.scroll_to(scroll))
 
 
-def load_data() -> None:
-    """Loads a text file from disk."""
+def load_data(optimise_memory: bool = False) -> None:
+    """Loads a text file from disk.
+
+    Args:
+        optimise_memory: If the data should be stored using compact types.
+    """
     with FileDialogCustom() as dlg:
         if not dlg.open():
             # the user changed their mind
@@ -22,9 +90,192 @@ def load_data() -> None:
 
         filename = dlg.GetPath()
 
-    load_data_(filename)
+    load_data_(filename, optimise_memory)
+
+
+def reload_data(
+    filename: str,
+    optimise_memory: bool = False,
+    on_loaded: Optional[Callable[[], None]] = None,
+) -> None:
+    """Loads a text file from disk in a worker thread, e.g. to restore a session.
+
+    Args:
+        filename: Name of the file to load.
+        optimise_memory: If the data should be stored using compact types.
+        on_loaded: Function to call once the data has been loaded and displayed.
+    """
+
+    def loaded(result) -> None:
+        publish_data_(filename, *result)
+        if on_loaded is not None:
+            on_loaded()
+
+    run_thread(
+        lambda: read_data_(filename, optimise_memory),
+        on_complete=loaded,
+        on_error=lambda err: publish_data_(f"No data could be loaded. {err}"),
+    )
+
+
+def open_files(args: List[str]) -> None:
+    """Loads the last CSV file among those the app has been asked to open.
+
+    Args:
+        args: Arguments the app has been launched with, e.g. paths to files.
+    """
+    files = [
+        arg for arg in args if arg.lower().endswith(".csv") and Path(arg).is_file()
+    ]
+    if files:
+        load_data_(files[-1])
 
 
 def delete_data():
     """Deletes loaded data."""
     delete_data_()
+
+
+def browse_data() -> None:
+    """Browses a text file from disk without loading it, indexing it in a thread."""
+    with FileDialogCustom() as dlg:
+        if not dlg.open():
+            # the user changed their mind
+            return
+
+        filename = dlg.GetPath()
+
+    browse_file(filename)
+
+
+def browse_file(filename: str) -> None:
+    """Browses a text file without loading it, indexing it in a thread.
+
+    Args:
+        filename: Name of the file to browse.
+    """
+    global _indexing_thread
+    index = browse_data_(filename)
+    if index is None:
+        return
+
+    add_recent_file(filename)
+
+    def publish(nrows: int) -> None:
+        publish_("data.browse_progress", coalesce=True, index=index, nrows=nrows)
+
+    def finished(result: Any = None) -> None:
+        global _indexing_thread
+        if _indexing_thread == ident:
+            _indexing_thread = None
+
+    def failed(err: Any) -> None:
+        finished()
+        logger.error(err)
+
+    _abort(_indexing_thread)
+    ident = _indexing_thread = run_thread(
+        lambda: index.build(should_abort, publish),
+        on_abort=finished,
+        on_complete=finished,
+        on_error=failed,
+    )
+
+
+def stop_browsing(filename: str, data: Optional[pd.DataFrame] = None) -> None:
+    """Stops indexing the file being browsed, as other data has been loaded.
+
+    Args:
+        filename: Name of the file loaded.
+        data: The data loaded, if any.
+    """
+    global _indexing_thread
+    _abort(_indexing_thread)
+    _indexing_thread = None
+
+
+def remember_file(filename: str, data: Optional[pd.DataFrame] = None) -> None:
+    """Adds the file loaded, if any, to the recent files.
+
+    Args:
+        filename: Name of the file loaded.
+        data: The data loaded, if any.
+    """
+    if data is not None:
+        add_recent_file(filename)
+
+
+def calculate_statistics(
+    filename: str, data: Optional[pd.DataFrame] = None, revision: int = 0
+) -> None:
+    """Calculates the statistics of the data in a worker thread.
+
+    Any calculation still running for previous data is aborted first. The statistics
+    of each column are broadcast via 'data.statistics' as soon as they are available.
+
+    Args:
+        filename: Name of the file loaded.
+        data: The data loaded, if any.
+        revision: Number of times the data has changed since it was loaded.
+    """
+    global _statistics_thread, _statistics_key
+    _abort(_statistics_thread)
+    _statistics_thread = None
+    _statistics_key = None
+
+    if data is None:
+        return
+
+    key = _statistics_key = dataset_key(filename, data, revision)
+
+    def publish(index: int, statistics: Dict[str, Any]) -> None:
+        publish_("data.statistics", key=key, index=index, statistics=statistics)
+
+    def finished(result: Any = None) -> None:
+        global _statistics_thread
+        if _statistics_thread == ident:
+            _statistics_thread = None
+
+    def failed(err: Any) -> None:
+        finished()
+        logger.error(err)
+
+    ident = _statistics_thread = run_thread(
+        lambda: compute_statistics(key, data, publish, should_abort),
+        on_abort=finished,
+        on_complete=finished,
+        on_error=failed,
+    )
+
+
+def invalidate_statistics(
+    filename: str, data: Optional[pd.DataFrame] = None, revision: int = 0
+) -> None:
+    """Calculates again the statistics of the data loaded, as its values changed.
+
+    The statistics cached for the previous values are discarded.
+
+    Args:
+        filename: Name of the file loaded.
+        data: All the data, with the rows appended or the values updated.
+        revision: Number of times the data has changed since it was loaded.
+    """
+    previous = _statistics_key
+    calculate_statistics(filename, data, revision)
+    if previous is not None:
+        forget_statistics(previous)
+
+
+def _abort(ident: Optional[int]) -> None:
+    """Aborts a worker thread, if it still exists.
+
+    Args:
+        ident: Identifier of the thread, or None.
+    """
+    if ident is None:
+        return
+
+    try:
+        abort_thread(ident)
+    except KeyError:
+        pass
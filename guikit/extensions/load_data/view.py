@@ -1,26 +1,65 @@
+import random
+from collections import OrderedDict
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
 import pandas as pd
 import wx
 import wx.grid
 from pubsub import pub
 
+from guikit.settings import get_setting, set_setting
+
+from .model import SETTINGS, STATISTICS, CsvIndex, dataset_key, recent_files
+
 EVEN_ROW_COLOUR = "#CCE6FF"
 GRID_LINE_COLOUR = "#ccc"
 
+AUTOSIZE_MAX_ROWS = 200
+"""Maximum number of rows measured when estimating the width of the columns."""
+
+AUTOSIZE_CANDIDATES = 5
+"""Number of longest values per column whose width is actually measured."""
+
+AUTOSIZE_MARGIN = 10
+"""Extra space, in pixels, added to the estimated width of the columns."""
+
+AUTOSIZE_CACHE_SIZE = 32
+"""Number of datasets for which the width of the columns is remembered."""
+
+_column_widths: OrderedDict = OrderedDict()
+"""Cache of column widths, indexed by dataset key."""
+
 
 class DataLoaderTab(wx.Window):
-    def __init__(self, parent, on_open: Callable, on_delete: Callable):
+    def __init__(
+        self,
+        parent,
+        on_open: Callable,
+        on_delete: Callable,
+        on_browse: Optional[Callable] = None,
+    ):
         super(DataLoaderTab, self).__init__(parent)
 
         self.clear_btn: wx.Button
+        self.optimise_chk: wx.CheckBox
         self.filename_lbl: wx.StaticText
         self.grid: wx.grid.Grid
+        self.table: DataTable
+        self.csv_table: Optional[CsvTable] = None
+        self.filename: Optional[str] = None
+        self.key: Optional[Hashable] = None
+        self.revision = 0
         self.on_open = on_open
         self.on_delete = on_delete
+        self.on_browse = on_browse
 
         pub.subscribe(self.display_data, "data.load")
+        pub.subscribe(self.display_memory, "data.memory")
+        pub.subscribe(self.append_rows, "data.append")
+        pub.subscribe(self.update_values, "data.update")
+        pub.subscribe(self.browse_file, "data.browse")
+        pub.subscribe(self.browse_progress, "data.browse_progress")
 
         self._init_gui()
         self.Layout()
@@ -30,15 +69,39 @@ class DataLoaderTab(wx.Window):
         hbox = wx.BoxSizer(wx.HORIZONTAL)
         open_btn = wx.Button(self, label="Load data file")
         self.clear_btn = wx.Button(self, label="Clear data")
+        self.optimise_chk = wx.CheckBox(self, label="Optimise memory")
+        self.optimise_chk.SetToolTip(
+            "Store the data using compact types. Slower to load, but uses less memory."
+        )
+        self.optimise_chk.SetValue(get_setting(SETTINGS, "optimise_memory", False))
+        self.optimise_chk.Bind(
+            wx.EVT_CHECKBOX,
+            lambda e: set_setting(SETTINGS, "optimise_memory", e.IsChecked()),
+        )
         self.filename_lbl = wx.StaticText(self, label="No data loaded")
         hbox.Add(open_btn, flag=wx.EXPAND | wx.ALL, border=10)
         hbox.Add(self.clear_btn, flag=wx.EXPAND | wx.ALL, border=10)
+        hbox.Add(self.optimise_chk, flag=wx.EXPAND | wx.ALL, border=10)
+        if self.on_browse is not None:
+            browse_btn = wx.Button(self, label="Browse large file")
+            browse_btn.SetToolTip(
+                "Browse the file reading only the rows displayed, without loading it."
+            )
+            hbox.Insert(1, browse_btn, flag=wx.EXPAND | wx.ALL, border=10)
+            self.Bind(wx.EVT_BUTTON, lambda _: self.on_browse(), source=browse_btn)
         hbox.Add(self.filename_lbl, 2, flag=wx.EXPAND | wx.ALL, border=10)
 
         self.grid = wx.grid.Grid(self, -1)
+        self.table = DataTable()
+        # Tables are kept alive by this window, as the grid might switch between them
+        self.grid.SetTable(self.table, takeOwnership=False)
         self.update_table()
 
-        self.Bind(wx.EVT_BUTTON, lambda _: self.on_open(), source=open_btn)
+        self.Bind(
+            wx.EVT_BUTTON,
+            lambda _: self.on_open(self.optimise_chk.GetValue()),
+            source=open_btn,
+        )
         self.Bind(wx.EVT_BUTTON, lambda _: self.on_delete(), source=self.clear_btn)
         self.clear_btn.Disable()
 
@@ -55,25 +118,197 @@ class DataLoaderTab(wx.Window):
             filename: Name of the file loaded
             data: A dataframe with the data
         """
+        if self.csv_table is not None:
+            self.csv_table = None
+            self.grid.SetTable(self.table, takeOwnership=False)
+            self.grid.EnableEditing(True)
+
         if data is None:
+            self.filename = None
             self.filename_lbl.SetLabelText(filename)
             self.clear_btn.Disable()
+            self.update_table()
         else:
+            self.filename = filename
+            self.revision = 0
             self.clear_btn.Enable()
             self.filename_lbl.SetLabelText(Path(filename).name)
-        self.update_table(data)
+            self.update_table(data, dataset_key(filename, data))
+
+    def browse_file(self, filename: str, index: CsvIndex):
+        """Displays a file reading only the rows that are visible.
+
+        Rows are added to the table as the file is indexed.
+
+        Args:
+            filename: Name of the file browsed.
+            index: The index used to read the rows of the file.
+        """
+        self.filename = filename
+        self.clear_btn.Enable()
+        self.filename_lbl.SetLabelText(f"{Path(filename).name} (browsing)")
+        self.table.set_data()
+        self.csv_table = CsvTable(index)
+        self.grid.SetTable(self.csv_table, takeOwnership=False)
+        self.grid.EnableEditing(False)
+        self.Layout()
+
+    def browse_progress(self, index: CsvIndex, nrows: int):
+        """Adds to the table the rows of the browsed file indexed so far.
+
+        Args:
+            index: The index of the file.
+            nrows: Number of rows that can be read so far.
+        """
+        if self.csv_table is not None and self.csv_table.index is index:
+            self.csv_table.set_rows(nrows)
+
+    def display_memory(self, before: int, after: int):
+        """Adds to the filename the memory saved when loading the data.
+
+        Args:
+            before: Memory, in bytes, the data would have used with default types.
+            after: Memory, in bytes, the data actually uses.
+        """
+        self.filename_lbl.SetLabelText(
+            f"{self.filename_lbl.GetLabelText()} (memory: {format_bytes(before)} -> "
+            f"{format_bytes(after)})"
+        )
+
+    def scroll_to(self, position: Tuple[int, int]):
+        """Scrolls the table once the pending events, e.g. resizing it, are processed.
 
-    def update_table(self, data: Optional[pd.DataFrame] = None):
+        Args:
+            position: Position to scroll to, in scroll units, as from GetViewStart.
+        """
+        wx.CallAfter(self.grid.Scroll, *position)
+
+    def update_table(
+        self, data: Optional[pd.DataFrame] = None, key: Optional[Hashable] = None
+    ):
         """updates the data on the table.
 
         Args:
             data: The data to update the table with. Can be None.
+            key: Key identifying the dataset, used to cache the width of the columns.
         """
-        table = DataTable(data)
-        self.grid.SetTable(table, takeOwnership=True)
-        self.grid.AutoSizeColumns()
+        self.key = key
+        self.table.set_data(data)
+        auto_size_columns(self.grid, self.table, key)
         self.Layout()
 
+    def append_rows(self, data: pd.DataFrame):
+        """Appends rows at the end of the table, refreshing only the new rows.
+
+        Args:
+            data: The rows to append.
+        """
+        _column_widths.pop(self.key, None)
+        self.table.append(data)
+        self.data_changed()
+        auto_size_columns(self.grid, self.table, self.key)
+
+    def update_values(self, data: pd.DataFrame):
+        """Changes in place the values of the table, without resizing it.
+
+        Args:
+            data: The new values, aligned by index and column labels.
+        """
+        _column_widths.pop(self.key, None)
+        self.table.update(data)
+        self.data_changed()
+        auto_size_columns(self.grid, self.table, self.key)
+
+    def data_changed(self):
+        """Broadcasts the data loaded after rows are appended or values updated.
+
+        The revision of the data is increased, so results derived from the previous
+        values, e.g. its statistics, are not taken as current.
+        """
+        if self.filename is None or self.csv_table is not None:
+            return
+
+        self.revision += 1
+        self.key = dataset_key(self.filename, self.table.data, self.revision)
+        pub.sendMessage(
+            "data.change",
+            filename=self.filename,
+            data=self.table.data,
+            revision=self.revision,
+        )
+
+
+class StatisticsTab(wx.Window):
+    """Displays the summary statistics of each column of the loaded data.
+
+    The statistics are calculated elsewhere and received column by column via
+    'data.statistics', so the table fills up progressively.
+    """
+
+    PENDING = "..."
+
+    def __init__(self, parent):
+        super(StatisticsTab, self).__init__(parent)
+
+        self.key: Optional[Hashable] = None
+        self.list: wx.ListCtrl
+
+        pub.subscribe(self.display_columns, "data.load")
+        pub.subscribe(self.display_columns, "data.change")
+        pub.subscribe(self.display_statistics, "data.statistics")
+
+        self._init_gui()
+        self.Layout()
+
+    def _init_gui(self):
+        """Initialises the GUI elements in the frame."""
+        self.list = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_HRULES)
+        self.list.AppendColumn("column")
+        for name in STATISTICS:
+            self.list.AppendColumn(name)
+
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+        main_sizer.Add(self.list, 1, flag=wx.EXPAND | wx.ALL, border=10)
+        self.SetSizer(main_sizer)
+
+    def display_columns(
+        self, filename: str, data: Optional[pd.DataFrame] = None, revision: int = 0
+    ):
+        """Lists the columns of the new data, with their statistics still pending.
+
+        Args:
+            filename: Name of the file loaded
+            data: A dataframe with the data
+            revision: Number of times the data has changed since it was loaded.
+        """
+        self.list.DeleteAllItems()
+        if data is None:
+            self.key = None
+            return
+
+        self.key = dataset_key(filename, data, revision)
+        for i, column in enumerate(data.columns):
+            self.list.InsertItem(i, str(column))
+            for j in range(len(STATISTICS)):
+                self.list.SetItem(i, j + 1, self.PENDING)
+
+    def display_statistics(self, key: Hashable, index: int, statistics: Dict[str, Any]):
+        """Fills in the statistics of a column.
+
+        Statistics that do not belong to the data currently displayed are ignored.
+
+        Args:
+            key: Key identifying the dataset the statistics belong to.
+            index: Position of the column.
+            statistics: Value of each of the statistics of the column.
+        """
+        if key != self.key or index >= self.list.GetItemCount():
+            return
+
+        for j, name in enumerate(STATISTICS):
+            value = statistics.get(name)
+            self.list.SetItem(index, j + 1, "" if value is None else str(value))
+
 
 class FileDialogCustom(wx.FileDialog):
     def __init__(self):
@@ -83,6 +318,9 @@ class FileDialogCustom(wx.FileDialog):
             wildcard="CSV files (*.CSV)|*.csv",
             style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
         )
+        recent = recent_files()
+        if recent:
+            self.SetDirectory(str(Path(recent[0]).parent))
 
     def open(self):
         return self.ShowModal() == wx.ID_OK
@@ -102,6 +340,94 @@ class DataTable(wx.grid.GridTableBase):
             data = pd.DataFrame()
         self.data = data
 
+    def set_data(self, data: Optional[pd.DataFrame] = None) -> None:
+        """Replaces the data of the table.
+
+        Rather than replacing the whole table - which resets the view - the grid is
+        told how many rows and columns have been added or removed and to fetch again
+        the values it is displaying.
+
+        Args:
+            data: The new data. Can be None.
+        """
+        old_rows, old_cols = self.GetNumberRows(), self.GetNumberCols()
+        self.data = data if data is not None else pd.DataFrame()
+        new_rows, new_cols = self.GetNumberRows(), self.GetNumberCols()
+
+        view = self.GetView()
+        if view is None:
+            return
+
+        view.BeginBatch()
+        if new_rows > old_rows:
+            self._notify(wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED, new_rows - old_rows)
+        elif new_rows < old_rows:
+            self._notify(
+                wx.grid.GRIDTABLE_NOTIFY_ROWS_DELETED, new_rows, old_rows - new_rows
+            )
+        if new_cols > old_cols:
+            self._notify(wx.grid.GRIDTABLE_NOTIFY_COLS_APPENDED, new_cols - old_cols)
+        elif new_cols < old_cols:
+            self._notify(
+                wx.grid.GRIDTABLE_NOTIFY_COLS_DELETED, new_cols, old_cols - new_cols
+            )
+        self._notify(wx.grid.GRIDTABLE_REQUEST_VIEW_GET_VALUES)
+        view.EndBatch()
+
+    def append(self, data: pd.DataFrame) -> None:
+        """Appends rows at the end of the table.
+
+        Args:
+            data: The rows to append. Must have the same columns as the current data.
+
+        Raises:
+            ValueError: If the columns of the new rows do not match the current ones.
+        """
+        if len(self.data.columns) > 0 and not data.columns.equals(self.data.columns):
+            raise ValueError("The columns of the new rows must match the current ones.")
+
+        if len(self.data) == 0:
+            # The columns might change, too
+            self.set_data(data)
+            return
+
+        self.data = pd.concat([self.data, data])
+        self._notify(wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED, len(data))
+
+    def update(self, data: pd.DataFrame) -> None:
+        """Changes in place the values of the table.
+
+        Only the block of cells spanning the rows and columns updated is refreshed.
+
+        Args:
+            data: The new values, aligned by index and column labels. Missing (NaN)
+                values are ignored.
+        """
+        self.data.update(data)
+
+        rows = self.data.index.get_indexer(data.index)
+        cols = self.data.columns.get_indexer(data.columns)
+        rows, cols = rows[rows >= 0], cols[cols >= 0]
+        view = self.GetView()
+        if view is None or len(rows) == 0 or len(cols) == 0:
+            return
+
+        # The first column of the grid is the index
+        view.RefreshBlock(
+            int(rows.min()), int(cols.min()) + 1, int(rows.max()), int(cols.max()) + 1
+        )
+
+    def _notify(self, message: int, *args: int) -> None:
+        """Sends a message to the grid displaying this table, if any.
+
+        Args:
+            message: The type of message, one of wx.grid.GRIDTABLE_*.
+            *args: The position and/or number of rows or columns affected.
+        """
+        view = self.GetView()
+        if view is not None:
+            view.ProcessTableMessage(wx.grid.GridTableMessage(self, message, *args))
+
     def GetNumberRows(self):
         return len(self.data)
 
@@ -132,3 +458,154 @@ class DataTable(wx.grid.GridTableBase):
         if row % 2 == 1:
             attr.SetBackgroundColour(EVEN_ROW_COLOUR)
         return attr
+
+
+class CsvTable(DataTable):
+    """Table that reads the rows of a CSV file from disk as they are displayed.
+
+    Values are read as text through a `CsvIndex`, so the file is never loaded in
+    memory. The table is read only.
+    """
+
+    def __init__(self, index: CsvIndex):
+        super(CsvTable, self).__init__()
+        self.index = index
+        self.nrows = 0
+
+    def set_rows(self, nrows: int) -> None:
+        """Sets the number of rows of the table, as they become available.
+
+        Args:
+            nrows: The new number of rows. Must not be smaller than the current one.
+        """
+        if nrows > self.nrows:
+            added, self.nrows = nrows - self.nrows, nrows
+            self._notify(wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED, added)
+
+    def GetNumberRows(self):
+        return self.nrows
+
+    def GetNumberCols(self):
+        return len(self.index.columns) + 1
+
+    def GetValue(self, row, col):
+        if col == 0:
+            return str(row)
+        return self.index.get_value(row, col - 1)
+
+    def SetValue(self, row, col, value):
+        pass
+
+    def GetColLabelValue(self, col):
+        if col == 0:
+            return "Row"
+        return self.index.columns[col - 1]
+
+
+def format_bytes(size: float) -> str:
+    """Formats an amount of memory in human readable units.
+
+    >>> format_bytes(2048)
+    '2.0 KB'
+
+    Args:
+        size: The amount of memory in bytes.
+
+    Returns:
+        The formatted amount of memory.
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def sample_rows(
+    nrows: int, max_rows: int = AUTOSIZE_MAX_ROWS, seed: Optional[int] = None
+) -> List[int]:
+    """Chooses the rows to look at when estimating the width of the columns.
+
+    A quarter of the rows are taken from the top of the table, another quarter from
+    the bottom and the rest are chosen randomly from the middle.
+
+    Args:
+        nrows: Number of rows in the table.
+        max_rows: Maximum number of rows to choose.
+        seed: Seed for the random choice of rows.
+
+    Returns:
+        The sorted list of the rows chosen.
+    """
+    if nrows <= max_rows:
+        return list(range(nrows))
+
+    edge = max_rows // 4
+    middle = random.Random(seed).sample(range(edge, nrows - edge), max_rows - 2 * edge)
+    return list(range(edge)) + sorted(middle) + list(range(nrows - edge, nrows))
+
+
+def estimate_column_widths(
+    grid: wx.grid.Grid, table: DataTable, max_rows: int = AUTOSIZE_MAX_ROWS
+) -> List[int]:
+    """Estimates the width of the columns of the table from a sample of its rows.
+
+    Unlike wx.grid.Grid.AutoSizeColumns, which measures every cell, only the header and
+    the longest values among a sample of rows are measured, so the cost does not grow
+    with the size of the table.
+
+    Args:
+        grid: The grid displaying the table, used to measure the text.
+        table: The table to estimate the column widths for.
+        max_rows: Maximum number of rows to sample.
+
+    Returns:
+        The estimated width of each column of the table, in pixels.
+    """
+    sample = table.data.iloc[sample_rows(table.GetNumberRows(), max_rows, seed=0)]
+    columns = [sample.index] + [sample.iloc[:, i] for i in range(sample.shape[1])]
+
+    dc = wx.ClientDC(grid)
+    dc.SetFont(grid.GetLabelFont())
+    labels = [
+        dc.GetTextExtent(table.GetColLabelValue(col))[0]
+        for col in range(table.GetNumberCols())
+    ]
+
+    dc.SetFont(grid.GetDefaultCellFont())
+    widths = []
+    for label, values in zip(labels, columns):
+        longest = sorted((str(v) for v in values), key=len)[-AUTOSIZE_CANDIDATES:]
+        cells = max((dc.GetTextExtent(text)[0] for text in longest), default=0)
+        widths.append(max(label, cells) + AUTOSIZE_MARGIN)
+
+    return widths
+
+
+def auto_size_columns(
+    grid: wx.grid.Grid, table: DataTable, key: Optional[Hashable] = None
+) -> None:
+    """Sets the width of the columns of the grid to fit their contents.
+
+    The widths are estimated with `estimate_column_widths` and cached, if a key is
+    provided, so displaying the same dataset again skips the measurement.
+
+    Args:
+        grid: The grid displaying the table.
+        table: The table to fit the columns to.
+        key: Key identifying the dataset.
+    """
+    widths = _column_widths.get(key) if key is not None else None
+    if widths is None or len(widths) != table.GetNumberCols():
+        widths = estimate_column_widths(grid, table)
+
+    if key is not None:
+        _column_widths[key] = widths
+        _column_widths.move_to_end(key)
+        while len(_column_widths) > AUTOSIZE_CACHE_SIZE:
+            _column_widths.popitem(last=False)
+
+    grid.BeginBatch()
+    for col, width in enumerate(widths):
+        grid.SetColSize(col, max(width, grid.GetColMinimalAcceptableWidth()))
+    grid.EndBatch()
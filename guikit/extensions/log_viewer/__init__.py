@@ -0,0 +1,11 @@
+"""
+This extension displays, live, the records logged by the application in a tab.
+
+Records are kept in a bounded ring buffer by a handler attached to
+`guikit.logging.logger`, and the tab polls the buffer periodically, so logging many
+records per second costs the GUI a single refresh per period.
+
+The extension is only loaded if enabled with the 'LOG_VIEWER' setting of the
+configuration, or if listed explicitly in 'PLUGINS'.
+"""
+from .presenter import LogViewerPlugin  # noqa
@@ -0,0 +1,94 @@
+import logging
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Optional, Tuple
+
+from guikit.logging import logger
+
+BUFFER_SIZE = 10_000
+"""Maximum number of records kept in memory to be displayed."""
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+"""Names of the levels records can be filtered by."""
+
+_handler: Optional["RingBufferHandler"] = None
+"""Handler collecting the records of the application logger, once installed."""
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last records logged in memory, to be read by the GUI.
+
+    Records can be emitted from any thread. Each record is assigned a sequence number so
+    readers can ask for the records they have not seen yet, without copying the whole
+    buffer every time.
+
+    Args:
+        capacity: Maximum number of records to keep. Older records are discarded.
+        level: Minimum level of the records to keep.
+    """
+
+    def __init__(self, capacity: int = BUFFER_SIZE, level: int = logging.NOTSET):
+        super(RingBufferHandler, self).__init__(level)
+        self.records: Deque[logging.LogRecord] = deque(maxlen=capacity)
+        self.sequence = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # 'handle' already holds the handler lock
+        self.records.append(record)
+        self.sequence += 1
+
+    def records_since(self, sequence: int) -> Tuple[List[logging.LogRecord], int]:
+        """Gets the records emitted after the given sequence number.
+
+        Args:
+            sequence: Sequence number returned by a previous call, or 0 for all records.
+
+        Returns:
+            A tuple with the records still in the buffer that were emitted after the
+            given sequence number, and the current sequence number. If fewer records
+            than emitted are returned, the rest have been discarded.
+        """
+        with self.lock:  # type: ignore
+            new = min(self.sequence - sequence, len(self.records))
+            if new <= 0:
+                return [], self.sequence
+            records = list(islice(reversed(self.records), new))[::-1]
+            return records, self.sequence
+
+    def clear(self) -> None:
+        """Discards all the records in the buffer."""
+        with self.lock:  # type: ignore
+            self.records.clear()
+
+
+def install_handler(capacity: int = BUFFER_SIZE) -> RingBufferHandler:
+    """Attaches a ring buffer handler to the application logger, if not done yet.
+
+    Args:
+        capacity: Maximum number of records to keep.
+
+    Returns:
+        The handler collecting the records.
+    """
+    global _handler
+    if _handler is None:
+        _handler = RingBufferHandler(capacity)
+        logger.add_handler(_handler)
+    return _handler
+
+
+def matches(record: logging.LogRecord, level: int, module: str = "") -> bool:
+    """Checks if a record passes the filters.
+
+    Args:
+        record: The record to check.
+        level: Minimum level of the record.
+        module: Text that the name of the module of the record must contain, ignoring
+            case. If empty, records of all modules pass.
+
+    Returns:
+        True if the record passes the filters.
+    """
+    if record.levelno < level:
+        return False
+    return not module or module.lower() in record.module.lower()
@@ -0,0 +1,12 @@
+from typing import List
+
+from guikit.plugins import PluginBase, Tab
+
+from .model import install_handler
+from .view import LogViewerTab
+
+
+class LogViewerPlugin(PluginBase):
+    def tabs(self, parent=None) -> List[Tab]:
+        log_viewer_tab = LogViewerTab(parent, install_handler())
+        return [Tab(page=log_viewer_tab, text="Log", order=10)]
@@ -0,0 +1,176 @@
+import logging
+import time
+from typing import List
+
+import wx
+
+from .model import LEVELS, RingBufferHandler, matches
+
+REFRESH_INTERVAL = 250
+"""Time, in milliseconds, between updates of the displayed records."""
+
+COLUMNS = (("time", 140), ("level", 80), ("module", 120), ("message", 600))
+"""Name and initial width of the columns of the list."""
+
+
+class LogList(wx.ListCtrl):
+    """Virtual list displaying log records.
+
+    Only the rows visible on screen are formatted, so the number of records displayed
+    does not affect how responsive the list is.
+    """
+
+    def __init__(self, parent):
+        super(LogList, self).__init__(
+            parent, style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_HRULES
+        )
+        self.records: List[logging.LogRecord] = []
+        for name, width in COLUMNS:
+            self.AppendColumn(name, width=width)
+
+        self.warning_attr = wx.ItemAttr()
+        self.warning_attr.SetTextColour(wx.Colour("#b36b00"))
+        self.error_attr = wx.ItemAttr()
+        self.error_attr.SetTextColour(wx.RED)
+
+    def OnGetItemText(self, item: int, col: int) -> str:
+        record = self.records[item]
+        if col == 0:
+            return "{}.{:03.0f}".format(
+                time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(record.created)),
+                record.msecs,
+            )
+        elif col == 1:
+            return record.levelname
+        elif col == 2:
+            return record.module
+        return record.getMessage()
+
+    def OnGetItemAttr(self, item: int):
+        levelno = self.records[item].levelno
+        if levelno >= logging.ERROR:
+            return self.error_attr
+        elif levelno >= logging.WARNING:
+            return self.warning_attr
+        return None
+
+    def set_records(self, records: List[logging.LogRecord]) -> None:
+        """Replaces the records displayed.
+
+        Args:
+            records: The new records.
+        """
+        self.records = records
+        self.SetItemCount(len(records))
+        self.Refresh()
+
+    def add_records(self, records: List[logging.LogRecord], capacity: int) -> None:
+        """Appends records to the list, discarding the oldest ones if too many.
+
+        If the last record was visible, the list scrolls to show the new ones.
+
+        Args:
+            records: The records to append.
+            capacity: Maximum number of records to display.
+        """
+        count = len(self.records)
+        follow = count == 0 or self.GetTopItem() + self.GetCountPerPage() >= count
+        self.records.extend(records)
+        excess = len(self.records) - capacity
+        if excess > 0:
+            del self.records[:excess]
+
+        self.SetItemCount(len(self.records))
+        if excess > 0:
+            self.Refresh()
+        else:
+            self.RefreshItems(count, len(self.records) - 1)
+        if follow:
+            self.EnsureVisible(len(self.records) - 1)
+
+
+class LogViewerTab(wx.Window):
+    """Displays the records logged by the application.
+
+    New records are collected by a `RingBufferHandler` and read by a timer, so the list
+    is updated at most once every `REFRESH_INTERVAL` and only while it is on screen.
+
+    Args:
+        parent: The parent window.
+        handler: The handler collecting the records.
+    """
+
+    def __init__(self, parent, handler: RingBufferHandler):
+        super(LogViewerTab, self).__init__(parent)
+
+        self.handler = handler
+        self.sequence = 0
+        self.level_choice: wx.Choice
+        self.module_txt: wx.SearchCtrl
+        self.list: LogList
+
+        self._init_gui()
+        self.Layout()
+
+        self.timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_timer, self.timer)
+        self.timer.Start(REFRESH_INTERVAL)
+
+    def _init_gui(self):
+        """Initialises the GUI elements in the frame."""
+        hbox = wx.BoxSizer(wx.HORIZONTAL)
+        self.level_choice = wx.Choice(self, choices=list(LEVELS))
+        self.level_choice.SetStringSelection("INFO")
+        self.module_txt = wx.SearchCtrl(self)
+        self.module_txt.SetDescriptiveText("Module")
+        clear_btn = wx.Button(self, label="Clear")
+        hbox.Add(wx.StaticText(self, label="Level"), flag=wx.CENTER | wx.ALL, border=10)
+        hbox.Add(self.level_choice, flag=wx.EXPAND | wx.ALL, border=10)
+        hbox.Add(self.module_txt, 1, flag=wx.EXPAND | wx.ALL, border=10)
+        hbox.Add(clear_btn, flag=wx.EXPAND | wx.ALL, border=10)
+
+        self.list = LogList(self)
+
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+        main_sizer.Add(hbox, flag=wx.EXPAND)
+        main_sizer.Add(self.list, 1, flag=wx.EXPAND | wx.ALL, border=10)
+        self.SetSizer(main_sizer)
+
+        self.Bind(wx.EVT_CHOICE, lambda _: self.apply_filters(), self.level_choice)
+        self.Bind(wx.EVT_TEXT, lambda _: self.apply_filters(), self.module_txt)
+        self.Bind(wx.EVT_BUTTON, lambda _: self.clear(), clear_btn)
+
+    @property
+    def level(self) -> int:
+        """Minimum level of the records displayed."""
+        return logging.getLevelName(self.level_choice.GetStringSelection())
+
+    def on_timer(self, event=None) -> None:
+        """Displays the records logged since the last update, if they are visible."""
+        if not self.IsShownOnScreen():
+            return
+
+        records, sequence = self.handler.records_since(self.sequence)
+        if sequence - self.sequence > len(records):
+            # Some records were discarded before being displayed, so start over
+            self.apply_filters()
+            return
+
+        self.sequence = sequence
+        level, module = self.level, self.module_txt.GetValue()
+        records = [r for r in records if matches(r, level, module)]
+        if records:
+            self.list.add_records(records, self.handler.records.maxlen)
+
+    def apply_filters(self) -> None:
+        """Displays again all the records in the buffer that pass the filters."""
+        records, self.sequence = self.handler.records_since(0)
+        level, module = self.level, self.module_txt.GetValue()
+        self.list.set_records([r for r in records if matches(r, level, module)])
+        if self.list.GetItemCount():
+            self.list.EnsureVisible(self.list.GetItemCount() - 1)
+
+    def clear(self) -> None:
+        """Discards all the records collected so far."""
+        self.handler.clear()
+        self.list.set_records([])
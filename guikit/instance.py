@@ -0,0 +1,195 @@
+"""
+Contains the machinery to run a single instance of the application.
+
+When enabled, the first instance listens on a local Unix socket. Later launches forward
+their arguments, e.g. files to open, through the socket and exit straight away, without
+loading the GUI. The running instance publishes them in the GUI thread:
+
+Channels:
+    app.open: Triggered when the application is asked to open something, either on
+        launch or by another launch forwarding its arguments.
+        - args (List[str]): The arguments. Paths of existing files are absolute.
+
+This module does not import wx, so forwarding is fast. Unix sockets are not available
+in all platforms, e.g. in Windows, in which case every launch runs its own instance.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from platformdirs import user_runtime_path
+
+from .logging import logger
+
+TIMEOUT = 1.0
+"""Maximum time, in seconds, to wait for the running instance to answer."""
+
+
+def socket_path(app_name: str) -> Path:
+    """Finds the socket the instance of an application listens on.
+
+    Args:
+        app_name: Name of the application.
+
+    Returns:
+        The path to the socket, which may not exist.
+    """
+    return user_runtime_path(app_name) / "instance.sock"
+
+
+def absolute_args(args: List[str]) -> List[str]:
+    """Makes the paths of existing files absolute, to be used from another process.
+
+    Args:
+        args: The arguments.
+
+    Returns:
+        The same arguments, with the paths of existing files absolute.
+    """
+    return [str(Path(arg).absolute()) if Path(arg).exists() else arg for arg in args]
+
+
+def forward_to_running_instance(
+    app_name: str, args: List[str], timeout: float = TIMEOUT
+) -> bool:
+    """Sends the arguments to the running instance of the application, if any.
+
+    Args:
+        app_name: Name of the application.
+        args: The arguments to send.
+        timeout: Maximum time, in seconds, to wait for the instance to answer.
+
+    Returns:
+        True if an instance is running and received the arguments.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+
+    return _send(socket_path(app_name), absolute_args(args), timeout)
+
+
+def _send(path: Path, args: Optional[List[str]], timeout: float = TIMEOUT) -> bool:
+    """Sends arguments through a socket, waiting for the answer.
+
+    Args:
+        path: The socket.
+        args: The arguments to send. If None, it is only checked if an instance is
+            listening.
+        timeout: Maximum time, in seconds, to wait for the instance to answer.
+
+    Returns:
+        True if an instance is listening and, if sent, received the arguments.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(path))
+            if args is None:
+                return True
+            client.sendall(json.dumps(args).encode() + b"\n")
+            return client.recv(2) == b"ok"
+    except OSError:
+        return False
+
+
+class InstanceServer:
+    """Listens for the arguments forwarded by later launches of the application.
+
+    Connections are served in a daemon thread, so the callback is called in that
+    thread, once per launch.
+
+    Args:
+        app_name: Name of the application.
+        on_args: Function to call with the arguments received.
+    """
+
+    def __init__(self, app_name: str, on_args: Callable[[List[str]], None]):
+        self.path = socket_path(app_name)
+        self.on_args = on_args
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """Starts listening, unless another instance already does.
+
+        Returns:
+            True if listening.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            logger.info("Single instance mode is not supported in this platform.")
+            return False
+
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.path.exists():
+            if _send(self.path, None):
+                return False
+            # Left behind by an instance that did not exit cleanly
+            self.path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the user can connect, from the moment the socket is created
+        umask = os.umask(0o177)
+        try:
+            server.bind(str(self.path))
+            server.listen()
+        except OSError as err:
+            logger.warning(f"Could not listen for other instances: {err}")
+            server.close()
+            return False
+        finally:
+            os.umask(umask)
+
+        self._server = server
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stops listening and removes the socket."""
+        if self._server is None:
+            return
+
+        server, self._server = self._server, None
+        try:
+            # Wakes up the thread waiting for connections
+            server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        server.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _serve(self) -> None:
+        """Receives the arguments sent by each connection, until stopped."""
+        server = self._server
+        while server is not None and self._server is server:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                # The server has been closed
+                return
+
+            with connection:
+                try:
+                    connection.settimeout(TIMEOUT)
+                    line = connection.makefile("rb").readline()
+                    if not line:
+                        # Just checking if this instance is running
+                        continue
+                    args = json.loads(line)
+                    connection.sendall(b"ok")
+                except (OSError, ValueError) as err:
+                    logger.warning(f"Invalid message from another instance: {err}")
+                    continue
+
+            try:
+                self.on_args(args)
+            except Exception as err:
+                logger.error(f"Error processing the arguments {args}: {err}")
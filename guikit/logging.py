@@ -2,18 +2,32 @@
 Contains all the custom machinery for dealing with logging in the program. It should
 allow for new handlers to be added if any plugin requires it.
 """
+import atexit
+import copy
+import gzip
+import itertools
+import json
 import logging
 import os
+import queue
+import shutil
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Union
 from warnings import warn
 
 from platformdirs import user_log_path
 
 from . import APP_NAME
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def app_dir(app_name: str = APP_NAME) -> Path:
     """Finds the application data directory for the current platform.
@@ -49,11 +63,358 @@ def _create_tree(path: Path) -> None:
     os.makedirs(str(path / "logs"), exist_ok=True)
 
 
+RETENTION_MIN_AGE = 60.0
+"""Time, in seconds, since log files were last modified before they can be deleted."""
+
+_formatter = logging.Formatter()
+"""Default formatter, used to format exceptions before sending them to a queue."""
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Handler sending records to a bounded queue, dropping or blocking when full.
+
+    Args:
+        records: The queue to send the records to.
+        block: If True, wait for space in the queue when it is full. Otherwise, drop
+            the record and count it in the 'dropped' attribute.
+    """
+
+    def __init__(self, records: queue.Queue, block: bool = False):
+        super(BoundedQueueHandler, self).__init__(records)
+        self.records = records
+        self.block = block
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Prepares a copy of the record to be written by the background thread.
+
+        Unlike the default implementation, the exception is kept separate from the
+        message, so formatters like `JsonLinesFormatter` can still record it in its own
+        field. Its text is formatted here, while the traceback is still valid.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _formatter.formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.put(record, block=self.block)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class MonotonicFilter(logging.Filter):
+    """Stamps records with the time of a monotonic clock when they are created.
+
+    Unlike the wall clock time, the monotonic time can be used to calculate reliably the
+    time between records logged by the same process. Records already stamped, e.g. by
+    the handler sending them to a background thread, are left unchanged.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "monotonic"):
+            record.monotonic = time.monotonic()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as JSON objects, to be written one per line.
+
+    Each object contains the wall clock and monotonic time (see `MonotonicFilter`), the
+    level, thread, plugin, module, function and line where the record was logged, and
+    the message. If present, the duration (see `Logger.timed`) and the exception are
+    included, too. See `read_json_logs` to analyse the resulting files.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": record.created,
+            "monotonic": getattr(record, "monotonic", None),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "plugin": plugin_name(record.pathname),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        duration = getattr(record, "duration", None)
+        if duration is not None:
+            entry["duration"] = duration
+        if record.exc_info:
+            entry["exception"] = record.exc_text or self.formatException(
+                record.exc_info
+            )
+        return json.dumps(entry, default=str)
+
+
+def plugin_name(pathname: str) -> Optional[str]:
+    """Finds the name of the plugin a file belongs to.
+
+    >>> plugin_name("/some/app/extensions/load_data/model.py")
+    'load_data'
+
+    Args:
+        pathname: Path of the file.
+
+    Returns:
+        The name of the module or package directly inside an 'extensions' directory
+        containing the file, if any.
+    """
+    parts = Path(pathname).parts
+    if "extensions" not in parts[:-1]:
+        return None
+
+    index = len(parts) - 1 - parts[::-1].index("extensions")
+    return Path(parts[index + 1]).stem
+
+
+def read_json_logs(path: Union[str, Path]) -> "pd.DataFrame":
+    """Reads JSON lines log files into a DataFrame.
+
+    Compressed log segments are read, too. The 'time' column is converted to datetime.
+
+    Args:
+        path: A log file or a directory containing log files, e.g. the log directory of
+            the application. For a directory, all '*.jsonl' and '*.jsonl.gz' files in it
+            are read.
+
+    Returns:
+        A DataFrame with one row per record, sorted by time.
+    """
+    import pandas as pd
+
+    path = Path(path)
+    files = (
+        sorted(itertools.chain(path.glob("*.jsonl"), path.glob("*.jsonl.gz")))
+        if path.is_dir()
+        else [path]
+    )
+
+    records: List[Dict[str, Any]] = []
+    for filename in files:
+        opener: Callable = gzip.open if filename.suffix == ".gz" else open
+        with opener(filename, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+
+    data = pd.DataFrame.from_records(records)
+    if "time" in data.columns:
+        data["time"] = pd.to_datetime(data["time"], unit="s")
+        data = data.sort_values("time", ignore_index=True)
+    return data
+
+
+class DeferredHandler(logging.Handler):
+    """Handler that only creates the actual handler when the first record is emitted.
+
+    This avoids any cost associated with setting up the actual handler - e.g. creating
+    directories or opening files - if nothing is ever logged, as it is the case of most
+    short-lived command line invocations.
+
+    Args:
+        factory: Called without arguments to create the actual handler.
+        level: Minimum level of the records to emit.
+    """
+
+    def __init__(
+        self, factory: Callable[[], logging.Handler], level: int = logging.NOTSET
+    ):
+        super(DeferredHandler, self).__init__(level)
+        self.factory = factory
+        self.handler: Optional[logging.Handler] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Already holding the lock of this handler, so it is created only once
+        if self.handler is None:
+            self.handler = self.factory()
+        self.handler.handle(record)
+
+    def flush(self) -> None:
+        if self.handler is not None:
+            self.handler.flush()
+
+    def close(self) -> None:
+        if self.handler is not None:
+            self.handler.close()
+        super(DeferredHandler, self).close()
+
+
+class RotatingLogFileHandler(RotatingFileHandler):
+    """File handler that starts a new file when the current one is too big or too old.
+
+    The old file becomes a segment named after the original file plus a sequential
+    number - e.g. 'launch.log' becomes 'launch.1.log.gz', 'launch.2.log.gz', etc. -
+    which is compressed by a background thread. After compressing it, the retention
+    policy (see `apply_retention`) is applied to the directory containing the logs.
+
+    Args:
+        filename: The file to write to.
+        max_bytes: Size, in bytes, above which a new file is started. No limit if 0.
+        max_age: Time, in seconds, after which a new file is started. No limit if None.
+        max_files: Maximum number of log files and segments to keep in the directory.
+        max_total_bytes: Maximum size, in bytes, of all files kept in the directory.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 0,
+        max_age: Optional[float] = None,
+        max_files: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+    ):
+        super(RotatingLogFileHandler, self).__init__(
+            filename, maxBytes=max_bytes, delay=True
+        )
+        self.max_age = max_age
+        self.max_files = max_files
+        self.max_total_bytes = max_total_bytes
+        self.opened = time.monotonic()
+        self.compressing: Optional[threading.Thread] = None
+        self._segments = itertools.count(1)
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if self.max_age is not None and time.monotonic() - self.opened >= self.max_age:
+            return 1
+        return super(RotatingLogFileHandler, self).shouldRollover(record)
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        path = Path(self.baseFilename)
+        if path.exists():
+            segment = path.with_name(f"{path.stem}.{next(self._segments)}{path.suffix}")
+            os.replace(path, segment)
+            self.compressing = threading.Thread(
+                target=self.compress, args=(segment,), daemon=True
+            )
+            self.compressing.start()
+
+        self.opened = time.monotonic()
+
+    def compress(self, segment: Path) -> None:
+        """Compresses a segment with gzip and applies the retention policy.
+
+        Args:
+            segment: The segment to compress. It is deleted once compressed.
+        """
+        with segment.open("rb") as f_in, gzip.open(f"{segment}.gz", "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        segment.unlink()
+
+        apply_retention(
+            segment.parent,
+            self.max_files,
+            self.max_total_bytes,
+            exclude=Path(self.baseFilename),
+        )
+
+
+def apply_retention(
+    log_path: Path,
+    max_files: Optional[int] = None,
+    max_total_bytes: Optional[int] = None,
+    exclude: Optional[Path] = None,
+    min_age: float = RETENTION_MIN_AGE,
+) -> None:
+    """Deletes the oldest log files until the retention policy is satisfied.
+
+    Both plain and compressed log files are considered. The newest files are kept
+    while the number of files and their total size are within the limits. Files
+    modified recently are never deleted, as they might be in use by another instance
+    of the application.
+
+    Args:
+        log_path: Directory containing the log files.
+        max_files: Maximum number of files to keep. No limit if None.
+        max_total_bytes: Maximum total size, in bytes, of the files to keep. No limit if
+            None.
+        exclude: A file never to be deleted - e.g. the one currently in use. It still
+            counts towards the limits.
+        min_age: Time, in seconds, since files were last modified before they can be
+            deleted. Files modified more recently still count towards the limits.
+    """
+    files = []
+    count, total = 0, 0
+    now = time.time()
+    for path in itertools.chain(log_path.glob("*.log*"), log_path.glob("*.jsonl*")):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if path == exclude or now - stat.st_mtime < min_age:
+            count, total = count + 1, total + stat.st_size
+        elif path.is_file():
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    for _, size, path in sorted(files, reverse=True):
+        count, total = count + 1, total + size
+        if (max_files is not None and count > max_files) or (
+            max_total_bytes is not None and total > max_total_bytes
+        ):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
 class Logger:
-    def __init__(self, app_name: str = APP_NAME, app_author: Optional[str] = None):
+    """Lazy wrapper around the logger of the application.
+
+    By default, records are written synchronously by the thread logging them. If
+    'asynchronous' is set to True before the logger is first used, records are instead
+    sent to a bounded queue and written by a single background thread, so logging does
+    not add any I/O latency to the thread logging the records. When the queue is full,
+    records are dropped or the logging thread waits, depending on 'block'.
+
+    Args:
+        app_name: Name of the application, used to locate the log files.
+        app_author: Author of the application, used to locate the log files.
+        asynchronous: If records should be written by a background thread.
+        queue_size: Maximum number of records waiting to be written, if asynchronous.
+        block: If True, wait for space in the queue when it is full, if asynchronous.
+            Otherwise, records are dropped.
+        max_bytes: Size, in bytes, above which a new log file is started.
+        max_age: Time, in seconds, after which a new log file is started.
+        max_files: Maximum number of log files to keep.
+        max_total_bytes: Maximum total size, in bytes, of the log files to keep.
+        json_lines: If records should also be written to a JSON lines file, for
+            analysis. See `JsonLinesFormatter`.
+    """
+
+    def __init__(
+        self,
+        app_name: str = APP_NAME,
+        app_author: Optional[str] = None,
+        asynchronous: bool = False,
+        queue_size: int = 10000,
+        block: bool = False,
+        max_bytes: int = 10 * 1024**2,
+        max_age: Optional[float] = 24 * 3600,
+        max_files: Optional[int] = 50,
+        max_total_bytes: Optional[int] = 100 * 1024**2,
+        json_lines: bool = False,
+    ):
         self._logger: Optional[logging.Logger] = None
+        self._listener: Optional[QueueListener] = None
+        self._queue_handler: Optional[BoundedQueueHandler] = None
         self.app_name = app_name
         self.app_author = app_author
+        self.asynchronous = asynchronous
+        self.queue_size = queue_size
+        self.block = block
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_files = max_files
+        self.max_total_bytes = max_total_bytes
+        self.json_lines = json_lines
 
     @property
     def logger(self) -> logging.Logger:
@@ -64,17 +425,26 @@ class Logger:
         Returns:
             A Logger object.
         """
-        if not isinstance(self._logger, logging.Logger):
+        if self._logger is None:
             self._logger = logging.getLogger("root")
             self._logger.setLevel(logging.INFO)
 
+            if self.asynchronous:
+                self.start_listener()
+
             self.set_console_handler()
             self.set_file_handler()
+            if self.json_lines:
+                self.set_json_handler()
 
         return self._logger
 
     def __getattr__(self, item):
-        return getattr(self.logger, item)
+        value = getattr(self.logger, item)
+        if callable(value):
+            # Methods of the logger are cached, so this is not called again for them
+            setattr(self, item, value)
+        return value
 
     def set_console_handler(self):
         """Sets a handler to print the log to the terminal."""
@@ -89,24 +459,138 @@ class Logger:
         ch.setFormatter(formatter)
 
         # add ch to logger
-        self._logger.addHandler(ch)
+        self.add_handler(ch)
 
     def set_file_handler(self):
-        """Sets a handler to print the log to a file in the app directory."""
+        """Sets a handler to print the log to a file in the app directory.
+
+        The directory and the file are only created when the first record is logged.
+        See `make_file_handler`.
+        """
+        self.add_handler(DeferredHandler(self.make_file_handler))
+
+    def set_json_handler(self):
+        """Sets a handler to print the log as JSON lines to a file in the app directory.
+
+        Like the normal log file, it is only created when the first record is logged.
+        """
+        handler = DeferredHandler(lambda: self.make_file_handler("jsonl"))
+        handler.addFilter(MonotonicFilter())
+        if self._queue_handler is not None:
+            # Stamped when logged, rather than when written by the background thread
+            self._queue_handler.addFilter(MonotonicFilter())
+        self.add_handler(handler)
+
+    def make_file_handler(self, extension: str = "log") -> logging.Handler:
+        """Creates the handler printing the log to a file in the app directory.
+
+        The file is rotated and old log files deleted according to the 'max_*'
+        attributes. The retention policy is also applied, in the background, when
+        creating the handler.
+
+        Args:
+            extension: Extension of the file. If 'jsonl', records are formatted as JSON.
+
+        Returns:
+            The handler.
+        """
         log_path = user_log_path(self.app_name, self.app_author)
         log_path.mkdir(parents=True, exist_ok=True)
 
-        filename = log_path / f"{datetime.now().strftime('%Y%m%d_%H-%M-%S')}.log"
-        ch = logging.FileHandler(str(filename))
+        stamp = datetime.now().strftime("%Y%m%d_%H-%M-%S")
+        filename = log_path / f"{stamp}.{extension}"
+        ch = RotatingLogFileHandler(
+            str(filename),
+            self.max_bytes,
+            self.max_age,
+            self.max_files,
+            self.max_total_bytes,
+        )
+        threading.Thread(
+            target=apply_retention,
+            args=(log_path, self.max_files, self.max_total_bytes, filename),
+            daemon=True,
+        ).start()
 
         # create and add formatter to handle
-        formatter = logging.Formatter(
-            fmt="%(asctime)s [%(levelname)s]: %(message)s", datefmt="%Y/%m/%d %H:%M:%S"
+        formatter = (
+            JsonLinesFormatter()
+            if extension == "jsonl"
+            else logging.Formatter(
+                fmt="%(asctime)s [%(levelname)s]: %(message)s",
+                datefmt="%Y/%m/%d %H:%M:%S",
+            )
         )
         ch.setFormatter(formatter)
+        return ch
 
-        # add ch to logger
-        self.logger.addHandler(ch)
+    @contextmanager
+    def timed(self, message: str, level: int = logging.INFO) -> Iterator[None]:
+        """Logs a message with the time taken to run the enclosed block of code.
+
+        The duration, in seconds, is appended to the message and, in JSON lines log
+        files, is also recorded in its own 'duration' field.
+
+        ```python
+        with logger.timed("Loading data"):
+            data = load_data()
+        ```
+
+        Args:
+            message: The message to log.
+            level: The level of the message.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            # Attribute the record to the code using the context manager (Python>=3.8)
+            kwargs: Dict[str, Any] = (
+                {"stacklevel": 3} if sys.version_info >= (3, 8) else {}
+            )
+            self.logger.log(
+                level,
+                f"{message} ({duration:.3f} s)",
+                extra={"duration": duration},
+                **kwargs,
+            )
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        """Adds a handler to the logger.
+
+        If the logger is asynchronous, the handler is run by the background thread.
+
+        Args:
+            handler: The handler to add.
+        """
+        if self._listener is None:
+            self.logger.addHandler(handler)
+        else:
+            self._listener.handlers = self._listener.handlers + (handler,)
+
+    def start_listener(self) -> None:
+        """Starts the background thread writing the records sent to the queue."""
+        records: queue.Queue = queue.Queue(self.queue_size)
+        self._listener = QueueListener(records, respect_handler_level=True)
+        self._queue_handler = BoundedQueueHandler(records, self.block)
+        self.logger.addHandler(self._queue_handler)
+        self._listener.start()
+        atexit.register(self.stop_listener)
+
+    def stop_listener(self) -> None:
+        """Writes any pending records and stops the background thread, if running.
+
+        Any record logged afterwards is written synchronously.
+        """
+        if self._listener is None:
+            return
+
+        self._listener.stop()
+        self.logger.removeHandler(self._queue_handler)
+        for handler in self._listener.handlers:
+            self.logger.addHandler(handler)
+        self._listener = None
 
 
 logger = Logger()
@@ -0,0 +1,119 @@
+"""
+Contains the machinery to send pubsub messages safely from any thread.
+
+`pub.sendMessage` runs all the listeners of a topic immediately, in the thread of the
+sender, which is not safe if the listeners touch the GUI. Messages published with
+`publish` are queued instead and delivered, in order, in the GUI thread, a batch at a
+time. Frequent messages whose intermediate values do not matter, like progress updates,
+can be coalesced so only the latest value is delivered.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import wx
+from pubsub import pub
+
+from .logging import logger
+
+BATCH_SIZE = 100
+"""Maximum number of messages delivered before letting the GUI process other events."""
+
+
+class Messenger:
+    """Queues messages and delivers them in the GUI thread.
+
+    A single delivery is scheduled with `wx.CallAfter` for all the messages published
+    until it runs, so the cost of marshalling messages to the GUI thread does not grow
+    with their number. If there are more than `batch_size` messages waiting, the rest
+    are delivered in later batches, giving the GUI the chance to redraw in between.
+
+    Messages published with 'coalesce=True' replace the keyword arguments of any message
+    of the same topic still waiting to be delivered, also published with
+    'coalesce=True', keeping its place in the queue. Arguments not given in the latest
+    message keep their previous value, so, for example, a 'maximum' sent once together
+    with the first 'value' of a progress update is not lost.
+
+    Args:
+        batch_size: Maximum number of messages delivered at once.
+    """
+
+    _instance: Optional[Messenger] = None
+
+    def __new__(cls, batch_size: int = BATCH_SIZE):
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+            cls._instance.batch_size = batch_size
+            cls._instance._pending = []
+            cls._instance._coalesced = {}
+            cls._instance._scheduled = False
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size: int
+        self._pending: List[Tuple[str, Dict[str, Any]]]
+        self._coalesced: Dict[str, Dict[str, Any]]
+        self._scheduled: bool
+        self._lock: threading.Lock
+
+    def publish(self, topic: str, coalesce: bool = False, **kwargs) -> None:
+        """Queues a message to be sent in the GUI thread.
+
+        It can be called from any thread and returns immediately. Messages are sent, in
+        the order they were published, with `pub.sendMessage`.
+
+        Args:
+            topic: Topic of the message.
+            coalesce: If the message can replace a message of the same topic still
+                waiting to be delivered.
+            **kwargs: Arguments of the message.
+        """
+        with self._lock:
+            if coalesce and topic in self._coalesced:
+                self._coalesced[topic].update(kwargs)
+                return
+
+            if coalesce:
+                self._coalesced[topic] = kwargs
+            self._pending.append((topic, kwargs))
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        wx.CallAfter(self.flush)
+
+    def flush(self) -> None:
+        """Sends the next batch of messages waiting to be delivered.
+
+        It must be called in the GUI thread. If there are messages left, another
+        delivery is scheduled.
+        """
+        with self._lock:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            for topic, kwargs in batch:
+                if self._coalesced.get(topic) is kwargs:
+                    del self._coalesced[topic]
+            self._scheduled = len(self._pending) > 0
+
+        if self._scheduled:
+            wx.CallAfter(self.flush)
+
+        for topic, kwargs in batch:
+            try:
+                pub.sendMessage(topic, **kwargs)
+            except Exception as err:
+                logger.error(f"Error delivering message '{topic}': {err}")
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be delivered."""
+        with self._lock:
+            return len(self._pending)
+
+
+def publish(topic: str, coalesce: bool = False, **kwargs) -> None:
+    """Is an alias for Messenger().publish(topic, coalesce, **kwargs)."""
+    Messenger().publish(topic, coalesce, **kwargs)
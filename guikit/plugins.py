@@ -4,17 +4,17 @@ Contains all the machinery to register and load plugins.
 from __future__ import annotations
 
 import importlib
-import inspect
 import sys
 from abc import ABC
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, List, Optional, Type
-
-import wx
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Type
 
 from .logging import logger
 
+if TYPE_CHECKING:
+    import wx
+
 KNOWN_PLUGINS: List[Type[PluginBase]] = []
 """List of plugins registered as subclasses of PluginBase."""
 
@@ -24,12 +24,12 @@ class MenuTool:
     """Compiles the information required to add menu and toolbar items."""
 
     menu: str = ""
-    id: int = wx.ID_ANY
+    id: int = -1  # wx.ID_ANY
     text: str = ""
     description: str = ""
     short_help: str = ""
     callback: Optional[Callable[[wx.Event], None]] = None
-    kind: wx.ItemKind = wx.ITEM_NORMAL
+    kind: wx.ItemKind = 0  # wx.ITEM_NORMAL
     bitmap: Optional[wx.Bitmap] = None
 
 
@@ -40,7 +40,7 @@ class Tab:
     page: wx.Window
     text: str
     select: bool = False
-    imageId: int = wx.NO_IMAGE
+    imageId: int = -1  # wx.NO_IMAGE
     order: int = 0
 
 
@@ -104,6 +104,28 @@ class PluginBase(ABC):
         """
         return None
 
+    def save_state(self) -> Dict[str, Any]:
+        """State of this plugin to be saved when the application closes.
+
+        Plugins opt in to session persistence by overriding this method together with
+        `restore_state`. It is called once the plugin has been populated.
+
+        Returns:
+            The state, which must be serialisable as JSON. If empty, nothing is saved.
+        """
+        return {}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restores the state saved in a previous session.
+
+        To show the window as soon as possible, it is called only when one of the tabs
+        of the plugin is first selected, or after the window is shown if the plugin has
+        no tabs. Any slow work, like loading data, should be done in a worker thread.
+
+        Args:
+            state: The state returned by `save_state` in the previous session.
+        """
+
 
 def collect_plugins(
     path: Path, package: Optional[str] = None, add_to_path: bool = False
@@ -163,8 +185,7 @@ def collect_builtin_extensions():
     Returns:
         A list of plugins names to be loaded.
     """
-    frame = inspect.stack()[1]
-    caller_file = Path(frame[0].f_code.co_filename)
+    caller_file = Path(sys._getframe(1).f_code.co_filename)
     extensions = caller_file.parent / "extensions"
     return collect_plugins(extensions, caller_file.parent.stem)
 
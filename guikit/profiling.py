@@ -0,0 +1,195 @@
+"""
+Contains tools to find out which pubsub listeners are slowing down the application.
+
+Profiling is opt-in, as it adds some overhead to every message sent. When enabled, the
+number of messages sent on each topic and the time spent by each listener handling them
+are recorded, and listeners taking longer than a budget are reported in the log.
+
+```python
+start_profiling(budget=16)
+# use the application
+stop_profiling()  # logs the report
+```
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from pubsub import pub
+from pubsub.core.listener import Listener
+from pubsub.core.topicobj import Topic
+from pubsub.utils.notification import IgnoreNotificationsMixin
+
+from .logging import logger
+
+
+@dataclass
+class ListenerStats:
+    """Time spent by a listener handling the messages of a topic, in seconds."""
+
+    calls: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+    over_budget: int = 0
+
+    @property
+    def mean(self) -> float:
+        """Mean time per call."""
+        return self.total / self.calls if self.calls else 0.0
+
+
+class MessageProfiler(IgnoreNotificationsMixin):
+    """Pubsub notification handler timing the listeners of each message sent.
+
+    Pubsub notifies when a message is about to be sent, before calling each listener and
+    after calling all of them, so the time of a listener is the time between its
+    notification and the next one. Messages sent by listeners are tracked separately,
+    and their time is also included in that of the listener sending them.
+
+    Messages can be sent from any thread.
+
+    Args:
+        budget: Time, in milliseconds, a listener is expected to take at most. The first
+            time a listener exceeds it, a warning is logged.
+    """
+
+    def __init__(self, budget: float = 16):
+        self.budget = budget
+        self.enabled = False
+        self.messages: Dict[str, int] = {}
+        self.listeners: Dict[Tuple[str, str], ListenerStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def reset(self) -> None:
+        """Discards the statistics collected so far."""
+        with self._lock:
+            self.messages = {}
+            self.listeners = {}
+
+    def notifySend(
+        self, stage: str, topicObj: Topic, pubListener: Optional[Listener] = None
+    ):
+        if not self.enabled:
+            return
+
+        now = perf_counter()
+        stack: Optional[List[list]] = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        # The type hints of pubsub are incomplete
+        topic: str = topicObj.getName()  # type: ignore
+        if stage == "pre":
+            stack.append([topic, None, now])
+            with self._lock:
+                self.messages[topic] = self.messages.get(topic, 0) + 1
+        elif not stack:
+            # The message was sent before profiling started
+            return
+        elif stage == "in":
+            self._record(stack[-1], now)
+            stack[-1] = [topic, pubListener, now]
+        elif stage == "post":
+            self._record(stack.pop(), now)
+
+    def _record(self, call: list, now: float) -> None:
+        """Records the time spent by a listener, if any, in a call.
+
+        Args:
+            call: Topic, listener and starting time of the call.
+            now: The time the call finished.
+        """
+        topic, listener, start = call
+        if listener is None:
+            return
+
+        duration = now - start
+        name = f"{listener.module()}.{listener.typeName()}"
+        with self._lock:
+            stats = self.listeners.setdefault((topic, name), ListenerStats())
+            stats.calls += 1
+            stats.total += duration
+            stats.maximum = max(stats.maximum, duration)
+            if duration * 1000 <= self.budget:
+                return
+            stats.over_budget += 1
+            if stats.over_budget > 1:
+                return
+
+        logger.warning(
+            f"Listener '{name}' took {duration * 1000:.1f} ms handling '{topic}', "
+            f"over the budget of {self.budget} ms."
+        )
+
+    def report(self) -> str:
+        """Formats the statistics collected as a table.
+
+        Listeners are sorted by the total time spent handling messages.
+
+        Returns:
+            The table, as text.
+        """
+        with self._lock:
+            messages = sorted(self.messages.items(), key=lambda x: -x[1])
+            listeners = sorted(self.listeners.items(), key=lambda x: -x[1].total)
+
+        lines = [f"{'Topic':<40} {'Messages':>10}"]
+        lines += [f"{topic:<40} {count:>10}" for topic, count in messages]
+        lines.append("")
+        lines.append(
+            f"{'Listener':<50} {'Topic':<30} {'Calls':>8} {'Total ms':>10} "
+            f"{'Mean ms':>10} {'Max ms':>10} {'Over budget':>12}"
+        )
+        for (topic, name), stats in listeners:
+            lines.append(
+                f"{name:<50} {topic:<30} {stats.calls:>8} {stats.total * 1000:>10.1f} "
+                f"{stats.mean * 1000:>10.2f} {stats.maximum * 1000:>10.2f} "
+                f"{stats.over_budget:>12}"
+            )
+        return "\n".join(lines)
+
+
+_profiler: Optional[MessageProfiler] = None
+"""Profiler registered with pubsub, once profiling has been started."""
+
+
+def start_profiling(budget: float = 16) -> MessageProfiler:
+    """Starts recording the messages sent with pubsub and the time their listeners take.
+
+    Any statistics collected previously are discarded.
+
+    Args:
+        budget: Time, in milliseconds, a listener is expected to take at most.
+
+    Returns:
+        The profiler collecting the statistics.
+    """
+    global _profiler
+    if _profiler is None:
+        # Pubsub does not allow removing a notification handler, so it is kept
+        _profiler = MessageProfiler(budget)
+        pub.addNotificationHandler(_profiler)
+
+    _profiler.reset()
+    _profiler.budget = budget
+    _profiler.enabled = True
+    pub.setNotificationFlags(sendMessage=True)  # type: ignore
+    return _profiler
+
+
+def stop_profiling() -> Optional[MessageProfiler]:
+    """Stops profiling pubsub messages and logs the statistics collected.
+
+    Returns:
+        The profiler with the statistics, or None if profiling was never started.
+    """
+    if _profiler is None or not _profiler.enabled:
+        return _profiler
+
+    pub.setNotificationFlags(sendMessage=False)  # type: ignore
+    _profiler.enabled = False
+    logger.info(f"Pubsub messages profile:\n{_profiler.report()}")
+    return _profiler
@@ -1,8 +1,17 @@
-from typing import Optional
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import wx
 from pubsub import pub
 
+from .logging import logger
+from .threads import abort_thread, run_thread
+
 
 class Dialog(wx.ProgressDialog):
     """Opens a modal progress dialog.
@@ -29,6 +38,11 @@ class Dialog(wx.ProgressDialog):
     the progress dialog adds some overhead to the process, which might be significant if
     it is updated too often.
 
+    If the steps take very different times, a minimum 'interval' of time between updates
+    can be set instead. In that case, calls arriving too soon after the last update
+    return immediately, without any further checks, so the overhead is bounded no matter
+    how often the dialog is updated. The last step is always displayed.
+
     Example of use:
 
     If the loop the dialog is informing about is immediately accessible, then a direct
@@ -57,6 +71,10 @@ class Dialog(wx.ProgressDialog):
         some_function()
     ```
 
+    If the function runs in a worker thread, use `guikit.messaging.publish` with
+    'coalesce=True' instead of `pub.sendMessage`, so the dialog is updated in the GUI
+    thread and only with the latest progress.
+
     Args:
         - title: Title of the dialog window.
         - message: Brief message describing the process to be carried.
@@ -67,6 +85,8 @@ class Dialog(wx.ProgressDialog):
         - steps: The number of times the dialog will be updated in total. If provided,
         'every' is overwritten by the calculated new value based on the 'maximum' and
         the 'steps'.
+        - interval: Minimum time, in milliseconds, between updates. If provided, 'every'
+        and 'steps' are ignored.
     """
 
     def __init__(
@@ -77,6 +97,7 @@ class Dialog(wx.ProgressDialog):
         maximum=100,
         every: int = 1,
         steps: Optional[int] = None,
+        interval: Optional[float] = None,
     ):
         super(Dialog, self).__init__(
             title,
@@ -91,6 +112,10 @@ class Dialog(wx.ProgressDialog):
         self.channel = channel
         self.every = every
         self.steps = steps
+        self.interval = interval
+        self._maximum = maximum
+        self._last_update = float("-inf")
+        self._continue = True
 
         self.SetRange(maximum)
         self.subscribe_for_updates()
@@ -98,6 +123,7 @@ class Dialog(wx.ProgressDialog):
     def SetRange(self, maximum: int) -> None:
         """Sets a new maximum value for the progress dialog."""
         super(Dialog, self).SetRange(maximum)
+        self._maximum = maximum
 
         if self.steps is not None:
             self.every = maximum // min(maximum, self.steps)
@@ -128,22 +154,31 @@ class Dialog(wx.ProgressDialog):
         """
         if maximum is not None:
             self.SetRange(maximum)
-
-        if type(value) != int:
+        elif (
+            self.interval is not None
+            and value < self._maximum
+            and (monotonic() - self._last_update) * 1000 < self.interval
+        ):
+            return self._continue
+
+        if type(value) is not int:
             raise ValueError("The new 'value' must be an integer")
-        elif value > self.Range:
+        elif value > self._maximum:
             raise ValueError(
-                f"Current step larger than the maximum: {value}>{self.Range}"
+                f"Current step larger than the maximum: {value}>{self._maximum}"
             )
 
+        if self.interval is None and (value % self.every) != 0:
+            return True
+
         if not self.IsShownOnScreen():
             self.Show()
 
-        if (value % self.every) != 0:
-            return True
-
-        msg = f"{value}/{self.Range}" if msg == "" else f"{msg} - {value}/{self.Range}"
+        maximum = self._maximum
+        msg = f"{value}/{maximum}" if msg == "" else f"{msg} - {value}/{maximum}"
         continue_progress, _ = super(Dialog, self).Update(value, msg)
+        self._last_update = monotonic()
+        self._continue = continue_progress
 
         if not continue_progress:
             self.broadcast_abort()
@@ -163,3 +198,444 @@ class Dialog(wx.ProgressDialog):
             return
 
         pub.sendMessage(f"{self.channel}.abort_process")
+
+
+class Reporter:
+    """Relays the progress of a worker thread to a progress dialog.
+
+    Updating a wx widget from a worker thread is not safe, and marshalling every single
+    step to the GUI thread is costly. Instead, workers call `report` as often as they
+    like: it just stores the latest value, which is a single - and therefore atomic -
+    assignment. A timer in the GUI thread then picks up that value and updates the
+    dialog.
+
+    If the abort button of the dialog is pressed, the worker thread with identifier
+    'ident' is flagged to abort, so `guikit.threads.should_abort()` returns True in it.
+
+    Most of the time, this class does not need to be used directly but via
+    `run_with_progress`:
+
+    ```python
+    def some_function(reporter):
+        for i in range(301):
+            if should_abort():
+                return
+            reporter.report(i)
+            # do something
+
+    run_with_progress(some_function, maximum=300)
+    ```
+
+    Args:
+        - dialog: The dialog to update.
+        - ident: Identifier of the worker thread reporting its progress. Can also be set
+        later on, once the thread has started.
+        - interval: Time, in milliseconds, between updates of the dialog.
+    """
+
+    def __init__(
+        self, dialog: Dialog, ident: Optional[int] = None, interval: int = 100
+    ):
+        self.dialog = dialog
+        self.ident = ident
+        self._latest: Optional[Tuple[int, str, Optional[int]]] = None
+        self._displayed: Optional[Tuple[int, str, Optional[int]]] = None
+        self._continue = True
+
+        self._timer = wx.Timer()
+        self._timer.Bind(wx.EVT_TIMER, self.on_timer)
+        self._timer.Start(interval)
+
+    def report(self, value: int, msg: str = "", maximum: Optional[int] = None) -> bool:
+        """Reports the progress of the process. Safe to call from any thread.
+
+        Args:
+            - value: Current step in the process.
+            - msg: Message to send to the dialog.
+            - maxium: An optional new number of maximum steps.
+
+        Returns:
+            False if the process has been aborted from the dialog, True otherwise.
+        """
+        self._latest = (value, msg, maximum)
+        return self._continue
+
+    def on_timer(self, event: Optional[wx.TimerEvent] = None) -> None:
+        """Updates the dialog with the latest progress reported, if it has changed.
+
+        If nothing new has been reported, the dialog is not redrawn but the abort
+        button is still checked, so the worker is flagged to abort even if it is busy
+        in a long step.
+
+        If the progress reported is not valid, e.g. above the maximum, the error is
+        logged and the dialog is no longer updated.
+        """
+        latest = self._latest
+        if latest is None or latest is self._displayed:
+            if self._continue and self.dialog.WasCancelled():
+                self._abort()
+            return
+
+        self._displayed = latest
+        value, msg, maximum = latest
+        try:
+            updated = self.dialog.Update(value, msg, maximum)
+        except ValueError as err:
+            logger.error(f"Invalid progress reported: {err}")
+            self._timer.Stop()
+            return
+
+        if not updated and self._continue:
+            self._abort()
+
+    def _abort(self) -> None:
+        """Flags the worker thread to abort, as the abort button has been pressed."""
+        self._continue = False
+        if self.ident is not None:
+            abort_thread(self.ident)
+
+    def stop(self) -> None:
+        """Stops updating the dialog, after displaying the latest progress reported."""
+        self._timer.Stop()
+        self.on_timer()
+
+
+def run_with_progress(
+    target: Callable[[Reporter], Any],
+    title: str = "",
+    message: str = "",
+    maximum: int = 100,
+    on_abort: Optional[Callable] = None,
+    on_complete: Optional[Callable] = None,
+    on_error: Optional[Callable] = None,
+    interval: int = 100,
+) -> int:
+    """Runs the target in a worker thread, displaying its progress in a dialog.
+
+    The target receives a `Reporter` as only argument, to report its progress. The
+    dialog is closed when the target finishes, before calling the relevant callback.
+    See `guikit.threads.ThreadPool.run_thread` for more details on the callbacks.
+
+    Args:
+        - target: The function to be executed in a separate thread.
+        - title: Title of the dialog window.
+        - message: Brief message describing the process to be carried.
+        - maximum: The maximum number of steps.
+        - on_abort: The function to be executed when the target function is aborted.
+        - on_complete: The function to be executed when the target function is
+        completed normally.
+        - on_error: The function to be executed when an exception is raised in the
+        target.
+        - interval: Time, in milliseconds, between updates of the dialog.
+
+    Returns:
+        The id number for the thread, needed if it is to be aborted externally.
+    """
+    dialog = Dialog(title, message, maximum=maximum)
+    reporter = Reporter(dialog, interval=interval)
+
+    def close_dialog_then(callback: Optional[Callable]) -> Callable:
+        def wrapper(result: Any) -> None:
+            reporter.stop()
+            dialog.Destroy()
+            if callback is not None:
+                callback(result)
+
+        return wrapper
+
+    on_error = on_error if on_error is not None else logger.error
+    reporter.ident = run_thread(
+        lambda: target(reporter),
+        on_abort=close_dialog_then(on_abort),
+        on_complete=close_dialog_then(on_complete),
+        on_error=close_dialog_then(on_error),
+    )
+    return reporter.ident
+
+
+@dataclass
+class Job:
+    """Progress of one of the jobs tracked by the Aggregator."""
+
+    name: str
+    maximum: int = 100
+    value: int = 0
+    message: str = ""
+    started: float = field(default_factory=monotonic)
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the job completed, between 0 and 1."""
+        return min(max(self.value / self.maximum, 0.0), 1.0) if self.maximum else 1.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated time remaining, in seconds, or None if it cannot be estimated."""
+        fraction = self.fraction
+        if fraction <= 0:
+            return None
+        return (monotonic() - self.started) * (1 - fraction) / fraction
+
+
+class Aggregator:
+    """Tracks the progress of many concurrent jobs without blocking the application.
+
+    Rather than one modal dialog per process, the overall progress of all the jobs is
+    rolled up into a single gauge - normally, the progress bar of the status bar - and
+    clicking on it displays the list of jobs with their individual progress and
+    estimated time remaining.
+
+    Jobs can be added, updated and finished from any thread: that only records the
+    progress. The gauge and the list are refreshed in the GUI thread by a timer, only if
+    something has changed, so the cost is bounded no matter how often jobs are updated.
+
+    Like ThreadPool, this is a singleton: the first time it is called a gauge must be
+    provided and, after that, `Aggregator()` returns the same instance anywhere in the
+    code. The aliases `add_job`, `update_job` and `finish_job` can be used instead.
+
+    Example of use:
+
+    ```python
+    def some_function():
+        job = add_job("Processing files", maximum=len(files))
+        for i, filename in enumerate(files):
+            # do something
+            update_job(job, i + 1, message=filename)
+        finish_job(job)
+
+    run_thread(some_function)
+    ```
+
+    Args:
+        - gauge: The gauge displaying the overall progress. If provided after the
+        first time, it replaces the previous gauge.
+        - interval: Time, in milliseconds, between refreshes of the gauge and job list.
+    """
+
+    _instance: Optional[Aggregator] = None
+
+    RESOLUTION = 1000
+    """Range of the gauge, to display the overall progress as a fraction."""
+
+    def __new__(cls, gauge: Optional[wx.Gauge] = None, interval: int = 250):
+        if gauge is None and cls._instance is None:
+            raise ValueError(
+                "The first time it is called, 'gauge' must be a wx.Gauge object."
+            )
+        elif cls._instance is None:
+            cls._instance = object.__new__(cls)
+            cls._instance._jobs = {}
+            cls._instance._jobs_lock = threading.Lock()
+            cls._instance._ids = itertools.count()
+            cls._instance._changed = False
+            cls._instance._timer = None
+
+        if gauge is not None:
+            cls._instance._attach(gauge, interval)
+        return cls._instance
+
+    def __init__(self, gauge: Optional[wx.Gauge] = None, interval: int = 250):
+        self._gauge: wx.Gauge
+        self._jobs: Dict[int, Job]
+        self._jobs_lock: threading.Lock
+        self._ids: itertools.count
+        self._changed: bool
+        self._popup: Optional[JobList]
+        self._timer: Optional[wx.Timer]
+
+    def _attach(self, gauge: wx.Gauge, interval: int) -> None:
+        """Starts displaying the progress of the jobs in the given gauge.
+
+        Args:
+            gauge: The gauge displaying the overall progress.
+            interval: Time, in milliseconds, between refreshes.
+        """
+        if self._timer is not None:
+            self._timer.Stop()
+
+        self._gauge = gauge
+        self._popup = None
+        self._changed = True
+        gauge.SetRange(self.RESOLUTION)
+        gauge.Bind(wx.EVT_LEFT_DOWN, self.on_click)
+
+        self._timer = wx.Timer()
+        self._timer.Bind(wx.EVT_TIMER, self.on_timer)
+        self._timer.Start(interval)
+
+    def add_job(self, name: str, maximum: int = 100) -> int:
+        """Starts tracking a new job. Safe to call from any thread.
+
+        Args:
+            name: Name of the job, to display in the job list.
+            maximum: The maximum number of steps of the job.
+
+        Returns:
+            The identifier of the job, needed to update it.
+        """
+        with self._jobs_lock:
+            ident = next(self._ids)
+            self._jobs[ident] = Job(name, maximum)
+            self._changed = True
+        return ident
+
+    def update_job(
+        self,
+        ident: int,
+        value: int,
+        message: Optional[str] = None,
+        maximum: Optional[int] = None,
+    ) -> None:
+        """Updates the progress of a job. Safe to call from any thread.
+
+        Args:
+            ident: Identifier of the job.
+            value: Current step of the job.
+            message: An optional new message describing what the job is doing.
+            maximum: An optional new number of maximum steps.
+
+        Raises:
+            KeyError: If there is no job with that identifier.
+        """
+        with self._jobs_lock:
+            job = self._jobs[ident]
+            job.value = value
+            if message is not None:
+                job.message = message
+            if maximum is not None:
+                job.maximum = maximum
+            self._changed = True
+
+    def finish_job(self, ident: int) -> None:
+        """Stops tracking a job. Safe to call from any thread.
+
+        Args:
+            ident: Identifier of the job. Unknown identifiers are ignored.
+        """
+        with self._jobs_lock:
+            self._jobs.pop(ident, None)
+            self._changed = True
+
+    def jobs(self) -> List[Job]:
+        """Returns a snapshot of the jobs being tracked."""
+        with self._jobs_lock:
+            return [
+                Job(j.name, j.maximum, j.value, j.message, j.started)
+                for j in self._jobs.values()
+            ]
+
+    def overall(self, jobs: List[Job]) -> Tuple[float, Optional[float]]:
+        """Rolls up the progress of the jobs.
+
+        Args:
+            jobs: The jobs to roll up.
+
+        Returns:
+            The average fraction completed and the longest time remaining among them.
+        """
+        if len(jobs) == 0:
+            return 0.0, None
+
+        fraction = sum(job.fraction for job in jobs) / len(jobs)
+        etas = [job.eta for job in jobs]
+        eta = None if None in etas else max(etas)
+        return fraction, eta
+
+    def on_timer(self, event: Optional[wx.TimerEvent] = None) -> None:
+        """Refreshes the gauge and the job list, if anything has changed."""
+        if not self._changed or not self._gauge:
+            # Nothing to do or the gauge has already been destroyed
+            return
+
+        self._changed = False
+        jobs = self.jobs()
+        fraction, eta = self.overall(jobs)
+
+        self._gauge.SetValue(int(fraction * self.RESOLUTION))
+        self._gauge.SetToolTip(
+            f"{len(jobs)} job(s) running - {format_eta(eta)} remaining"
+            if len(jobs) > 0
+            else "No jobs running"
+        )
+        if self._popup is not None and self._popup.IsShown():
+            self._popup.display(jobs)
+
+    def on_click(self, event: wx.MouseEvent) -> None:
+        """Displays the list of jobs next to the gauge."""
+        if self._popup is None:
+            self._popup = JobList(self._gauge.GetTopLevelParent())
+
+        self._popup.display(self.jobs())
+        self._popup.Position(
+            self._gauge.ClientToScreen(wx.Point(0, 0)),
+            wx.Size(0, self._gauge.GetSize().height),
+        )
+        self._popup.Popup()
+
+
+class JobList(wx.PopupTransientWindow):
+    """Popup listing the jobs tracked by the Aggregator, with their progress."""
+
+    COLUMNS = ("job", "progress", "remaining", "message")
+
+    def __init__(self, parent: wx.Window):
+        super(JobList, self).__init__(parent, wx.BORDER_SIMPLE)
+        self.list = wx.ListCtrl(self, style=wx.LC_REPORT, size=(500, 200))
+        for name in self.COLUMNS:
+            self.list.AppendColumn(name)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.list, 1, wx.EXPAND)
+        self.SetSizerAndFit(sizer)
+
+    def display(self, jobs: List[Job]) -> None:
+        """Displays the given jobs.
+
+        Args:
+            jobs: The jobs to display.
+        """
+        self.list.Freeze()
+        self.list.DeleteAllItems()
+        for i, job in enumerate(jobs):
+            self.list.InsertItem(i, job.name)
+            self.list.SetItem(i, 1, f"{job.fraction:.0%}")
+            self.list.SetItem(i, 2, format_eta(job.eta))
+            self.list.SetItem(i, 3, job.message)
+        self.list.Thaw()
+
+
+def format_eta(eta: Optional[float]) -> str:
+    """Formats an estimated time remaining.
+
+    >>> format_eta(3725)
+    '1:02:05'
+
+    Args:
+        eta: The time remaining in seconds, if known.
+
+    Returns:
+        The time remaining as hours:minutes:seconds or '?' if not known.
+    """
+    if eta is None:
+        return "?"
+
+    minutes, seconds = divmod(int(eta), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
+def add_job(name: str, maximum: int = 100) -> int:
+    """Is an alias for Aggregator().add_job(...)."""
+    return Aggregator().add_job(name, maximum)
+
+
+def update_job(
+    ident: int, value: int, message: Optional[str] = None, maximum: Optional[int] = None
+) -> None:
+    """Is an alias for Aggregator().update_job(...)."""
+    Aggregator().update_job(ident, value, message, maximum)
+
+
+def finish_job(ident: int) -> None:
+    """Is an alias for Aggregator().finish_job(...)."""
+    Aggregator().finish_job(ident)
@@ -0,0 +1,216 @@
+"""
+Contains a cache of the resources used by the plugins, like bitmaps and text files.
+
+Resources are loaded, decoded and, for bitmaps, scaled the first time they are requested
+and then shared by all the plugins, keyed by their identifier and size. Files are read
+with `pkgutil.get_data`, relative to the package they belong to, so they can also be
+loaded when the application runs from a zip file, e.g. a bundle created with the 'build'
+command.
+
+Resources needed later on, e.g. when a dialog opens, can be preloaded while the
+application is idle, using `guikit.scheduler`, so they are ready when needed:
+
+```python
+preload(bitmap, __package__, "logo.png", size=(64, 64))
+# later on, it is already in the cache
+logo = bitmap(__package__, "logo.png", size=(64, 64))
+```
+"""
+from __future__ import annotations
+
+import io
+import pkgutil
+from typing import Any, Callable, Dict, Generator, Hashable, Optional, Tuple
+
+import wx
+
+from .logging import logger
+from .scheduler import schedule
+
+PRELOAD_PRIORITY = -10
+"""Priority of preloading resources, lower than that of the default tasks."""
+
+
+class ResourceCache:
+    """Loads resources once, keeping them for the lifetime of the application.
+
+    Bitmaps and icons are wx objects, so they must be requested in the GUI thread.
+    """
+
+    _instance: Optional[ResourceCache] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+            cls._instance._cache = {}
+        return cls._instance
+
+    def __init__(self):
+        self._cache: Dict[Hashable, Any]
+
+    def data(self, package: str, resource: str) -> bytes:
+        """Reads a file of a package, as bytes.
+
+        The contents are not cached, as the other methods cache the decoded resource.
+
+        Args:
+            package: Name of the package, e.g. `__package__`.
+            resource: Path of the file, relative to the package, using '/' as separator.
+
+        Raises:
+            FileNotFoundError: If the file cannot be read.
+
+        Returns:
+            The contents of the file.
+        """
+        contents = pkgutil.get_data(package, resource)
+        if contents is None:
+            raise FileNotFoundError(f"Resource '{resource}' not found in '{package}'.")
+        return contents
+
+    def text(self, package: str, resource: str, encoding: str = "utf-8") -> str:
+        """Reads a text file of a package.
+
+        Args:
+            package: Name of the package, e.g. `__package__`.
+            resource: Path of the file, relative to the package, using '/' as separator.
+            encoding: Encoding of the file.
+
+        Returns:
+            The contents of the file.
+        """
+        key = ("text", package, resource, encoding)
+        if key not in self._cache:
+            self._cache[key] = self.data(package, resource).decode(encoding)
+        return self._cache[key]
+
+    def bitmap(
+        self, package: str, resource: str, size: Optional[Tuple[int, int]] = None
+    ) -> wx.Bitmap:
+        """Loads an image file of a package as a bitmap.
+
+        Args:
+            package: Name of the package, e.g. `__package__`.
+            resource: Path of the file, relative to the package, using '/' as separator.
+            size: Size, in pixels, to scale the image to. If None, it is not scaled.
+
+        Returns:
+            The bitmap.
+        """
+        key = ("bitmap", package, resource, size)
+        if key not in self._cache:
+            image = wx.Image(io.BytesIO(self.data(package, resource)))
+            if size is not None and tuple(image.GetSize()) != tuple(size):
+                image = image.Scale(size[0], size[1], wx.IMAGE_QUALITY_HIGH)
+            self._cache[key] = wx.Bitmap(image)
+        return self._cache[key]
+
+    def icon(
+        self, package: str, resource: str, size: Optional[Tuple[int, int]] = None
+    ) -> wx.Icon:
+        """Loads an image file of a package as an icon.
+
+        Args:
+            package: Name of the package, e.g. `__package__`.
+            resource: Path of the file, relative to the package, using '/' as separator.
+            size: Size, in pixels, to scale the image to. If None, it is not scaled.
+
+        Returns:
+            The icon.
+        """
+        key = ("icon", package, resource, size)
+        if key not in self._cache:
+            icon = wx.Icon()
+            icon.CopyFromBitmap(self.bitmap(package, resource, size))
+            self._cache[key] = icon
+        return self._cache[key]
+
+    def art(
+        self,
+        art_id: str,
+        client: str = wx.ART_OTHER,
+        size: Optional[Tuple[int, int]] = None,
+    ) -> wx.Bitmap:
+        """Gets a bitmap from the art provider, e.g. a standard icon.
+
+        Args:
+            art_id: Identifier of the bitmap, e.g. wx.ART_FILE_OPEN.
+            client: Where the bitmap is used, e.g. wx.ART_TOOLBAR.
+            size: Size, in pixels, of the bitmap. If None, the default size for the
+                client is used.
+
+        Returns:
+            The bitmap.
+        """
+        key = ("art", art_id, client, size)
+        if key not in self._cache:
+            self._cache[key] = wx.ArtProvider.GetBitmap(
+                art_id, client, wx.Size(*size) if size is not None else wx.DefaultSize
+            )
+        return self._cache[key]
+
+    def preload(self, function: Callable, *args, **kwargs) -> int:
+        """Loads a resource when the application is idle.
+
+        It is run by `guikit.scheduler`, after any task with higher priority.
+
+        Args:
+            function: The method of the cache loading the resource, e.g. `bitmap`.
+            *args: Positional arguments of the function.
+            **kwargs: Keyword arguments of the function.
+
+        Returns:
+            The identifier of the task loading the resource, to cancel it.
+        """
+        return schedule(
+            _loading(function, *args, **kwargs),
+            PRELOAD_PRIORITY,
+            on_error=lambda err: logger.warning(f"Resource not preloaded: {err}"),
+        )
+
+    def clear(self) -> None:
+        """Discards all the resources loaded."""
+        self._cache.clear()
+
+
+def _loading(function: Callable, *args, **kwargs) -> Generator:
+    """Loads a resource as a single step of a scheduled task.
+
+    Args:
+        function: The function loading the resource.
+        *args: Positional arguments of the function.
+        **kwargs: Keyword arguments of the function.
+    """
+    function(*args, **kwargs)
+    yield
+
+
+def text(package: str, resource: str, encoding: str = "utf-8") -> str:
+    """Is an alias for ResourceCache().text(package, resource, encoding)."""
+    return ResourceCache().text(package, resource, encoding)
+
+
+def bitmap(
+    package: str, resource: str, size: Optional[Tuple[int, int]] = None
+) -> wx.Bitmap:
+    """Is an alias for ResourceCache().bitmap(package, resource, size)."""
+    return ResourceCache().bitmap(package, resource, size)
+
+
+def icon(
+    package: str, resource: str, size: Optional[Tuple[int, int]] = None
+) -> wx.Icon:
+    """Is an alias for ResourceCache().icon(package, resource, size)."""
+    return ResourceCache().icon(package, resource, size)
+
+
+def art(
+    art_id: str, client: str = wx.ART_OTHER, size: Optional[Tuple[int, int]] = None
+) -> wx.Bitmap:
+    """Is an alias for ResourceCache().art(art_id, client, size)."""
+    return ResourceCache().art(art_id, client, size)
+
+
+def preload(function: Callable, *args, **kwargs) -> int:
+    """Is an alias for ResourceCache().preload(function, *args, **kwargs)."""
+    return ResourceCache().preload(function, *args, **kwargs)
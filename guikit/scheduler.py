@@ -0,0 +1,223 @@
+"""
+Contains a scheduler to run long tasks in the GUI thread without freezing the GUI.
+
+Work touching wx widgets, like filling a large list or creating many pages, cannot run
+in a worker thread - see `guikit.threads`. Instead, it can be written as a generator
+yielding after each small step, and scheduled to run while the application is idle:
+
+```python
+def fill_list(list_ctrl, items):
+    for i, item in enumerate(items):
+        list_ctrl.InsertItem(i, item)
+        yield
+
+task = schedule(fill_list(list_ctrl, items), on_complete=lambda _: print("Done"))
+```
+
+Steps are run until the time budget of each idle event is spent, after which the GUI
+processes other events, e.g. redrawing the window, before the next steps are run.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+import wx
+
+from .logging import logger
+
+BUDGET = 0.008
+"""Time, in seconds, spent running tasks in each idle event, half a frame at 60 Hz."""
+
+
+@dataclass
+class Task:
+    """A task scheduled, run one step at a time."""
+
+    steps: Generator
+    priority: int
+    on_complete: Optional[Callable[[Any], None]]
+    on_error: Callable[[Exception], None]
+
+
+class Scheduler:
+    """Runs generator based tasks in the GUI thread while the application is idle.
+
+    The tasks with the highest priority run first and those with the same priority take
+    turns, one step each. A task finishes when its generator is exhausted, and the
+    value it returns, if any, is passed to 'on_complete'.
+
+    Tasks must be scheduled and cancelled from the GUI thread. Tasks scheduled before
+    the application exists start running once it is initialised - see `start`.
+
+    Args:
+        budget: Time, in seconds, spent running tasks in each idle event.
+    """
+
+    _instance: Optional[Scheduler] = None
+
+    def __new__(cls, budget: float = BUDGET):
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+            cls._instance.budget = budget
+            cls._instance._tasks = {}
+            cls._instance._queue = []
+            cls._instance._counter = itertools.count()
+            cls._instance._app = None
+            cls._instance._current = None
+        return cls._instance
+
+    def __init__(self, budget: float = BUDGET):
+        self.budget: float
+        self._tasks: Dict[int, Task]
+        self._queue: List[Tuple[int, int, int]]
+        self._counter: itertools.count
+        self._app: Optional[wx.App]
+        self._current: Optional[int]
+
+    def schedule(
+        self,
+        steps: Generator,
+        priority: int = 0,
+        on_complete: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> int:
+        """Schedules a task to run when the application is idle.
+
+        Args:
+            steps: Generator running a step of the task each time it is advanced.
+            priority: Tasks with higher priority run first.
+            on_complete: Function to call when the task finishes. Takes as only argument
+                the value returned by the generator.
+            on_error: Function to call if a step raises an exception. Takes as only
+                argument the exception. By default, the error is logged.
+
+        Returns:
+            The identifier of the task, to cancel it.
+        """
+        ident = next(self._counter)
+        self._tasks[ident] = Task(
+            steps,
+            priority,
+            on_complete,
+            on_error if on_error is not None else logger.error,
+        )
+        heapq.heappush(self._queue, (-priority, ident, ident))
+        self.start()
+        return ident
+
+    def cancel(self, ident: int) -> bool:
+        """Cancels a task, closing its generator.
+
+        A task can cancel itself during one of its steps, in which case the generator
+        is closed once the step returns.
+
+        Args:
+            ident: Identifier of the task.
+
+        Returns:
+            True if the task was cancelled, False if it had already finished.
+        """
+        task = self._tasks.pop(ident, None)
+        if task is None:
+            return False
+
+        if ident != self._current:
+            task.steps.close()
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks not finished yet."""
+        return len(self._tasks)
+
+    def run_steps(self, budget: Optional[float] = None) -> None:
+        """Runs the steps of the tasks until the time budget is spent.
+
+        At least one step is run, if any task is pending.
+
+        Args:
+            budget: Time, in seconds, to spend. If None, the budget of the scheduler.
+        """
+        end = perf_counter() + (budget if budget is not None else self.budget)
+        while self._queue:
+            _, _, ident = heapq.heappop(self._queue)
+            task = self._tasks.get(ident)
+            if task is None:
+                # Cancelled
+                continue
+
+            self._current = ident
+            try:
+                next(task.steps)
+            except StopIteration as result:
+                finished = self._tasks.pop(ident, None) is not None
+                if finished and task.on_complete is not None:
+                    task.on_complete(result.value)
+            except Exception as err:
+                if self._tasks.pop(ident, None) is not None:
+                    task.on_error(err)
+            else:
+                if ident in self._tasks:
+                    heapq.heappush(
+                        self._queue, (-task.priority, next(self._counter), ident)
+                    )
+                else:
+                    # Cancelled by the step itself
+                    task.steps.close()
+            finally:
+                self._current = None
+
+            if perf_counter() >= end:
+                break
+
+    def start(self) -> None:
+        """Starts running tasks on idle events, if any is pending.
+
+        It is called when scheduling a task and, for those scheduled before the
+        application existed, when `guikit.core.MainApp` is initialised.
+        """
+        app = wx.GetApp()
+        if not self._tasks or app is None or app is self._app:
+            return
+
+        app.Bind(wx.EVT_IDLE, self._on_idle)
+        self._app = app
+
+    def stop(self) -> None:
+        """Stops running tasks on idle events, e.g. because the application exits.
+
+        Pending tasks are kept, and run again if the scheduler is started.
+        """
+        if self._app is None:
+            return
+
+        self._app.Unbind(wx.EVT_IDLE, handler=self._on_idle)
+        self._app = None
+
+    def _on_idle(self, event: wx.IdleEvent) -> None:
+        """Runs the steps fitting in the budget, asking for more events if needed."""
+        event.Skip()
+        self.run_steps()
+        if self._tasks:
+            event.RequestMore()
+        else:
+            self.stop()
+
+
+def schedule(
+    steps: Generator,
+    priority: int = 0,
+    on_complete: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> int:
+    """Is an alias for Scheduler().schedule(steps, priority, on_complete, on_error)."""
+    return Scheduler().schedule(steps, priority, on_complete, on_error)
+
+
+def cancel_task(ident: int) -> bool:
+    """Is an alias for Scheduler().cancel(ident)."""
+    return Scheduler().cancel(ident)
@@ -1,56 +1,161 @@
 from __future__ import annotations
 
 import argparse
+import ast
 import importlib
-import inspect
+import py_compile
+import sys
+import zipapp
 from abc import ABC, abstractmethod
 from pathlib import Path
-from shutil import copytree
-from typing import Dict, List, Tuple
+from shutil import copytree, ignore_patterns
+from tempfile import TemporaryDirectory
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
 
 from . import APP_NAME
-from . import config as dconfig
-from .core import MainApp
+from .instance import forward_to_running_instance
 from .logging import logger
 from .plugins import collect_builtin_extensions
+from .settings import Settings, settings_path
 
 logger.app_name = APP_NAME
 
+LOG_VIEWER_PLUGIN = f"{APP_NAME}.extensions.log_viewer"
+"""Plugin displaying the log, only loaded if enabled with the 'LOG_VIEWER' setting."""
 
-def run():
-    """Runs guikit as an application, loading all the plugins available."""
-    frame = inspect.stack()[1]
-    caller_file = Path(frame[0].f_code.co_filename)
-    config_file = caller_file.parent / "config.py"
 
-    if not config_file.exists():
-        raise RuntimeError(f"Configuration file '{config_file}' not found!")
+def run(config: Optional[ModuleType] = None, args: Optional[List[str]] = None):
+    """Runs guikit as an application, loading all the plugins available.
 
-    config = importlib.import_module(f"{caller_file.parent.stem}.config")
+    The GUI is only imported here, so the rest of the commands start quickly. In single
+    instance mode, if the app is already running, the arguments are forwarded to it
+    instead, before importing the GUI.
 
+    Args:
+        config: The configuration module of the application. If None, the 'config'
+            module in the package of the caller is used.
+        args: Arguments to open, e.g. files, published in 'app.open'.
+    """
+    if config is None:
+        caller_file = Path(sys._getframe(1).f_code.co_filename)
+        config_file = caller_file.parent / "config.py"
+
+        if not config_file.exists():
+            raise RuntimeError(f"Configuration file '{config_file}' not found!")
+
+        config = importlib.import_module(f"{caller_file.parent.stem}.config")
+
+    settings = _resolve_config(config)
+    args = args if args is not None else []
+    app_id = config.__name__.split(".")[0]
+    if settings["SINGLE_INSTANCE"] and forward_to_running_instance(app_id, args):
+        logger.info("Arguments forwarded to the running instance.")
+        return
+
+    Settings().load(settings_path(app_id))
+    from .core import MainApp
+    from .profiling import start_profiling, stop_profiling
+
+    app = MainApp(
+        title=settings["APP_LONG_NAME"],
+        size_mainwindow=settings["SIZE_MAINWINDOW"],
+        plugins_list=settings["PLUGINS"],
+        notebook_layout=settings["NOTEBOOK_LAYOUT"],
+        tab_style=settings["TAB_STYLE"],
+        instance_name=app_id if settings["SINGLE_INSTANCE"] else None,
+        open_args=args,
+        session_name=app_id if settings["SAVE_SESSION"] else None,
+    )
+    profile_messages = settings["PROFILE_MESSAGES"]
+    if profile_messages is not None:
+        start_profiling(profile_messages)
+    app.MainLoop()
+    if profile_messages is not None:
+        stop_profiling()
+
+
+def _default_setting(name: str) -> Any:
+    """Gets the value of a setting in the default configuration of guikit.
+
+    Args:
+        name: Name of the setting.
+
+    Returns:
+        The default value.
+    """
+    from . import config as dconfig
+
+    return getattr(dconfig, name)
+
+
+def _resolve_config(config: ModuleType) -> Dict[str, Any]:
+    """Fills in the settings missing in a configuration module with their defaults.
+
+    The plugins explicitly listed and those collected automatically are merged in
+    'PLUGINS', in the order they will be loaded. The log viewer is only included if
+    listed explicitly or enabled with 'LOG_VIEWER'.
+
+    Args:
+        config: The configuration module of the application.
+
+    Returns:
+        The value of each setting.
+    """
     title = config.APP_LONG_NAME if "APP_LONG_NAME" in dir(config) else "My App"
     plug = config.PLUGINS if "PLUGINS" in dir(config) else []
     autoplugins = config.AUTO_PLUGINS if "AUTO_PLUGINS" in dir(config) else []
     nb_layout = (
         config.NOTEBOOK_LAYOUT
         if "NOTEBOOK_LAYOUT" in dir(config)
-        else dconfig.NOTEBOOK_LAYOUT
+        else _default_setting("NOTEBOOK_LAYOUT")
+    )
+    tab_style = (
+        config.TAB_STYLE
+        if "TAB_STYLE" in dir(config)
+        else _default_setting("TAB_STYLE")
     )
-    tab_style = config.TAB_STYLE if "TAB_STYLE" in dir(config) else dconfig.TAB_STYLE
     size_mainwindow: Tuple[int, int] = (
         config.SIZE_MAINWINDOW if "SIZE_MAINWINDOW" in dir(config) else (800, 600)
     )
-
-    all_plugins = plug + [p for p in autoplugins if p not in plug]
-
-    app = MainApp(
-        title=title,
-        size_mainwindow=size_mainwindow,
-        plugins_list=all_plugins,
-        notebook_layout=nb_layout,
-        tab_style=tab_style,
+    profile_messages = (
+        config.PROFILE_MESSAGES
+        if "PROFILE_MESSAGES" in dir(config)
+        else _default_setting("PROFILE_MESSAGES")
     )
-    app.MainLoop()
+    single_instance = (
+        config.SINGLE_INSTANCE
+        if "SINGLE_INSTANCE" in dir(config)
+        else _default_setting("SINGLE_INSTANCE")
+    )
+    save_session = (
+        config.SAVE_SESSION
+        if "SAVE_SESSION" in dir(config)
+        else _default_setting("SAVE_SESSION")
+    )
+    log_viewer = (
+        config.LOG_VIEWER
+        if "LOG_VIEWER" in dir(config)
+        else _default_setting("LOG_VIEWER")
+    )
+
+    plugins = plug + [
+        p for p in autoplugins if p not in plug and p != LOG_VIEWER_PLUGIN
+    ]
+    if log_viewer and LOG_VIEWER_PLUGIN not in plugins:
+        plugins.append(LOG_VIEWER_PLUGIN)
+
+    return {
+        "APP_LONG_NAME": title,
+        "PLUGINS": plugins,
+        "NOTEBOOK_LAYOUT": nb_layout,
+        "TAB_STYLE": tab_style,
+        "SIZE_MAINWINDOW": tuple(size_mainwindow),
+        "PROFILE_MESSAGES": profile_messages,
+        "SINGLE_INSTANCE": single_instance,
+        "SAVE_SESSION": save_session,
+        "LOG_VIEWER": log_viewer,
+    }
 
 
 def _init_repo(path: Path, name: str):
@@ -95,6 +200,149 @@ def _copy_plugin(name: List[str], target: Path) -> None:
         copytree(root / p, target / p)
 
 
+FROZEN_CONFIG = '''"""
+Configuration of "{name}" resolved by 'guikit build'. Edit the original one instead.
+"""
+{settings}
+AUTO_PLUGINS = []
+'''
+"""Template of the configuration module of a bundle."""
+
+BUNDLE_MAIN = """import sys
+
+if sys.version_info[:2] != {version}:
+    sys.exit("This bundle only runs with Python {version[0]}.{version[1]}.")
+
+from guikit.scripts import run
+
+from {name} import config
+
+run(config, sys.argv[1:])
+"""
+"""Template of the entry point of a bundle."""
+
+
+def _compile_tree(root: Path) -> None:
+    """Replaces all the Python files in a directory tree by their bytecode.
+
+    The bytecode is not checked against the source when imported, so no source is
+    needed and nothing is recompiled.
+
+    Args:
+        root: The directory to compile.
+    """
+    for source in root.rglob("*.py"):
+        py_compile.compile(
+            str(source),
+            cfile=str(source.with_suffix(".pyc")),
+            dfile=str(source.relative_to(root)),
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        source.unlink()
+
+
+def _frozen_settings(config: ModuleType) -> Dict[str, Any]:
+    """Gets the settings to write in the configuration module of a bundle.
+
+    Args:
+        config: The configuration module of the application.
+
+    Raises:
+        RuntimeError: If a setting is not a Python literal, so it cannot be written.
+
+    Returns:
+        The settings of guikit, resolved, followed by those of the application.
+    """
+    settings = _resolve_config(config)
+    for key in dir(config):
+        if key.startswith("_") or not key.isupper():
+            continue
+        elif key in settings or key == "AUTO_PLUGINS":
+            # Resolved already
+            continue
+
+        value = getattr(config, key)
+        try:
+            literal = ast.literal_eval(repr(value)) == value
+        except (ValueError, SyntaxError):
+            literal = False
+        if not literal:
+            raise RuntimeError(
+                f"Setting '{key}' of the configuration cannot be bundled, as it is not "
+                "a Python literal."
+            )
+        settings[key] = value
+
+    return settings
+
+
+def _build_bundle(
+    app_path: Path,
+    output: Optional[Path] = None,
+    include_guikit: bool = False,
+    python: Optional[str] = None,
+) -> Path:
+    """Packages an application into a single, ready to run, zip file.
+
+    The bundle contains the bytecode of the application, so nothing is compiled when
+    launched, and a configuration module with all its settings resolved, including the
+    list of plugins, so no directory needs to be searched for them. Any other setting of
+    the application - i.e. upper case attribute of the configuration module - is copied
+    as is, so it must be a Python literal. The bundle can only be run with the same
+    version of Python used to build it.
+
+    Args:
+        app_path: Path to the package of the application, containing 'config.py'.
+        output: The bundle to create. Default: '<app name>.pyz' in the current
+            directory.
+        include_guikit: If guikit itself should be included in the bundle.
+        python: Interpreter to run the bundle with, added as a shebang line.
+
+    Raises:
+        RuntimeError: If the configuration module is not found or it has a setting
+            that is not a Python literal.
+
+    Returns:
+        The path to the bundle created.
+    """
+    name = app_path.name
+    if not (app_path / "config.py").exists():
+        raise RuntimeError(f"Configuration file '{app_path / 'config.py'}' not found!")
+
+    sys.path.insert(0, str(app_path.parent))
+    try:
+        config = importlib.import_module(f"{name}.config")
+    finally:
+        sys.path.remove(str(app_path.parent))
+
+    settings = "\n".join(
+        f"{key} = {value!r}" for key, value in _frozen_settings(config).items()
+    )
+    output = output if output is not None else Path(f"{name}.pyz").absolute()
+
+    logger.info(f"Building '{name}' into `{output}`...")
+    with TemporaryDirectory() as staging_dir:
+        staging = Path(staging_dir)
+        copytree(app_path, staging / name, ignore=ignore_patterns("__pycache__"))
+        if include_guikit:
+            copytree(
+                Path(__file__).parent,
+                staging / Path(__file__).parent.name,
+                ignore=ignore_patterns("__pycache__", "skeleton"),
+            )
+        (staging / name / "config.py").write_text(
+            FROZEN_CONFIG.format(name=name, settings=settings)
+        )
+        _compile_tree(staging)
+        (staging / "__main__.py").write_text(
+            BUNDLE_MAIN.format(name=name, version=tuple(sys.version_info[:2]))
+        )
+        zipapp.create_archive(staging, output, interpreter=python, compressed=True)
+
+    return output
+
+
 class SubCommand(ABC):
     def __init__(self, name, description):
         self.name = name
@@ -183,10 +431,50 @@ class PluginSubCommand(SubCommand):
             print("Nothing to do...")
 
 
+class BuildSubCommand(SubCommand):
+    def __init__(self):
+        super().__init__(
+            "build", "Packages an app into a single, precompiled, zip file to run."
+        )
+
+    def add_arguments(self, parser: argparse.ArgumentParser):
+        parser.add_argument(
+            "app",
+            type=str,
+            help="Location of the package of the app, containing 'config.py'.",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            default=None,
+            type=str,
+            help="Bundle to create. Default: '<app name>.pyz' here.",
+        )
+        parser.add_argument(
+            "--include-guikit",
+            action="store_true",
+            help="Include guikit in the bundle, so it does not need to be installed.",
+        )
+        parser.add_argument(
+            "-p",
+            "--python",
+            default=None,
+            type=str,
+            help="Interpreter to run the bundle with, e.g. '/usr/bin/env python3'.",
+        )
+
+    def run(self, args: argparse.Namespace):
+        output = Path(args.output).absolute() if args.output else None
+        _build_bundle(
+            Path(args.app).absolute(), output, args.include_guikit, args.python
+        )
+
+
 _SUB_COMMANDS: List[SubCommand] = [
     RunSubCommand(),
     InitSubCommand(),
     PluginSubCommand(),
+    BuildSubCommand(),
 ]
 
 _SUB_COMMAND_BY_NAME: Dict[str, SubCommand] = {
@@ -0,0 +1,91 @@
+"""
+Contains the machinery to save the state of the application on exit and restore it.
+
+The session is stored as gzip compressed JSON in the user data directory of the
+application. It contains the geometry of the main window, the tab selected and the state
+returned by the `save_state` method of each plugin, keyed by the plugin class, so any
+value stored by the plugins must be serialisable as JSON.
+
+This module does not import wx. Restoring the session in the GUI is done by
+`guikit.core.MainWindow`.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Type
+
+from platformdirs import user_data_path
+
+from .logging import logger
+
+SESSION_FILE = "session.json.gz"
+"""Name of the file storing the session, in the user data directory."""
+
+
+def session_path(app_name: str) -> Path:
+    """Finds the file the session of an application is stored in.
+
+    Args:
+        app_name: Name of the application.
+
+    Returns:
+        The path to the file, which may not exist.
+    """
+    return user_data_path(app_name) / SESSION_FILE
+
+
+def plugin_key(plugin: Type) -> str:
+    """Key identifying the state of a plugin in the session.
+
+    Args:
+        plugin: The class of the plugin.
+
+    Returns:
+        The qualified name of the class, including its module.
+    """
+    return f"{plugin.__module__}.{plugin.__qualname__}"
+
+
+def save_session(path: Path, session: Dict[str, Any]) -> None:
+    """Saves a session to disk.
+
+    The file is replaced at once, so a session saved previously is not lost if saving
+    fails midway.
+
+    Args:
+        path: The file to save the session to.
+        session: The session.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(session, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as err:
+        logger.warning(f"The session could not be saved: {err}")
+
+
+def load_session(path: Path) -> Dict[str, Any]:
+    """Loads a session from disk.
+
+    Args:
+        path: The file the session was saved to.
+
+    Returns:
+        The session, or an empty dictionary if there is none or it cannot be read.
+    """
+    if not path.exists():
+        return {}
+
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            session = json.load(f)
+    except (OSError, ValueError) as err:
+        logger.warning(f"The session could not be loaded: {err}")
+        return {}
+
+    return session if isinstance(session, dict) else {}
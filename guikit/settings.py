@@ -0,0 +1,237 @@
+"""
+Contains a store of user settings that plugins can use to remember their preferences.
+
+Settings are grouped in sections, typically one per plugin, and stored together as JSON
+in the user configuration directory of the application. The file is read once, when the
+application starts, so reading settings is just a dictionary lookup. Changes are written
+in a background thread shortly after they happen, many changes at once, and when the
+program exits, so changing settings never blocks the GUI.
+
+```python
+recent = get_setting("my_plugin", "recent_files", [])
+set_setting("my_plugin", "recent_files", [filename] + recent)
+```
+
+Values must be serialisable as JSON. Settings not loaded from a file, e.g. before the
+application starts or in headless mode, are kept in memory only.
+
+This module does not import wx.
+"""
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from platformdirs import user_config_path
+
+from .logging import logger
+
+SETTINGS_FILE = "settings.json"
+"""Name of the file storing the settings, in the user configuration directory."""
+
+FLUSH_DELAY = 1.0
+"""Time, in seconds, changes are held before writing them all at once."""
+
+
+def settings_path(app_name: str) -> Path:
+    """Finds the file the settings of an application are stored in.
+
+    Args:
+        app_name: Name of the application.
+
+    Returns:
+        The path to the file, which may not exist.
+    """
+    return user_config_path(app_name) / SETTINGS_FILE
+
+
+class Settings:
+    """Keeps the settings in memory, writing the changes to disk in the background.
+
+    The first change after a write starts a timer and all the changes made until it
+    fires are written together, in a daemon thread. The file is replaced at once, so it
+    is never left half written. Any change still waiting is written when the program
+    exits.
+
+    Settings can be read and changed from any thread.
+
+    Args:
+        flush_delay: Time, in seconds, changes are held before writing them.
+    """
+
+    _instance: Optional[Settings] = None
+
+    def __new__(cls, flush_delay: float = FLUSH_DELAY):
+        if cls._instance is None:
+            cls._instance = object.__new__(cls)
+            cls._instance.flush_delay = flush_delay
+            cls._instance.path = None
+            cls._instance._sections = {}
+            cls._instance._dirty = False
+            cls._instance._timer = None
+            cls._instance._lock = threading.Lock()
+            cls._instance._write_lock = threading.Lock()
+            atexit.register(cls._instance.flush)
+        return cls._instance
+
+    def __init__(self, flush_delay: float = FLUSH_DELAY):
+        self.flush_delay: float
+        self.path: Optional[Path]
+        self._sections: Dict[str, Dict[str, Any]]
+        self._dirty: bool
+        self._timer: Optional[threading.Timer]
+        self._lock: threading.Lock
+        self._write_lock: threading.Lock
+
+    def load(self, path: Path) -> None:
+        """Loads the settings from a file, where any change will be written.
+
+        Settings changed before loading are kept, unless also in the file. A file that
+        cannot be read, or does not contain an object of sections, is ignored.
+
+        Args:
+            path: The file.
+        """
+        sections: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                sections = _check_sections(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError) as err:
+                logger.warning(f"The settings could not be loaded: {err}")
+
+        with self._lock:
+            self.path = path
+            for name, section in sections.items():
+                self._sections.setdefault(name, {}).update(section)
+            if self._dirty:
+                self._changed()
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """Gets the value of a setting.
+
+        Args:
+            section: The section of the setting, e.g. the name of the plugin.
+            key: The name of the setting.
+            default: Value to return if the setting has not been set.
+
+        Returns:
+            A copy of the value, so changing it does not change the setting.
+        """
+        with self._lock:
+            if key not in self._sections.get(section, {}):
+                return default
+            return copy.deepcopy(self._sections[section][key])
+
+    def set(self, section: str, key: str, value: Any) -> None:
+        """Changes the value of a setting, writing it to disk shortly after.
+
+        Args:
+            section: The section of the setting, e.g. the name of the plugin.
+            key: The name of the setting.
+            value: The new value. Must be serialisable as JSON.
+
+        Raises:
+            TypeError: If the value cannot be serialised as JSON.
+        """
+        # Serialising it now also copies it, as it will be read after a restart
+        value = json.loads(json.dumps(value))
+        with self._lock:
+            self._sections.setdefault(section, {})[key] = value
+            self._changed()
+
+    def delete(self, section: str, key: Optional[str] = None) -> None:
+        """Removes a setting, or a whole section, if they exist.
+
+        Args:
+            section: The section of the setting, e.g. the name of the plugin.
+            key: The name of the setting. If None, all the settings of the section are
+                removed.
+        """
+        with self._lock:
+            if key is None:
+                removed = self._sections.pop(section, None) is not None
+            else:
+                removed = self._sections.get(section, {}).pop(key, None) is not None
+            if removed:
+                self._changed()
+
+    def section(self, section: str) -> Dict[str, Any]:
+        """Gets all the settings of a section.
+
+        Args:
+            section: The section, e.g. the name of the plugin.
+
+        Returns:
+            A copy of the settings of the section.
+        """
+        with self._lock:
+            return copy.deepcopy(self._sections.get(section, {}))
+
+    def flush(self) -> None:
+        """Writes the changes waiting to be written straight away, if any."""
+        # Held while taking the snapshot, so an older snapshot is never written last
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty or self.path is None:
+                    return
+                path = self.path
+                contents = json.dumps(self._sections, separators=(",", ":"))
+                self._dirty = False
+
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f"{path.name}.tmp")
+                tmp.write_text(contents, encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError as err:
+                logger.warning(f"The settings could not be saved: {err}")
+
+    def _changed(self) -> None:
+        """Schedules writing the changes, if not scheduled already.
+
+        It must be called holding the lock.
+        """
+        self._dirty = True
+        if self._timer is not None or self.path is None:
+            return
+
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+def get_setting(section: str, key: str, default: Any = None) -> Any:
+    """Is an alias for Settings().get(section, key, default)."""
+    return Settings().get(section, key, default)
+
+
+def set_setting(section: str, key: str, value: Any) -> None:
+    """Is an alias for Settings().set(section, key, value)."""
+    Settings().set(section, key, value)
+
+
+def _check_sections(sections: Any) -> Dict[str, Dict[str, Any]]:
+    """Checks the contents of a settings file are an object of sections.
+
+    Args:
+        sections: The contents of the file, decoded.
+
+    Raises:
+        ValueError: If it is not an object whose values are all objects.
+
+    Returns:
+        The sections, unchanged.
+    """
+    if not isinstance(sections, dict) or not all(
+        isinstance(section, dict) for section in sections.values()
+    ):
+        raise ValueError("expected an object of sections")
+    return sections
@@ -2,6 +2,8 @@
 The entry point of the program. It launches the main application - i.e. it starts
 whatever represents the mainloop in the chosen GUI toolkit.
 """
+import sys
+
 from guikit.scripts import run
 
-run()
+run(args=sys.argv[1:])
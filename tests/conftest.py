@@ -22,6 +22,18 @@ def main_window():
     app.MainLoop()
 
 
+@pytest.fixture()
+def headless_app():
+    from guikit.core import MainApp
+    from guikit.threads import ThreadPool
+
+    # The thread pool must use the event handler of the new app
+    ThreadPool._instance = None
+    app = MainApp(title="My App", headless=True)
+    yield app
+    ThreadPool._instance = None
+
+
 @pytest.fixture()
 def plugin():
     from typing import List
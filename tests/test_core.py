@@ -78,6 +78,137 @@ class TestMainWindow:
         with pytest.raises(ValueError):
             main_window._make_central_widget()
 
+    def test_menu_entries(self, main_window):
+        import wx
+
+        from guikit.plugins import MenuTool
+
+        main_window._make_menubar()
+        menu_bar = main_window.GetMenuBar()
+        count = menu_bar.GetMenuCount()
+
+        ids = main_window.add_menu_entries(
+            [MenuTool(menu="Late", text="One"), MenuTool(menu="Late", text="Two")]
+        )
+        assert menu_bar.GetMenuCount() == count + 1
+        assert menu_bar.GetMenu(menu_bar.FindMenu("Late")).GetMenuItemCount() == 2
+
+        main_window.enable_menu_entries(ids[:1], False)
+        assert not menu_bar.IsEnabled(ids[0])
+        assert menu_bar.IsEnabled(ids[1])
+
+        main_window.remove_menu_entries(ids[:1])
+        assert menu_bar.GetMenu(menu_bar.FindMenu("Late")).GetMenuItemCount() == 1
+        main_window.remove_menu_entries(ids[1:])
+        assert menu_bar.FindMenu("Late") == wx.NOT_FOUND
+
+        with pytest.raises(KeyError):
+            main_window.remove_menu_entries(ids)
+
+    def test_toolbar_items(self, main_window):
+        import wx
+
+        from guikit.plugins import MenuTool
+
+        main_window._make_toolbar()
+        toolbar = main_window.GetToolBar()
+        count = toolbar.GetToolsCount()
+        bitmap = wx.ArtProvider.GetBitmap(wx.ART_QUIT, wx.ART_TOOLBAR)
+
+        with patch.object(toolbar, "Realize", MagicMock()) as realize:
+            with main_window.batch_update():
+                ids = main_window.add_toolbar_items(
+                    [MenuTool(text="One", bitmap=bitmap)]
+                )
+                ids += main_window.add_toolbar_items(
+                    [MenuTool(text="Two", bitmap=bitmap)]
+                )
+                realize.assert_not_called()
+            realize.assert_called_once()
+        assert toolbar.GetToolsCount() == count + 2
+
+        main_window.enable_toolbar_items(ids[:1], False)
+        assert not toolbar.GetToolEnabled(ids[0])
+        assert toolbar.GetToolEnabled(ids[1])
+
+        main_window.remove_toolbar_items(ids)
+        assert toolbar.GetToolsCount() == count
+
+        with pytest.raises(KeyError):
+            main_window.enable_toolbar_items(ids)
+
+    def test_add_plugins(self, main_window):
+        import wx
+
+        from guikit.plugins import MenuTool, PluginBase, Tab
+        from guikit.session import plugin_key
+
+        main_window._make_notebook()
+        main_window._make_menubar()
+        count = main_window.notebook.PageCount
+
+        class LatePlugin(PluginBase):
+            restored = None
+
+            def menu_entries(self):
+                return [MenuTool(menu="Late", text="One")]
+
+            def tabs(self, parent=None):
+                return [Tab(page=wx.Panel(parent), text="Late")]
+
+            def restore_state(self, state):
+                LatePlugin.restored = state
+
+        main_window._session_states = {plugin_key(LatePlugin): {"value": 42}}
+        with patch("wx.CallAfter", lambda f, *args: f(*args)):
+            main_window.add_plugins([])
+        assert main_window.notebook.PageCount == count + 1
+        assert main_window.GetMenuBar().FindMenu("Late") != wx.NOT_FOUND
+        assert LatePlugin.restored is None
+
+        main_window._restore_page(count)
+        assert LatePlugin.restored == {"value": 42}
+
+    def test_add_plugins_central(self, main_window):
+        import wx
+
+        from guikit.plugins import KNOWN_PLUGINS, PluginBase
+
+        main_window.notebook_layout = False
+        main_window.plugins()
+
+        class CentralPlugin(PluginBase):
+            def central(self, parent=None):
+                return wx.TextCtrl(parent)
+
+        with pytest.raises(ValueError):
+            main_window.add_plugins([])
+        assert CentralPlugin not in KNOWN_PLUGINS
+        assert CentralPlugin not in main_window._plugins
+
+    def test_session(self, main_window, tmp_path):
+        from guikit.plugins import PluginBase
+
+        class StatefulPlugin(PluginBase):
+            restored = None
+
+            def save_state(self):
+                return {"value": 42}
+
+            def restore_state(self, state):
+                StatefulPlugin.restored = state
+
+        main_window.notebook_layout = False
+        main_window.session_file = tmp_path / "session.json.gz"
+        main_window.save_session()
+        assert main_window.session_file.exists()
+
+        main_window._plugins = {}
+        with patch("wx.CallAfter", lambda f, *args: f(*args)):
+            main_window._restore_session(main_window.session_file)
+        assert StatefulPlugin.restored == {"value": 42}
+        assert main_window._pending_states == {}
+
 
 class TestMainApp:
     def test_on_init(self, caplog):
@@ -95,3 +226,51 @@ class TestMainApp:
 
             wx.CallAfter(app.GetTopWindow().Close)
             app.MainLoop()
+
+
+class TestHeadlessMainApp:
+    def test_on_init(self, headless_app):
+        from guikit.threads import ThreadPool
+
+        assert headless_app.GetAppName() == "My App"
+        assert headless_app.GetTopWindow() is None
+        assert ThreadPool()._window is headless_app.handler
+
+    def test_thread_callbacks(self, headless_app):
+        from guikit.threads import run_thread
+
+        results = []
+
+        def on_complete(result):
+            results.append(result)
+            headless_app.ExitMainLoop()
+
+        run_thread(lambda: 42, on_complete=on_complete)
+        headless_app.MainLoop()
+        assert results == [42]
+
+
+def test_run_headless():
+    from guikit.core import run_headless
+    from guikit.threads import ThreadPool
+
+    with patch.object(ThreadPool, "_instance", None):
+        assert run_headless(lambda: 42) == 42
+
+    def fail():
+        raise ValueError("Oops")
+
+    with patch.object(ThreadPool, "_instance", None), pytest.raises(
+        RuntimeError, match="Oops"
+    ) as err:
+        run_headless(fail)
+    assert isinstance(err.value.__cause__, ValueError)
+
+    def fail_without_message():
+        raise ValueError()
+
+    with patch.object(ThreadPool, "_instance", None), pytest.raises(
+        RuntimeError, match="ValueError"
+    ) as err:
+        run_headless(fail_without_message)
+    assert isinstance(err.value.__cause__, ValueError)
@@ -0,0 +1,86 @@
+import socket
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available"
+)
+
+
+@pytest.fixture
+def runtime_path():
+    from pathlib import Path
+    from tempfile import TemporaryDirectory
+
+    # Short, as the length of the path of sockets is limited
+    with TemporaryDirectory(prefix="gk") as tmp, patch(
+        "guikit.instance.user_runtime_path", lambda name: Path(tmp) / name
+    ):
+        yield Path(tmp)
+
+
+def test_absolute_args(tmp_path, monkeypatch):
+    from guikit.instance import absolute_args
+
+    (tmp_path / "data.csv").write_text("")
+    monkeypatch.chdir(tmp_path)
+    args = absolute_args(["--flag", "data.csv"])
+    assert args == ["--flag", str(tmp_path / "data.csv")]
+
+
+def test_forward_without_instance(runtime_path):
+    from guikit.instance import forward_to_running_instance
+
+    assert not forward_to_running_instance("app", ["file.csv"])
+
+
+def test_forward_to_running_instance(runtime_path):
+    import threading
+
+    from guikit.instance import InstanceServer, forward_to_running_instance
+
+    received = threading.Event()
+    on_args = MagicMock(side_effect=lambda args: received.set())
+    server = InstanceServer("app", on_args)
+    assert server.start()
+    try:
+        # Another instance cannot listen at the same time
+        assert not InstanceServer("app", MagicMock()).start()
+
+        assert forward_to_running_instance("app", ["some", "args"])
+        assert received.wait(5)
+        on_args.assert_called_once_with(["some", "args"])
+    finally:
+        server.stop()
+
+    assert not server.path.exists()
+    assert not forward_to_running_instance("app", [])
+
+
+def test_stale_socket(runtime_path):
+    from guikit.instance import InstanceServer
+
+    server = InstanceServer("app", MagicMock())
+    server.path.parent.mkdir(parents=True)
+    server.path.write_text("")
+
+    assert server.start()
+    server.stop()
+
+
+def test_permissions(runtime_path):
+    import os
+    import stat
+
+    from guikit.instance import InstanceServer
+
+    umask = os.umask(0o022)
+    server = InstanceServer("app", MagicMock())
+    try:
+        assert server.start()
+        assert stat.S_IMODE(server.path.stat().st_mode) == 0o600
+        assert os.umask(0o022) == 0o022
+    finally:
+        server.stop()
+        os.umask(umask)
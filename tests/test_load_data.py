@@ -0,0 +1,382 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def table(window):
+    from guikit.extensions.load_data.view import DataTable
+
+    table = DataTable()
+    view = MagicMock()
+    table.GetView = MagicMock(return_value=view)
+    return table
+
+
+@pytest.fixture
+def settings():
+    from guikit.settings import Settings
+
+    Settings._instance = None
+    with patch("atexit.register"):
+        yield Settings(flush_delay=60)
+    Settings._instance = None
+
+
+def messages(table):
+    """The messages sent to the view of a table, as (id, int, int2) tuples."""
+    return [
+        (m.GetId(), m.GetCommandInt(), m.GetCommandInt2())
+        for m in (c[0][0] for c in table.GetView().ProcessTableMessage.call_args_list)
+    ]
+
+
+class TestDataTable:
+    def test_set_data(self, table):
+        import wx.grid
+
+        table.set_data(pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6]}))
+        assert table.GetNumberRows() == 3
+        assert table.GetNumberCols() == 3
+        assert messages(table) == [
+            (wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED, 3, -1),
+            (wx.grid.GRIDTABLE_NOTIFY_COLS_APPENDED, 2, -1),
+            (wx.grid.GRIDTABLE_REQUEST_VIEW_GET_VALUES, -1, -1),
+        ]
+
+        table.GetView().reset_mock()
+        table.set_data()
+        assert messages(table) == [
+            (wx.grid.GRIDTABLE_NOTIFY_ROWS_DELETED, 0, 3),
+            (wx.grid.GRIDTABLE_NOTIFY_COLS_DELETED, 1, 2),
+            (wx.grid.GRIDTABLE_REQUEST_VIEW_GET_VALUES, -1, -1),
+        ]
+
+    def test_append_to_empty(self, table):
+        import wx.grid
+
+        table.append(pd.DataFrame({"a": [1, 2], "b": [3, 4]}))
+        assert table.GetNumberCols() == 3
+        assert (wx.grid.GRIDTABLE_NOTIFY_COLS_APPENDED, 2, -1) in messages(table)
+        assert (wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED, 2, -1) in messages(table)
+
+    def test_append(self, table):
+        import wx.grid
+
+        table.set_data(pd.DataFrame({"a": [1, 2], "b": [3, 4]}))
+        table.GetView().reset_mock()
+
+        table.append(pd.DataFrame({"a": [5], "b": [6]}, index=[2]))
+        assert table.GetNumberRows() == 3
+        assert table.GetValue(2, 2) == 6
+        assert messages(table) == [(wx.grid.GRIDTABLE_NOTIFY_ROWS_APPENDED, 1, -1)]
+
+        with pytest.raises(ValueError):
+            table.append(pd.DataFrame({"c": [1]}))
+
+    def test_update(self, table):
+        table.set_data(pd.DataFrame({"a": [1, 2, 3, 4], "b": [5, 6, 7, 8]}))
+        table.GetView().reset_mock()
+
+        table.update(pd.DataFrame({"b": [60, 70]}, index=[1, 2]))
+        assert table.GetValue(1, 2) == 60
+        assert table.GetValue(2, 2) == 70
+        table.GetView().RefreshBlock.assert_called_once_with(1, 2, 2, 2)
+        table.GetView().ProcessTableMessage.assert_not_called()
+
+        table.GetView().reset_mock()
+        table.update(pd.DataFrame({"c": [1]}, index=[10]))
+        table.GetView().RefreshBlock.assert_not_called()
+
+
+class TestStatistics:
+    def test_dataset_key(self, tmp_path):
+        from guikit.extensions.load_data.model import dataset_key
+
+        path = tmp_path / "data.csv"
+        path.write_text("a\n1\n")
+        data = pd.DataFrame({"a": [1]})
+        key = dataset_key(str(path), data)
+        assert dataset_key(str(path), data) == key
+        assert dataset_key(str(path), data.astype("uint8")) != key
+
+        assert dataset_key(str(path), data, revision=1) != key
+
+        path.write_text("a\n1\n2\n")
+        assert dataset_key(str(path), data) != key
+
+    def test_compute_statistics(self):
+        from guikit.extensions.load_data import model
+
+        data = pd.DataFrame({"a": [1, 2], "b": [3.0, 4.0]})
+        publish = MagicMock()
+        with patch.object(
+            model, "column_statistics", wraps=model.column_statistics
+        ) as column_statistics:
+            assert model.compute_statistics("key", data, publish, lambda: False)
+            assert column_statistics.call_count == 2
+            assert model.compute_statistics("key", data, publish, lambda: False)
+            assert column_statistics.call_count == 2
+            assert publish.call_count == 4
+
+            model.forget_statistics("key")
+            assert model.compute_statistics("key", data, publish, lambda: False)
+            assert column_statistics.call_count == 4
+        model.forget_statistics("key")
+
+    def test_compute_statistics_abort(self):
+        from guikit.extensions.load_data import model
+
+        publish = MagicMock()
+        data = pd.DataFrame({"a": [1, 2]})
+        assert not model.compute_statistics("aborted", data, publish, lambda: True)
+        publish.assert_not_called()
+        model.forget_statistics("aborted")
+
+    def test_invalidate_statistics(self, tmp_path):
+        from guikit.extensions.load_data import presenter
+        from guikit.extensions.load_data.model import dataset_key
+
+        filename = str(tmp_path / "data.csv")
+        data = pd.DataFrame({"a": [1]})
+        changed = pd.DataFrame({"a": [1, 2]})
+        with patch.object(
+            presenter, "run_thread", side_effect=[1, 2]
+        ) as run_thread, patch.object(presenter, "abort_thread") as abort_thread:
+            presenter.calculate_statistics(filename, data)
+            key = presenter._statistics_key
+
+            presenter.invalidate_statistics(filename, changed, 1)
+            abort_thread.assert_called_once_with(1)
+            assert presenter._statistics_thread == 2
+            assert presenter._statistics_key == dataset_key(filename, changed, 1)
+            assert presenter._statistics_key != key
+
+            # A thread finishing after being replaced leaves the current one alone
+            run_thread.call_args_list[0][1]["on_abort"](False)
+            assert presenter._statistics_thread == 2
+            run_thread.call_args_list[1][1]["on_complete"](True)
+            assert presenter._statistics_thread is None
+
+        presenter.calculate_statistics(filename)
+        assert presenter._statistics_key is None
+
+
+class TestRecentFiles:
+    def test_recent_files(self, settings, tmp_path):
+        from guikit.extensions.load_data.model import (
+            RECENT_FILES,
+            add_recent_file,
+            recent_files,
+        )
+
+        assert recent_files() == []
+
+        files = [tmp_path / f"{i}.csv" for i in range(RECENT_FILES + 2)]
+        for f in files:
+            add_recent_file(str(f))
+        assert recent_files() == [str(f.resolve()) for f in files[::-1][:RECENT_FILES]]
+
+        add_recent_file(str(files[-3]))
+        recent = recent_files()
+        assert recent[0] == str(files[-3].resolve())
+        assert len(recent) == RECENT_FILES
+        assert len(set(recent)) == RECENT_FILES
+
+    def test_remember_file(self, settings, tmp_path):
+        from guikit.extensions.load_data.model import recent_files
+        from guikit.extensions.load_data.presenter import remember_file
+
+        remember_file(str(tmp_path / "failed.csv"))
+        assert recent_files() == []
+
+        remember_file(str(tmp_path / "data.csv"), pd.DataFrame({"a": [1]}))
+        assert recent_files() == [str((tmp_path / "data.csv").resolve())]
+
+
+class TestCsvIndex:
+    @pytest.fixture
+    def filename(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_bytes(
+            b'"first\nname",value\n'
+            b"\n"
+            b"a,1\n"
+            b'"b\nwith ""quoted"" lines",2\n'
+            b"\r\n"
+            b"c,3\n"
+            b"d,4\n"
+        )
+        return str(path)
+
+    def test_build(self, filename):
+        from guikit.extensions.load_data.model import CsvIndex
+
+        index = CsvIndex(filename, page_size=2, cache_size=1)
+        assert index.columns == ["first\nname", "value"]
+
+        publish = MagicMock()
+        assert index.build(lambda: False, publish, every=1)
+        assert index.complete
+        assert index.nrows == len(pd.read_csv(filename)) == 4
+        publish.assert_called_with(4)
+
+        assert index.get_value(0, 0) == "a"
+        assert index.get_value(1, 0) == 'b\nwith "quoted" lines'
+        assert index.get_value(2, 1) == "3"
+        assert index.get_value(3, 0) == "d"
+        assert index.get_value(3, 2) == ""
+        assert index.get_value(4, 0) == ""
+        assert list(index._pages) == [1]
+
+    def test_build_abort(self, filename):
+        from guikit.extensions.load_data.model import CsvIndex
+
+        index = CsvIndex(filename, page_size=1)
+        assert not index.build(lambda: True, MagicMock(), every=2)
+        assert not index.complete
+        assert index.nrows == 1
+        assert index.get_value(0, 0) == "a"
+        assert index.get_value(1, 0) == ""
+
+
+class TestOptimise:
+    def test_optimise_dtypes(self):
+        from guikit.extensions.load_data.model import optimise_dtypes
+
+        data = pd.DataFrame(
+            {
+                "unsigned": [0, 1, 2, 255],
+                "integer": [-1, 0, 1, 1000],
+                "float": [0.5, 1.5, 2.5, 3.5],
+                "text": ["a", "b", "a", "a"],
+                "unique": ["a", "b", "c", "d"],
+                "flag": [True, False, True, False],
+            }
+        )
+        optimise_dtypes(data)
+        assert data["unsigned"].dtype == "uint8"
+        assert data["integer"].dtype == "int16"
+        assert data["float"].dtype == "float64"
+        assert data["text"].dtype == "category"
+        assert data["unique"].dtype != "category"
+        assert data["flag"].dtype == bool
+
+        assert optimise_dtypes(data, downcast_floats=True)["float"].dtype == "float32"
+
+    def test_align_categories(self):
+        from guikit.extensions.load_data.model import _align_categories
+
+        chunks = [
+            pd.DataFrame({"a": ["x", "y"], "b": ["u", "v"]}, dtype="category"),
+            pd.DataFrame({"a": ["z", "x"], "b": ["w", "u"]}),
+        ]
+        chunks[1]["a"] = chunks[1]["a"].astype("category")
+
+        data = pd.concat(_align_categories(chunks))
+        assert data["a"].dtype == "category"
+        assert list(data["a"].cat.categories) == ["x", "y", "z"]
+        assert list(data["a"]) == ["x", "y", "z", "x"]
+        assert data["b"].dtype == object
+
+    def test_read_csv_compact(self, tmp_path):
+        from guikit.extensions.load_data.model import read_csv_compact
+
+        path = tmp_path / "data.csv"
+        pd.DataFrame(
+            {
+                "count": range(300),
+                "value": [i / 2 for i in range(300)],
+                "group": [f"group {i // 100}" for i in range(300)],
+            }
+        ).to_csv(path, index=False)
+
+        data, before, after = read_csv_compact(str(path), chunksize=100)
+        assert data["count"].dtype == "uint16"
+        assert data["value"].dtype == "float64"
+        assert data["group"].dtype == "category"
+        assert list(data["group"].cat.categories) == ["group 0", "group 1", "group 2"]
+        assert data.equals(data.reset_index(drop=True))
+        assert after < before
+
+        data, _, _ = read_csv_compact(str(path), chunksize=100, downcast_floats=True)
+        assert data["value"].dtype == "float32"
+
+    def test_read_csv_compact_empty(self, tmp_path):
+        from guikit.extensions.load_data.model import read_csv_compact
+
+        path = tmp_path / "data.csv"
+        path.write_text("a,b\n")
+        data, before, after = read_csv_compact(str(path))
+        assert list(data.columns) == ["a", "b"]
+        assert len(data) == 0
+        assert before == after
+
+
+class TestColumnWidths:
+    def test_sample_rows(self):
+        from guikit.extensions.load_data.view import sample_rows
+
+        assert sample_rows(5, max_rows=10) == [0, 1, 2, 3, 4]
+
+        rows = sample_rows(1000, max_rows=20, seed=1)
+        assert len(rows) == len(set(rows)) == 20
+        assert rows == sorted(rows)
+        assert rows[:5] == [0, 1, 2, 3, 4]
+        assert rows[-5:] == [995, 996, 997, 998, 999]
+        assert rows == sample_rows(1000, max_rows=20, seed=1)
+
+    def test_estimate_column_widths(self, window):
+        import wx.grid
+
+        from guikit.extensions.load_data.view import (
+            AUTOSIZE_MARGIN,
+            DataTable,
+            estimate_column_widths,
+        )
+
+        table = DataTable()
+        table.set_data(pd.DataFrame({"a": ["x"] * 500, "b": ["x" * 50] * 500}))
+        grid = wx.grid.Grid(window)
+        grid.SetTable(table)
+
+        widths = estimate_column_widths(grid, table, max_rows=10)
+        assert len(widths) == table.GetNumberCols()
+        assert all(width > AUTOSIZE_MARGIN for width in widths)
+        assert widths[2] > widths[1]
+
+    def test_auto_size_columns(self, window):
+        import wx.grid
+
+        from guikit.extensions.load_data.view import DataTable, auto_size_columns
+
+        table = DataTable()
+        table.set_data(pd.DataFrame({"a": [1, 2]}))
+        grid = wx.grid.Grid(window)
+        grid.SetTable(table)
+
+        with patch(
+            "guikit.extensions.load_data.view.estimate_column_widths",
+            return_value=[50, 60],
+        ) as estimate:
+            auto_size_columns(grid, table, "key")
+            auto_size_columns(grid, table, "key")
+            estimate.assert_called_once()
+        assert grid.GetColSize(1) == 60
+
+    def test_resize_on_change(self, window, tmp_path):
+        from guikit.extensions.load_data.view import DataLoaderTab
+
+        tab = DataLoaderTab(window, MagicMock(), MagicMock())
+        tab.display_data(str(tmp_path / "data.csv"), pd.DataFrame({"a": [1]}))
+        with patch(
+            "guikit.extensions.load_data.view.estimate_column_widths",
+            return_value=[50, 60],
+        ) as estimate:
+            tab.append_rows(pd.DataFrame({"a": [123456]}, index=[1]))
+            estimate.assert_called_once()
+            assert tab.grid.GetColSize(1) == 60
+
+            tab.update_values(pd.DataFrame({"a": [7]}))
+            assert estimate.call_count == 2
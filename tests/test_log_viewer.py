@@ -0,0 +1,71 @@
+import logging
+
+
+def make_record(msg, level=logging.INFO, module="model"):
+    return logging.makeLogRecord(
+        {
+            "msg": msg,
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+            "module": module,
+        }
+    )
+
+
+class TestRingBufferHandler:
+    def test_records_since(self):
+        from guikit.extensions.log_viewer.model import RingBufferHandler
+
+        handler = RingBufferHandler(capacity=3)
+        assert handler.records_since(0) == ([], 0)
+
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))
+        records, sequence = handler.records_since(0)
+        assert [r.msg for r in records] == ["first", "second"]
+        assert sequence == 2
+
+        handler.handle(make_record("third"))
+        records, sequence = handler.records_since(sequence)
+        assert [r.msg for r in records] == ["third"]
+        assert handler.records_since(sequence) == ([], 3)
+
+    def test_capacity(self):
+        from guikit.extensions.log_viewer.model import RingBufferHandler
+
+        handler = RingBufferHandler(capacity=2)
+        for i in range(5):
+            handler.handle(make_record(str(i)))
+
+        records, sequence = handler.records_since(0)
+        assert [r.msg for r in records] == ["3", "4"]
+        assert sequence == 5
+
+        records, _ = handler.records_since(3)
+        assert [r.msg for r in records] == ["3", "4"]
+
+    def test_clear(self):
+        from guikit.extensions.log_viewer.model import RingBufferHandler
+
+        handler = RingBufferHandler()
+        handler.handle(make_record("first"))
+        handler.clear()
+        assert handler.records_since(0) == ([], 1)
+
+        handler.handle(make_record("second"))
+        records, sequence = handler.records_since(1)
+        assert [r.msg for r in records] == ["second"]
+        assert sequence == 2
+
+
+def test_matches():
+    from guikit.extensions.log_viewer.model import matches
+
+    record = make_record("Loaded", logging.WARNING, module="DataModel")
+    assert matches(record, logging.INFO)
+    assert matches(record, logging.WARNING)
+    assert not matches(record, logging.ERROR)
+    assert matches(record, logging.INFO, "model")
+    assert matches(record, logging.INFO, "DATA")
+    assert not matches(record, logging.INFO, "view")
+    assert not matches(record, logging.ERROR, "model")
@@ -19,3 +19,212 @@ def test_logger(caplog):
 
     assert "INFO" in log[-1]
     assert msg in log[-1]
+
+
+def test_bounded_queue_handler():
+    import logging
+    import queue
+
+    from guikit.logging import BoundedQueueHandler
+
+    records: queue.Queue = queue.Queue(1)
+    record = logging.makeLogRecord({"msg": "Some message"})
+
+    handler = BoundedQueueHandler(records)
+    handler.handle(record)
+    handler.handle(record)
+    assert records.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_bounded_queue_handler_json():
+    import io
+    import json
+    import logging
+    import queue
+    from logging.handlers import QueueListener
+
+    from guikit.logging import BoundedQueueHandler, JsonLinesFormatter
+
+    stream = io.StringIO()
+    json_handler = logging.StreamHandler(stream)
+    json_handler.setFormatter(JsonLinesFormatter())
+    records: queue.Queue = queue.Queue()
+    listener = QueueListener(records, json_handler)
+
+    log = logging.getLogger("guikit.test_bounded_queue_handler_json")
+    log.propagate = False
+    log.addHandler(BoundedQueueHandler(records))
+    listener.start()
+    try:
+        raise ValueError("Invalid value")
+    except ValueError:
+        log.exception("Failed with %s", "error")
+    listener.stop()
+
+    entry = json.loads(stream.getvalue())
+    assert entry["message"] == "Failed with error"
+    assert "ValueError: Invalid value" in entry["exception"]
+    assert "Traceback" not in entry["message"]
+
+
+def test_rotating_log_file_handler(tmp_path):
+    import logging
+
+    from guikit.logging import RotatingLogFileHandler
+
+    filename = tmp_path / "launch.log"
+    handler = RotatingLogFileHandler(str(filename), max_bytes=100)
+    record = logging.makeLogRecord({"msg": "x" * 60})
+
+    handler.handle(record)
+    handler.handle(record)
+    handler.compressing.join()
+    handler.close()
+
+    assert (tmp_path / "launch.1.log.gz").exists()
+    assert not (tmp_path / "launch.1.log").exists()
+    assert filename.exists()
+
+    handler = RotatingLogFileHandler(str(filename), max_age=0)
+    assert handler.shouldRollover(record)
+
+
+def test_apply_retention(tmp_path):
+    import os
+
+    from guikit.logging import apply_retention
+
+    for i in range(5):
+        path = tmp_path / f"{i}.log"
+        path.write_text("x" * 10)
+        os.utime(path, (i, i))
+
+    apply_retention(tmp_path, max_files=4, exclude=tmp_path / "0.log")
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "0.log",
+        "2.log",
+        "3.log",
+        "4.log",
+    ]
+
+    apply_retention(tmp_path, max_total_bytes=25)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["3.log", "4.log"]
+
+    # Recently modified, maybe by another instance
+    (tmp_path / "active.log").write_text("x" * 10)
+    apply_retention(tmp_path, max_files=1)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["active.log"]
+
+
+def test_deferred_handler():
+    import logging
+    from unittest.mock import MagicMock
+
+    from guikit.logging import DeferredHandler
+
+    factory = MagicMock()
+    log = logging.getLogger("guikit.test_deferred_handler")
+    log.propagate = False
+    log.addHandler(DeferredHandler(factory, logging.WARNING))
+
+    log.info("Not emitted")
+    factory.assert_not_called()
+
+    log.warning("Emitted")
+    log.error("Emitted")
+    factory.assert_called_once()
+    assert factory.return_value.handle.call_count == 2
+
+
+def test_logger_attribute_cache():
+    import logging
+
+    from guikit.logging import Logger
+
+    logger = Logger()
+    logger._logger = logging.getLogger("guikit.test_logger_attribute_cache")
+
+    assert "info" not in vars(logger)
+    assert logger.info == logger._logger.info
+    assert "info" in vars(logger)
+
+    assert logger.level == logging.NOTSET
+    assert "level" not in vars(logger)
+
+
+def test_json_lines_formatter():
+    import json
+    import logging
+
+    from guikit.logging import JsonLinesFormatter, MonotonicFilter
+
+    record = logging.makeLogRecord(
+        {
+            "msg": "Loaded %s",
+            "args": ("data",),
+            "levelname": "INFO",
+            "pathname": "/app/extensions/load_data/model.py",
+            "duration": 1.5,
+        }
+    )
+    MonotonicFilter().filter(record)
+
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert entry["message"] == "Loaded data"
+    assert entry["level"] == "INFO"
+    assert entry["plugin"] == "load_data"
+    assert entry["monotonic"] == record.monotonic
+    assert entry["duration"] == 1.5
+    assert "exception" not in entry
+
+
+def test_set_json_handler():
+    import logging
+    from unittest.mock import patch
+
+    from guikit.logging import Logger, MonotonicFilter
+
+    logger = Logger()
+    logger._logger = logging.getLogger("guikit.test_set_json_handler")
+    with patch.object(logger, "make_file_handler") as make_file_handler:
+        logger.set_json_handler()
+        logger.warning("Some message")
+
+    assert logger._logger.filters == []
+    handler = logger._logger.handlers[-1]
+    assert isinstance(handler.filters[0], MonotonicFilter)
+    record = make_file_handler.return_value.handle.call_args[0][0]
+    assert record.monotonic > 0
+
+
+def test_read_json_logs(tmp_path):
+    import gzip
+    import json
+
+    from guikit.logging import read_json_logs
+
+    (tmp_path / "b.jsonl").write_text(json.dumps({"time": 2, "message": "b"}) + "\n")
+    with gzip.open(tmp_path / "a.1.jsonl.gz", "wt") as f:
+        f.write(json.dumps({"time": 1, "message": "a"}) + "\n")
+    (tmp_path / "c.log").write_text("Not JSON\n")
+
+    data = read_json_logs(tmp_path)
+    assert list(data.message) == ["a", "b"]
+    assert str(data.time.dtype).startswith("datetime64")
+
+
+def test_timed(caplog):
+    import logging
+
+    from guikit.logging import Logger
+
+    logger = Logger()
+    logger._logger = logging.getLogger("guikit.test_timed")
+
+    with caplog.at_level(logging.INFO, logger="guikit.test_timed"):
+        with logger.timed("Some task"):
+            pass
+
+    assert caplog.records[-1].message.startswith("Some task (")
+    assert caplog.records[-1].duration >= 0
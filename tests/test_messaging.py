@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock, call, patch
+
+from pytest import fixture
+
+
+@fixture
+def messenger():
+    from guikit.messaging import Messenger
+
+    Messenger._instance = None
+    with patch("guikit.messaging.wx.CallAfter") as call_after:
+        messenger = Messenger(batch_size=2)
+        messenger.call_after = call_after
+        yield messenger
+    Messenger._instance = None
+
+
+class TestMessenger:
+    def test_publish(self, messenger):
+        messenger.publish("topic.a", value=1)
+        messenger.publish("topic.b", value=2)
+        assert messenger.pending == 2
+        messenger.call_after.assert_called_once_with(messenger.flush)
+
+    def test_coalesce(self, messenger):
+        messenger.publish("topic.a", coalesce=True, value=1, maximum=10)
+        messenger.publish("topic.b", value=2)
+        messenger.publish("topic.a", coalesce=True, value=3)
+        assert messenger.pending == 2
+        assert messenger._pending[0] == ("topic.a", {"value": 3, "maximum": 10})
+
+    def test_flush(self, messenger):
+        send = MagicMock()
+        with patch("guikit.messaging.pub.sendMessage", send):
+            for i in range(3):
+                messenger.publish("topic.a", coalesce=True, value=i)
+                messenger.publish("topic.b", value=i)
+
+            messenger.flush()
+            assert send.call_args_list == [
+                call("topic.a", value=2),
+                call("topic.b", value=0),
+            ]
+            assert messenger.call_after.call_count == 2
+
+            # Coalesced messages already delivered are not replaced
+            messenger.publish("topic.a", coalesce=True, value=3)
+            send.reset_mock()
+            messenger.flush()
+            messenger.flush()
+            assert send.call_args_list == [
+                call("topic.b", value=1),
+                call("topic.b", value=2),
+                call("topic.a", value=3),
+            ]
+            assert messenger.pending == 0
+
+    def test_flush_error(self, messenger, caplog):
+        with patch("guikit.messaging.pub.sendMessage", side_effect=ValueError("Oops")):
+            messenger.publish("topic.a")
+            messenger.flush()
+        assert "Oops" in caplog.records[-1].message
+
+
+def test_publish():
+    with patch("guikit.messaging.Messenger") as messenger:
+        from guikit.messaging import publish
+
+        publish("topic.a", coalesce=True, value=1)
+        messenger.return_value.publish.assert_called_once_with("topic.a", True, value=1)
@@ -0,0 +1,59 @@
+from time import sleep
+
+from pytest import fixture
+
+
+@fixture
+def profiler():
+    from pubsub import pub
+
+    from guikit.profiling import start_profiling, stop_profiling
+
+    yield start_profiling(budget=5)
+    stop_profiling()
+    pub.unsubAll("test_profiling")
+
+
+def test_message_profiler(profiler, caplog):
+    from pubsub import pub
+
+    calls = []
+
+    def fast(value):
+        calls.append(value)
+
+    def slow(value):
+        sleep(0.01)
+        pub.sendMessage("test_profiling.inner", value=value)
+
+    pub.subscribe(fast, "test_profiling.inner")
+    pub.subscribe(slow, "test_profiling.outer")
+    pub.sendMessage("test_profiling.outer", value=1)
+    pub.sendMessage("test_profiling.inner", value=2)
+
+    assert calls == [1, 2]
+    assert profiler.messages == {"test_profiling.outer": 1, "test_profiling.inner": 2}
+    stats = {name.split(".")[-1]: s for (_, name), s in profiler.listeners.items()}
+    assert stats["fast"].calls == 2
+    assert stats["slow"].calls == 1
+    assert stats["slow"].over_budget == 1
+    assert stats["slow"].total >= 0.01
+    assert "slow" in caplog.records[-1].message
+
+    report = profiler.report()
+    assert "test_profiling.outer" in report
+    assert "fast" in report
+
+
+def test_stop_profiling(caplog):
+    from pubsub import pub
+
+    from guikit.profiling import start_profiling, stop_profiling
+
+    profiler = start_profiling()
+    assert pub.getNotificationFlags()["sendMessage"]
+
+    assert stop_profiling() is profiler
+    assert not profiler.enabled
+    assert not pub.getNotificationFlags()["sendMessage"]
+    assert "Pubsub messages profile" in caplog.records[-1].message
@@ -1,4 +1,5 @@
 import sys
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -77,6 +78,31 @@ class TestDialog:
             if sys.platform != "win32":
                 assert dlg.IsShownOnScreen()
 
+    def test_update_interval(self, mocker, window):
+        from guikit.progress import Dialog
+
+        clock = mocker.patch("guikit.progress.monotonic", return_value=10.0)
+
+        with Dialog(maximum=100, every=2, interval=50) as dlg:
+            # The first update always happens, regardless of 'every'
+            assert dlg.Update(value=1)
+            assert dlg.GetValue() == 1
+
+            # Too soon after the last update, not update
+            clock.return_value = 10.01
+            assert dlg.Update(value=2)
+            assert dlg.GetValue() == 1
+
+            # Once the interval has passed, update
+            clock.return_value = 10.06
+            assert dlg.Update(value=3)
+            assert dlg.GetValue() == 3
+
+            # The last value is always shown
+            clock.return_value = 10.061
+            assert dlg.Update(value=100)
+            assert dlg.GetValue() == 100
+
     def test_subscribe_for_updates(self, mocker, window):
         from pubsub import pub
 
@@ -106,3 +132,166 @@ class TestDialog:
             dlg.channel = "my_channel"
             dlg.broadcast_abort()
             spy_send.assert_called_once()
+
+
+class TestReporter:
+    def test_report(self, window):
+        from guikit.progress import Reporter
+
+        dialog = MagicMock()
+        dialog.Update.return_value = True
+        dialog.WasCancelled.return_value = False
+
+        reporter = Reporter(dialog)
+        assert reporter.report(3, "msg")
+        dialog.Update.assert_not_called()
+
+        reporter.on_timer()
+        dialog.Update.assert_called_once_with(3, "msg", None)
+
+        # Nothing new reported, not update
+        reporter.on_timer()
+        dialog.Update.assert_called_once()
+
+        # Only the latest value reported is displayed
+        reporter.report(4)
+        reporter.report(5, maximum=200)
+        reporter.stop()
+        dialog.Update.assert_called_with(5, "", 200)
+        assert dialog.Update.call_count == 2
+
+    def test_abort(self, mocker, window):
+        from guikit.progress import Reporter
+
+        abort_thread = mocker.patch("guikit.progress.abort_thread")
+        dialog = MagicMock()
+        dialog.Update.return_value = False
+
+        reporter = Reporter(dialog, ident=42)
+        assert reporter.report(1)
+        reporter.on_timer()
+        abort_thread.assert_called_once_with(42)
+
+        assert not reporter.report(2)
+        reporter.stop()
+        abort_thread.assert_called_once()
+
+    def test_abort_while_busy(self, mocker, window):
+        from guikit.progress import Reporter
+
+        abort_thread = mocker.patch("guikit.progress.abort_thread")
+        dialog = MagicMock()
+        dialog.Update.return_value = True
+        dialog.WasCancelled.return_value = False
+
+        reporter = Reporter(dialog, ident=42)
+        reporter.report(1)
+        reporter.on_timer()
+        reporter.on_timer()
+        abort_thread.assert_not_called()
+
+        # Abort pressed while the worker is not reporting anything new
+        dialog.WasCancelled.return_value = True
+        reporter.on_timer()
+        abort_thread.assert_called_once_with(42)
+        assert not reporter.report(2)
+        dialog.Update.assert_called_once()
+
+        reporter.on_timer()
+        abort_thread.assert_called_once()
+
+    def test_invalid(self, window, caplog):
+        from guikit.progress import Reporter
+
+        dialog = MagicMock()
+        dialog.Update.side_effect = ValueError("Current step larger than the maximum")
+        dialog.WasCancelled.return_value = False
+
+        reporter = Reporter(dialog)
+        reporter.report(101)
+        reporter.on_timer()
+        assert "Invalid progress" in caplog.messages[-1]
+        assert not reporter._timer.IsRunning()
+
+        reporter.on_timer()
+        dialog.Update.assert_called_once()
+
+
+def test_run_with_progress(mocker):
+    from guikit import progress
+
+    mocker.patch("guikit.progress.Dialog")
+    mocker.patch("guikit.progress.Reporter")
+    run_thread = mocker.patch("guikit.progress.run_thread", return_value=42)
+    on_complete = MagicMock()
+
+    ident = progress.run_with_progress(lambda reporter: None, on_complete=on_complete)
+    assert ident == 42
+    assert progress.Reporter.return_value.ident == 42
+
+    run_thread.call_args[1]["on_complete"]("result")
+    progress.Reporter.return_value.stop.assert_called_once()
+    progress.Dialog.return_value.Destroy.assert_called_once()
+    on_complete.assert_called_once_with("result")
+
+
+class TestAggregator:
+    @pytest.fixture
+    def aggregator(self, window):
+        import wx
+
+        from guikit.progress import Aggregator
+
+        Aggregator._instance = None
+        aggregator = Aggregator(wx.Gauge(window))
+        yield aggregator
+        aggregator._timer.Stop()
+        Aggregator._instance = None
+
+    def test_singleton(self, aggregator):
+        from guikit.progress import Aggregator
+
+        assert Aggregator() is aggregator
+
+        Aggregator._instance = None
+        with pytest.raises(ValueError):
+            Aggregator()
+
+    def test_jobs(self, aggregator):
+        first = aggregator.add_job("first", maximum=10)
+        second = aggregator.add_job("second", maximum=200)
+        assert first != second
+        assert [job.name for job in aggregator.jobs()] == ["first", "second"]
+
+        aggregator.update_job(first, 5, message="Half way")
+        aggregator.update_job(second, 50, maximum=100)
+        jobs = aggregator.jobs()
+        assert jobs[0].fraction == 0.5
+        assert jobs[0].message == "Half way"
+        assert jobs[1].fraction == 0.5
+
+        fraction, eta = aggregator.overall(jobs)
+        assert fraction == 0.5
+        assert eta is not None
+
+        aggregator.finish_job(first)
+        aggregator.finish_job(first)
+        assert [job.name for job in aggregator.jobs()] == ["second"]
+
+        with pytest.raises(KeyError):
+            aggregator.update_job(first, 1)
+
+    def test_on_timer(self, aggregator):
+        job = aggregator.add_job("job", maximum=4)
+        aggregator.update_job(job, 1)
+        aggregator.on_timer()
+        assert aggregator._gauge.GetValue() == aggregator.RESOLUTION // 4
+
+        aggregator._gauge.SetValue(0)
+        aggregator.on_timer()
+        assert aggregator._gauge.GetValue() == 0
+
+        aggregator.finish_job(job)
+        aggregator.on_timer()
+        assert aggregator._gauge.GetValue() == 0
+        assert aggregator.overall([]) == (0.0, None)
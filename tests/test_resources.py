@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+PACKAGE = "guikit.extensions.about_dialog"
+
+
+@pytest.fixture
+def cache():
+    from guikit.resources import ResourceCache
+
+    ResourceCache._instance = None
+    yield ResourceCache()
+    ResourceCache._instance = None
+
+
+def test_text(cache):
+    text = cache.text(PACKAGE, "description")
+    assert len(text) > 0
+
+    with patch("pkgutil.get_data") as get_data:
+        assert cache.text(PACKAGE, "description") is text
+        get_data.assert_not_called()
+
+
+def test_data_missing(cache):
+    with pytest.raises(FileNotFoundError):
+        cache.data(PACKAGE, "missing.png")
+
+
+def test_bitmap(cache, window):
+    bitmap = cache.bitmap(PACKAGE, "logo.png", size=(32, 16))
+    assert tuple(bitmap.GetSize()) == (32, 16)
+    assert cache.bitmap(PACKAGE, "logo.png", size=(32, 16)) is bitmap
+    assert cache.bitmap(PACKAGE, "logo.png") is not bitmap
+
+
+def test_preload(cache):
+    from guikit.scheduler import Scheduler
+
+    Scheduler._instance = None
+    loader = MagicMock(side_effect=[None, ValueError("invalid")])
+    with patch("wx.GetApp", return_value=None):
+        cache.preload(loader, "first")
+        cache.preload(loader, "second", size=2)
+        loader.assert_not_called()
+
+        Scheduler().run_steps(budget=1)
+    loader.assert_any_call("first")
+    loader.assert_called_with("second", size=2)
+    assert Scheduler().pending == 0
+    Scheduler._instance = None
@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def scheduler():
+    from guikit.scheduler import Scheduler
+
+    Scheduler._instance = None
+    with patch("wx.GetApp", return_value=None):
+        yield Scheduler()
+    Scheduler._instance = None
+
+
+def count(name, steps, log):
+    for i in range(steps):
+        log.append((name, i))
+        yield
+    return name
+
+
+def test_priorities(scheduler):
+    log = []
+    on_complete = MagicMock()
+    scheduler.schedule(count("low", 2, log), priority=-1, on_complete=on_complete)
+    scheduler.schedule(count("a", 2, log), on_complete=on_complete)
+    scheduler.schedule(count("b", 1, log), on_complete=on_complete)
+    assert scheduler.pending == 3
+
+    scheduler.run_steps(budget=1)
+    assert log == [("a", 0), ("b", 0), ("a", 1), ("low", 0), ("low", 1)]
+    assert [c[0][0] for c in on_complete.call_args_list] == ["b", "a", "low"]
+    assert scheduler.pending == 0
+
+
+def test_budget(scheduler):
+    log = []
+    scheduler.schedule(count("a", 10, log))
+    scheduler.run_steps(budget=0)
+    assert log == [("a", 0)]
+    assert scheduler.pending == 1
+
+
+def test_cancel(scheduler):
+    log = []
+    ident = scheduler.schedule(count("a", 10, log))
+    scheduler.run_steps(budget=0)
+    assert scheduler.cancel(ident)
+    assert not scheduler.cancel(ident)
+
+    scheduler.run_steps(budget=1)
+    assert log == [("a", 0)]
+
+
+def test_cancel_itself(scheduler):
+    log = []
+
+    def cancelling():
+        log.append("step")
+        scheduler.cancel(ident)
+        yield
+        log.append("not run")
+
+    on_complete = MagicMock()
+    ident = scheduler.schedule(cancelling(), on_complete=on_complete)
+    scheduler.run_steps(budget=1)
+    assert log == ["step"]
+    assert scheduler.pending == 0
+    on_complete.assert_not_called()
+
+
+def test_error(scheduler):
+    def failing():
+        yield
+        raise ValueError("invalid")
+
+    on_error = MagicMock()
+    scheduler.schedule(failing(), on_error=on_error)
+    scheduler.run_steps(budget=1)
+    assert isinstance(on_error.call_args[0][0], ValueError)
+    assert scheduler.pending == 0
+
+
+def test_idle(scheduler):
+    app = MagicMock()
+    with patch("wx.GetApp", return_value=app):
+        scheduler.schedule(count("a", 2, []))
+        scheduler.schedule(count("b", 2, []))
+        app.Bind.assert_called_once()
+
+        scheduler.budget = 0
+        event = MagicMock()
+        scheduler._on_idle(event)
+        event.RequestMore.assert_called_once()
+
+        scheduler.budget = 1
+        event = MagicMock()
+        scheduler._on_idle(event)
+        event.RequestMore.assert_not_called()
+        app.Unbind.assert_called_once()
+
+
+def test_start(scheduler):
+    scheduler.schedule(count("a", 2, []))
+
+    first = MagicMock()
+    with patch("wx.GetApp", return_value=first):
+        scheduler.start()
+        scheduler.start()
+        first.Bind.assert_called_once()
+        scheduler.stop()
+        first.Unbind.assert_called_once()
+
+    second = MagicMock()
+    with patch("wx.GetApp", return_value=second):
+        scheduler.start()
+        second.Bind.assert_called_once()
@@ -3,18 +3,18 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 
-@pytest.mark.xfail
 def test_run_app():
-    class App:
-        MainLoop = MagicMock()
+    from types import ModuleType
 
-    with patch("guikit.scripts.MainApp", MagicMock(return_value=App)):
-        from guikit.scripts import MainApp, run
+    config = ModuleType("my_app.config")
+    with patch("guikit.core.MainApp") as MainApp, patch("guikit.scripts.Settings"):
+        from guikit.scripts import run
 
-        run()
+        run(config)
 
-        MainApp.assert_called_once()
-        App.MainLoop.assert_called_once()
+    MainApp.assert_called_once()
+    assert MainApp.call_args[1]["session_name"] is None
+    MainApp.return_value.MainLoop.assert_called_once()
 
 
 def test_init_repo(tmpdir):
@@ -73,6 +73,112 @@ class TestInitSubCommand:
             _init_repo.assert_called_once()
 
 
+class TestBuildSubCommand:
+    def test_add_arguments(self):
+        import argparse
+
+        from guikit.scripts import BuildSubCommand
+
+        command = BuildSubCommand()
+        parser = argparse.ArgumentParser()
+        command.add_arguments(parser)
+        assert set([a.dest for a in parser._actions]) == {
+            "help",
+            "app",
+            "output",
+            "include_guikit",
+            "python",
+        }
+
+    def test_run(self):
+        import argparse
+
+        with patch("guikit.scripts._build_bundle", MagicMock()):
+            from guikit.scripts import BuildSubCommand, _build_bundle
+
+            command = BuildSubCommand()
+            args = argparse.Namespace(
+                app="my_app", output=None, include_guikit=False, python=None
+            )
+            command.run(args)
+            _build_bundle.assert_called_once()
+
+
+def test_build_bundle(tmp_path):
+    import sys
+    import zipfile
+
+    from guikit.scripts import _build_bundle
+
+    app = tmp_path / "bundled_app"
+    app.mkdir()
+    (app / "__init__.py").write_text("")
+    (app / "config.py").write_text(
+        "from typing import List\n"
+        "PLUGINS = ['a']\nAUTO_PLUGINS = ['b', 'a']\nTAB_STYLE = 'left'\n"
+        "DATA_URL: str = 'https://example.com'\nLIMITS = {'rows': (1, 2.5)}\n"
+        "_PRIVATE = object()\n"
+    )
+
+    bundle = _build_bundle(app, tmp_path / "app.pyz")
+    with zipfile.ZipFile(bundle) as f:
+        names = set(f.namelist())
+    assert "__main__.py" in names
+    assert "bundled_app/config.pyc" in names
+    assert "bundled_app/config.py" not in names
+
+    sys.path.insert(0, str(bundle))
+    try:
+        for module in ("bundled_app", "bundled_app.config"):
+            sys.modules.pop(module, None)
+        from bundled_app import config
+
+        assert config.PLUGINS == ["a", "b"]
+        assert config.AUTO_PLUGINS == []
+        assert config.TAB_STYLE == "left"
+        assert config.APP_LONG_NAME == "My App"
+        assert config.DATA_URL == "https://example.com"
+        assert config.LIMITS == {"rows": (1, 2.5)}
+        assert not hasattr(config, "_PRIVATE")
+    finally:
+        sys.path.remove(str(bundle))
+        for module in ("bundled_app", "bundled_app.config"):
+            sys.modules.pop(module, None)
+
+
+def test_resolve_config_log_viewer():
+    from types import ModuleType
+
+    from guikit.scripts import LOG_VIEWER_PLUGIN, _resolve_config
+
+    config = ModuleType("config")
+    config.AUTO_PLUGINS = ["a", LOG_VIEWER_PLUGIN]
+    assert _resolve_config(config)["PLUGINS"] == ["a"]
+
+    config.LOG_VIEWER = True
+    assert _resolve_config(config)["PLUGINS"] == ["a", LOG_VIEWER_PLUGIN]
+
+    config.AUTO_PLUGINS = []
+    assert _resolve_config(config)["PLUGINS"] == [LOG_VIEWER_PLUGIN]
+
+    config.LOG_VIEWER = False
+    config.PLUGINS = [LOG_VIEWER_PLUGIN]
+    assert _resolve_config(config)["PLUGINS"] == [LOG_VIEWER_PLUGIN]
+
+
+def test_build_bundle_not_literal(tmp_path):
+    from guikit.scripts import _build_bundle
+
+    app = tmp_path / "unbundled_app"
+    app.mkdir()
+    (app / "__init__.py").write_text("")
+    (app / "config.py").write_text("from pathlib import Path\nDATA = Path('data')\n")
+
+    with pytest.raises(RuntimeError, match="DATA"):
+        _build_bundle(app, tmp_path / "app.pyz")
+    assert not (tmp_path / "app.pyz").exists()
+
+
 def test_parse_args():
     with patch("argparse.ArgumentParser.parse_args", MagicMock()):
         from guikit.scripts import _SUB_COMMANDS, _parse_args
@@ -99,3 +205,31 @@ def test_main():
 
         _parse_args.assert_called_once()
         _SUB_COMMAND_BY_NAME[Namespace.command].run.assert_called_once()
+
+
+COLD_START_BUDGET = 1.0
+"""Maximum time, in seconds, for a command not needing the GUI, excluding Python."""
+
+
+@pytest.mark.parametrize(
+    "command", [["plugin", "-l"], ["plugin"], ["init", "my_app", "-t", "{tmp}"]]
+)
+def test_cold_start(command, tmp_path):
+    import subprocess
+    import sys
+
+    command = [c.format(tmp=tmp_path) for c in command]
+    code = (
+        "import sys, time; start = time.perf_counter(); "
+        "from guikit.scripts import main; "
+        f"main({command!r}); "
+        "print(time.perf_counter() - start, 'wx' in sys.modules, "
+        "'pandas' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    elapsed, wx_imported, pandas_imported = output.stdout.split()[-3:]
+    assert wx_imported == "False"
+    assert pandas_imported == "False"
+    assert float(elapsed) < COLD_START_BUDGET
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+
+def test_session_path(tmp_path):
+    from guikit.session import SESSION_FILE, session_path
+
+    with patch("guikit.session.user_data_path", lambda name: tmp_path / name):
+        assert session_path("my_app") == tmp_path / "my_app" / SESSION_FILE
+
+
+def test_plugin_key():
+    from guikit.session import plugin_key
+
+    class SomePlugin:
+        pass
+
+    assert plugin_key(SomePlugin) == f"{__name__}.test_plugin_key.<locals>.SomePlugin"
+
+
+def test_save_and_load_session(tmp_path):
+    from guikit.session import load_session, save_session
+
+    path = tmp_path / "app" / "session.json.gz"
+    session = {"window": {"size": [800, 600]}, "plugins": {"a.Plugin": {"x": 1}}}
+    save_session(path, session)
+    assert load_session(path) == session
+    assert not path.with_name(f"{path.name}.tmp").exists()
+
+
+def test_load_session_missing_or_invalid(tmp_path, caplog):
+    from guikit.session import load_session
+
+    path = tmp_path / "session.json.gz"
+    assert load_session(path) == {}
+
+    path.write_text("not compressed")
+    assert load_session(path) == {}
+    assert "could not be loaded" in caplog.messages[-1]
+
+
+def test_save_session_not_serialisable(tmp_path, caplog):
+    from guikit.session import load_session, save_session
+
+    path = tmp_path / "session.json.gz"
+    save_session(path, {"plugins": {"a.Plugin": {"x": 1}}})
+    save_session(path, {"plugins": {"a.Plugin": {"x": object()}}})
+    assert "could not be saved" in caplog.messages[-1]
+    assert load_session(path) == {"plugins": {"a.Plugin": {"x": 1}}}
@@ -0,0 +1,102 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def settings():
+    from guikit.settings import Settings
+
+    Settings._instance = None
+    with patch("atexit.register"):
+        yield Settings(flush_delay=60)
+    Settings._instance = None
+
+
+def test_settings_path(tmp_path):
+    from guikit.settings import SETTINGS_FILE, settings_path
+
+    with patch("guikit.settings.user_config_path", lambda name: tmp_path / name):
+        assert settings_path("my_app") == tmp_path / "my_app" / SETTINGS_FILE
+
+
+def test_get_and_set(settings):
+    assert settings.get("plugin", "value", 3) == 3
+
+    value = {"columns": [1, 2]}
+    settings.set("plugin", "value", value)
+    value["columns"].append(3)
+    assert settings.get("plugin", "value") == {"columns": [1, 2]}
+    assert settings.section("plugin") == {"value": {"columns": [1, 2]}}
+
+    with pytest.raises(TypeError):
+        settings.set("plugin", "other", object())
+
+    settings.delete("plugin", "value")
+    assert settings.get("plugin", "value") is None
+    settings.set("plugin", "value", 1)
+    settings.delete("plugin")
+    assert settings.section("plugin") == {}
+
+
+def test_load(settings, tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"plugin": {"a": 1, "b": 2}}))
+
+    settings.set("plugin", "b", 3)
+    settings.set("other", "c", 4)
+    settings.load(path)
+    assert settings.section("plugin") == {"a": 1, "b": 2}
+    assert settings.get("other", "c") == 4
+
+
+def test_load_invalid(settings, tmp_path, caplog):
+    path = tmp_path / "settings.json"
+    path.write_text("{not json")
+    settings.load(path)
+    assert "could not be loaded" in caplog.messages[-1]
+    assert settings.section("plugin") == {}
+
+
+@pytest.mark.parametrize("contents", ["null", "[]", '{"plugin": 1}'])
+def test_load_not_sections(settings, tmp_path, caplog, contents):
+    path = tmp_path / "settings.json"
+    path.write_text(contents)
+    settings.set("plugin", "a", 1)
+    settings.load(path)
+    assert "could not be loaded" in caplog.messages[-1]
+    assert settings.section("plugin") == {"a": 1}
+
+
+def test_flush(settings, tmp_path):
+    path = tmp_path / "config" / "settings.json"
+    settings.load(path)
+    settings.set("plugin", "a", 1)
+    settings.set("plugin", "b", [2])
+    assert settings._timer is not None
+    assert not path.exists()
+
+    settings.flush()
+    assert settings._timer is None
+    assert json.loads(path.read_text()) == {"plugin": {"a": 1, "b": [2]}}
+
+
+def test_flush_in_background(settings, tmp_path):
+    from time import sleep
+
+    path = tmp_path / "settings.json"
+    settings.flush_delay = 0.01
+    settings.load(path)
+    settings.set("plugin", "a", 1)
+    for _ in range(100):
+        if path.exists():
+            break
+        sleep(0.01)
+    assert json.loads(path.read_text()) == {"plugin": {"a": 1}}
+
+
+def test_not_loaded(settings):
+    settings.set("plugin", "a", 1)
+    assert settings._timer is None
+    settings.flush()